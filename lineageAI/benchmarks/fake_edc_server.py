@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+EDC finto per benchmark offline.
+Piccola app aiohttp che implementa gli endpoint usati da EDCClient:
+- GET {prefix}/2/catalog/data/objects (q=id:..., ricerca per nome, paginazione)
+- GET {prefix}/1/catalog/data/bulk (CSV in streaming per risorsa/classType)
+sopra un catalogo sintetico (vedi synthetic_catalog.py), con latenza ed
+errori 503 iniettabili.
+
+Uso:
+    python benchmarks/fake_edc_server.py --assets 100000 --depth 8 --latency-ms 20
+    EDC_BASE_URL=http://localhost:9086/access python run_server.py
+"""
+import argparse
+import asyncio
+import csv
+import io
+import json
+import random
+import re
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from aiohttp import web
+
+from src.edc.name_index import NamePattern
+from synthetic_catalog import CatalogSpec, SyntheticCatalog, LINEAGE_ASSOCIATION
+
+# Righe CSV scritte per singolo chunk della risposta bulk
+BULK_ROWS_PER_CHUNK = 1000
+
+# Risultati di ricerca per nome tenuti in memoria (le pagine successive li riusano)
+SEARCH_CACHE_SIZE = 16
+
+# id:"A" OR id:"B" ... oppure id:A
+ID_QUERY_PATTERN = re.compile(r'id:(?:"([^"]*)"|(\S+))')
+
+
+class FakeEDCServer:
+    """
+    Server EDC finto su catalogo sintetico.
+    Le statistiche contano le richieste per endpoint e gli errori iniettati.
+    """
+
+    def __init__(
+        self,
+        catalog: SyntheticCatalog,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        prefix: str = '/access',
+        seed: int = 42,
+        max_page_size: int = 0
+    ):
+        """
+        Inizializza il server.
+
+        Args:
+            catalog: Catalogo sintetico servito
+            latency_ms: Latenza fissa aggiunta a ogni richiesta
+            jitter_ms: Latenza casuale aggiuntiva (uniforme 0..jitter_ms)
+            error_rate: Frazione di richieste che rispondono 503
+            prefix: Prefisso del path (EDC_BASE_URL = http://host:port{prefix})
+            seed: Seed per jitter ed errori
+            max_page_size: Limite lato server di pageSize dell'API objects,
+                come in EDC (0 = nessun limite)
+        """
+        self.catalog = catalog
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.prefix = prefix.rstrip('/')
+        self.max_page_size = max_page_size
+        self._rng = random.Random(seed)
+        self._runner: Optional[web.AppRunner] = None
+        self._search_cache: Dict[str, List[int]] = {}
+        self.stats = {
+            'objects_requests': 0,
+            'bulk_requests': 0,
+            'injected_errors': 0
+        }
+
+    def set_catalog(self, catalog: SyntheticCatalog) -> None:
+        """Sostituisce il catalogo servito (es. tra benchmark di dimensioni diverse)."""
+        self.catalog = catalog
+        self._search_cache.clear()
+
+    def create_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get(f"{self.prefix}/{{version}}/catalog/data/objects", self._handle_objects)
+        app.router.add_get(f"{self.prefix}/{{version}}/catalog/data/bulk", self._handle_bulk)
+        return app
+
+    async def start(self, host: str = 'localhost', port: int = 9086) -> str:
+        """
+        Avvia il server nel loop corrente.
+
+        Returns:
+            Base URL da usare come EDC_BASE_URL
+        """
+        self._runner = web.AppRunner(self.create_app())
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        if port == 0:
+            port = self._runner.addresses[0][1]
+        return f"http://{host}:{port}{self.prefix}"
+
+    async def stop(self) -> None:
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _simulate_network(self) -> None:
+        """Applica latenza ed eventuale errore 503 iniettato."""
+        delay = self.latency_ms + (self._rng.uniform(0, self.jitter_ms) if self.jitter_ms else 0)
+        if delay:
+            await asyncio.sleep(delay / 1000)
+        if self.error_rate and self._rng.random() < self.error_rate:
+            self.stats['injected_errors'] += 1
+            raise web.HTTPServiceUnavailable(text='Injected error')
+
+    async def _handle_objects(self, request: web.Request) -> web.Response:
+        self.stats['objects_requests'] += 1
+        await self._simulate_network()
+
+        query = request.query
+        q = query.get('q', '*')
+        offset = int(query.get('offset', 0))
+        page_size = int(query.get('pageSize', 20))
+        if self.max_page_size:
+            page_size = min(page_size, self.max_page_size)
+        include_src = query.get('includeSrcLinks', 'true') == 'true'
+        include_dst = query.get('includeDstLinks', 'true') == 'true'
+        include_ref = query.get('includeRefObjects', 'false') == 'true'
+        associations = query.getall('associations', [])
+        if associations and LINEAGE_ASSOCIATION not in associations:
+            include_src = include_dst = False
+
+        matches = self._match_objects(q)
+        page = matches[offset:offset + page_size]
+        payload: Dict = {
+            'metadata': {'totalCount': len(matches)},
+            'items': [self.catalog.to_item(i, include_src, include_dst) for i in page]
+        }
+        if include_ref:
+            payload['referencedObjects'] = self.catalog.referenced_objects(page)
+
+        return web.Response(text=json.dumps(payload), content_type='application/json')
+
+    def _match_objects(self, q: str) -> Sequence[int]:
+        """Indici degli asset che soddisfano la query objects."""
+        id_matches = ID_QUERY_PATTERN.findall(q)
+        if id_matches:
+            indexes = []
+            for quoted, bare in id_matches:
+                index = self.catalog.index_of(quoted or bare)
+                if index is not None:
+                    indexes.append(index)
+            return indexes
+
+        name_query = q.split(':', 1)[1] if q.startswith('name:') else q
+        if name_query.strip() in ('', '*'):
+            return range(len(self.catalog))
+
+        matches = self._search_cache.get(name_query)
+        if matches is None:
+            matches = list(self.catalog.search(NamePattern(name_query).matches))
+            if len(self._search_cache) >= SEARCH_CACHE_SIZE:
+                self._search_cache.pop(next(iter(self._search_cache)))
+            self._search_cache[name_query] = matches
+        return matches
+
+    async def _handle_bulk(self, request: web.Request) -> web.StreamResponse:
+        self.stats['bulk_requests'] += 1
+        await self._simulate_network()
+
+        resource = request.query.get('resourceName', '')
+        class_types = [
+            class_type for class_type in request.query.get('classTypes', '').split(',')
+            if class_type
+        ]
+
+        response = web.StreamResponse(headers={'Content-Type': 'text/csv; charset=utf-8'})
+        await response.prepare(request)
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator='\n')
+        writer.writerow(['id', 'core.name', 'core.classType'])
+        rows = 0
+        for row in self.catalog.iter_bulk_rows(resource, class_types):
+            writer.writerow(row)
+            rows += 1
+            if rows % BULK_ROWS_PER_CHUNK == 0:
+                await response.write(buffer.getvalue().encode('utf-8'))
+                buffer.seek(0)
+                buffer.truncate()
+
+        await response.write(buffer.getvalue().encode('utf-8'))
+        await response.write_eof()
+        return response
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="EDC finto su catalogo sintetico")
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--port', type=int, default=9086)
+    parser.add_argument('--assets', type=int, default=10000)
+    parser.add_argument('--resources', default='DataPlatform', help="Risorse separate da virgola")
+    parser.add_argument('--depth', type=int, default=6)
+    parser.add_argument('--fan-in', type=int, default=2)
+    parser.add_argument('--fan-out', type=int, default=2)
+    parser.add_argument('--cycle-ratio', type=float, default=0.0)
+    parser.add_argument('--view-ratio', type=float, default=0.1)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--latency-ms', type=float, default=0.0)
+    parser.add_argument('--jitter-ms', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--max-page-size', type=int, default=0, help="Limite pageSize API objects (0 = nessuno)")
+    return parser
+
+
+def catalog_from_args(args: argparse.Namespace) -> SyntheticCatalog:
+    return SyntheticCatalog(CatalogSpec(
+        assets=args.assets,
+        resources=tuple(r.strip() for r in args.resources.split(',') if r.strip()),
+        depth=args.depth,
+        fan_in=args.fan_in,
+        fan_out=args.fan_out,
+        cycle_ratio=args.cycle_ratio,
+        view_ratio=args.view_ratio,
+        seed=args.seed
+    ))
+
+
+def main():
+    args = build_arg_parser().parse_args()
+
+    print(f"Generazione catalogo sintetico ({args.assets} asset)...")
+    catalog = catalog_from_args(args)
+    print(f"Catalogo: {catalog.describe()}")
+
+    server = FakeEDCServer(
+        catalog,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        seed=args.seed,
+        max_page_size=args.max_page_size
+    )
+    print(f"EDC_BASE_URL=http://{args.host}:{args.port}{server.prefix}")
+    print(f"Esempio root lineage: {catalog.leaf_ids(1)[0]}")
+    web.run_app(server.create_app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
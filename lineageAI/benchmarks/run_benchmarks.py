@@ -0,0 +1,434 @@
+#!/usr/bin/env python3
+"""
+Suite di benchmark dei percorsi critici (ricerca bulk, lineage, formattazione).
+Gira interamente offline contro l'EDC finto (fake_edc_server.py) e scrive i
+risultati in JSON, confrontabili tra commit:
+
+    python benchmarks/run_benchmarks.py --output baseline.json
+    python benchmarks/run_benchmarks.py --output current.json --compare baseline.json
+
+Con --compare il processo termina con codice 1 se una mediana peggiora oltre
+--threshold (default 20%).
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fake_edc_server import FakeEDCServer
+from synthetic_catalog import CatalogSpec, SyntheticCatalog
+
+RESOURCE = 'DataPlatform'
+
+
+@dataclass
+class BenchmarkResult:
+    """Tempi (in secondi) di un benchmark e informazioni aggiuntive."""
+
+    name: str
+    params: Dict[str, Any]
+    timings: List[float] = field(default_factory=list)
+    extra: Dict[str, Any] = field(default_factory=dict)
+    skipped: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        if self.skipped:
+            return {'params': self.params, 'skipped': self.skipped}
+        return {
+            'params': self.params,
+            'rounds': len(self.timings),
+            'min_s': min(self.timings),
+            'median_s': statistics.median(self.timings),
+            'mean_s': statistics.fmean(self.timings),
+            'stdev_s': statistics.stdev(self.timings) if len(self.timings) > 1 else 0.0,
+            'extra': self.extra
+        }
+
+
+async def measure(
+    name: str,
+    params: Dict[str, Any],
+    func: Callable[[], Awaitable[Optional[Dict[str, Any]]]],
+    rounds: int,
+    warmup: int = 1
+) -> BenchmarkResult:
+    """
+    Esegue func warmup + rounds volte e ne registra i tempi.
+    Il dict restituito dall'ultimo round finisce in extra (es. righe, nodi).
+    """
+    result = BenchmarkResult(name=name, params=params)
+    for i in range(warmup + rounds):
+        started = time.perf_counter()
+        extra = await func()
+        elapsed = time.perf_counter() - started
+        if i >= warmup:
+            result.timings.append(elapsed)
+            result.extra = extra or {}
+
+    print(f"  {name:<45} median {statistics.median(result.timings) * 1000:10.2f} ms")
+    return result
+
+
+# ----------------------------------------------------------------------
+# Benchmark
+# ----------------------------------------------------------------------
+
+class _BufferedResponse:
+    """Risposta in memoria con l'interfaccia usata da EDCClient._iter_csv_rows."""
+
+    charset = 'utf-8'
+
+    def __init__(self, body: bytes):
+        self.content = self
+        self._body = body
+
+    async def iter_chunked(self, size: int):
+        for start in range(0, len(self._body), size):
+            yield self._body[start:start + size]
+
+
+def _bulk_csv(catalog: SyntheticCatalog) -> bytes:
+    lines = ['id,core.name,core.classType']
+    lines.extend(','.join(row) for row in catalog.iter_bulk_rows(RESOURCE))
+    return ('\n'.join(lines) + '\n').encode('utf-8')
+
+
+async def bench_csv_parse(server: FakeEDCServer, args) -> List[BenchmarkResult]:
+    """Parsing CSV bulk senza HTTP."""
+    from src.edc.client import EDCClient
+
+    results = []
+    client = EDCClient()
+    for size in args.sizes:
+        body = _bulk_csv(SyntheticCatalog(CatalogSpec(assets=size, resources=(RESOURCE,))))
+
+        async def run():
+            rows = 0
+            async for _ in client._iter_csv_rows(_BufferedResponse(body)):
+                rows += 1
+            return {'rows': rows, 'bytes': len(body)}
+
+        results.append(await measure(f"csv_parse[assets={size}]", {'assets': size}, run, args.rounds))
+    await client.close()
+    return results
+
+
+async def bench_bulk_search(server: FakeEDCServer, args) -> List[BenchmarkResult]:
+    """bulk_search_assets via HTTP: CSV in streaming, parsing e filtro sul nome."""
+    from src.edc.client import EDCClient
+
+    results = []
+    async with EDCClient() as client:
+        for size in args.sizes:
+            server.set_catalog(SyntheticCatalog(CatalogSpec(assets=size, resources=(RESOURCE,))))
+            for name_filter in (None, 'GARANZIE'):
+
+                async def run():
+                    rows = await client.bulk_search_assets(RESOURCE, name_filter, 'Table')
+                    return {'results': len(rows)}
+
+                label = name_filter or '*'
+                results.append(await measure(
+                    f"bulk_search[assets={size},filter={label}]",
+                    {'assets': size, 'name_filter': label},
+                    run,
+                    args.rounds
+                ))
+    return results
+
+
+async def bench_build_tree(server: FakeEDCServer, args) -> List[BenchmarkResult]:
+    """build_tree a cache fredda (nuovo LineageBuilder a ogni round)."""
+    from src.edc.lineage import LineageBuilder
+
+    results = []
+    for depth, fan_in in ((6, 2), (10, 1), (4, 4)):
+        spec = CatalogSpec(assets=args.tree_assets, depth=depth, fan_in=fan_in, fan_out=fan_in, resources=(RESOURCE,))
+        catalog = SyntheticCatalog(spec)
+        server.set_catalog(catalog)
+        root_id = catalog.leaf_ids(1)[0]
+
+        async def run():
+            builder = LineageBuilder()
+            try:
+                requests_before = server.stats['objects_requests']
+                await builder.build_tree(root_id, '001', 0, depth)
+                return {
+                    'nodes': builder.get_statistics()['nodes_created'],
+                    'requests': server.stats['objects_requests'] - requests_before
+                }
+            finally:
+                await builder.close()
+
+        results.append(await measure(
+            f"build_tree[depth={depth},fan_in={fan_in}]",
+            {'assets': args.tree_assets, 'depth': depth, 'fan_in': fan_in},
+            run,
+            args.rounds
+        ))
+    return results
+
+
+def _build_tree_shape(shape: str):
+    from src.edc.models import TreeNode
+
+    counter = 0
+
+    def node(code: str) -> 'TreeNode':
+        nonlocal counter
+        counter += 1
+        return TreeNode(
+            id=f"{RESOURCE}://BENCH/NODE_{counter}",
+            code=code,
+            name=f"NODE_{counter}",
+            description="Nodo benchmark",
+            class_type='com.infa.ldm.relational.Table'
+        )
+
+    root = node('001')
+    if shape == 'deep':
+        # Catena: i metodi ricorsivi di TreeNode usano ~2 frame per livello
+        current = root
+        for _ in range(300):
+            child = node(current.code + '001')
+            current.children.append(child)
+            current = child
+    elif shape == 'wide':
+        root.children.extend(node(f"001{i:03d}") for i in range(10000))
+    else:
+        # Albero bilanciato: fattore 3, 8 livelli
+        level = [root]
+        for _ in range(7):
+            next_level = []
+            for parent in level:
+                for i in range(1, 4):
+                    child = node(f"{parent.code}{i:03d}")
+                    parent.children.append(child)
+                    next_level.append(child)
+            level = next_level
+    return root
+
+
+async def bench_tree_node(server: FakeEDCServer, args) -> List[BenchmarkResult]:
+    """TreeNode.get_statistics / to_dict su alberi profondi e larghi."""
+    results = []
+    for shape in ('deep', 'wide', 'bushy'):
+        root = _build_tree_shape(shape)
+
+        async def stats_run():
+            return root.get_statistics()
+
+        async def to_dict_run():
+            payload = root.to_dict()
+            return {'top_level_keys': len(payload)}
+
+        results.append(await measure(f"tree_get_statistics[{shape}]", {'shape': shape}, stats_run, args.rounds))
+        results.append(await measure(f"tree_to_dict[{shape}]", {'shape': shape}, to_dict_run, args.rounds))
+    return results
+
+
+class _PrebuiltEDCClient:
+    """Client con risultati precalcolati: isola la formattazione degli handler MCP."""
+
+    def __init__(self, results: List[Dict[str, Any]]):
+        self.results = results
+
+    async def search_resource_assets(self, **kwargs) -> List[Dict[str, Any]]:
+        return self.results
+
+
+class _PrebuiltLineageBuilder:
+    def __init__(self, results: List[Dict[str, Any]], tree):
+        self.edc_client = _PrebuiltEDCClient(results)
+        self.tree = tree
+
+    async def build_tree(self, **kwargs):
+        return self.tree
+
+
+async def bench_mcp_formatting(server: FakeEDCServer, args) -> List[BenchmarkResult]:
+    """Formattazione testuale degli handler MCP su risultati gia disponibili."""
+    try:
+        from src.mcp.server import EDCMCPServer
+    except ImportError as e:
+        return [BenchmarkResult(name='mcp_formatting', params={}, skipped=f"mcp non disponibile: {e}")]
+
+    catalog = SyntheticCatalog(CatalogSpec(assets=max(args.sizes), resources=(RESOURCE,)))
+    assets = [
+        {'id': asset_id, 'name': name, 'classType': class_type}
+        for asset_id, name, class_type in catalog.iter_bulk_rows(RESOURCE)
+    ]
+
+    # Log degli handler su stderr: non interessano nei risultati
+    try:
+        with contextlib.redirect_stderr(io.StringIO()):
+            mcp_server = EDCMCPServer()
+    except Exception as e:
+        return [BenchmarkResult(name='mcp_formatting', params={}, skipped=f"server MCP non inizializzabile: {e}")]
+
+    results = []
+    for count in (100, 5000):
+        mcp_server.lineage_builder = _PrebuiltLineageBuilder(assets[:count], _build_tree_shape('bushy'))
+
+        async def search_run():
+            with contextlib.redirect_stderr(io.StringIO()):
+                content = await mcp_server._handle_search_assets(RESOURCE, max_results=count)
+            return {'chars': len(content[0].text)}
+
+        results.append(await measure(f"mcp_search_assets_format[results={count}]", {'results': count}, search_run, args.rounds))
+
+    async def tree_run():
+        with contextlib.redirect_stderr(io.StringIO()):
+            content = await mcp_server._handle_get_lineage_tree('root', depth=8)
+        return {'chars': len(content[0].text)}
+
+    results.append(await measure("mcp_lineage_tree_format[bushy]", {'shape': 'bushy'}, tree_run, args.rounds))
+    return results
+
+
+BENCHMARKS: Dict[str, Callable[[FakeEDCServer, argparse.Namespace], Awaitable[List[BenchmarkResult]]]] = {
+    'csv_parse': bench_csv_parse,
+    'bulk_search': bench_bulk_search,
+    'build_tree': bench_build_tree,
+    'tree_node': bench_tree_node,
+    'mcp_formatting': bench_mcp_formatting
+}
+
+
+# ----------------------------------------------------------------------
+# Esecuzione e confronto
+# ----------------------------------------------------------------------
+
+def configure_environment(base_url: str, storage_dir: str) -> None:
+    """
+    Punta le settings all'EDC finto (prima di importare i moduli src).
+    Cache in memoria, snapshot e store del grafo disattivati: si misura il
+    percorso completo. Tutti i file SQLite e la cassetta puntano comunque a
+    storage_dir, cosi i nodi sintetici non finiscono mai nei file in .cache.
+    """
+    storage = Path(storage_dir)
+    os.environ.update({
+        'EDC_BASE_URL': base_url,
+        'EDC_USERNAME': 'benchmark',
+        'EDC_PASSWORD': 'benchmark',
+        'EDC_HTTP_MODE': 'live',
+        'EDC_CACHE_BACKEND': 'memory',
+        'EDC_SNAPSHOT_ENABLED': 'false',
+        'EDC_GRAPH_STORE_ENABLED': 'false',
+        'EDC_CACHE_PATH': str(storage / 'edc_assets.sqlite'),
+        'EDC_SNAPSHOT_PATH': str(storage / 'edc_snapshots.sqlite'),
+        'EDC_GRAPH_STORE_PATH': str(storage / 'edc_lineage_graph.sqlite'),
+        'EDC_HTTP_CASSETTE': str(storage / 'edc_cassette.jsonl')
+    })
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=Path(__file__).parent,
+            capture_output=True,
+            text=True,
+            check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare_results(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    Confronta le mediane con una baseline.
+
+    Returns:
+        Nomi dei benchmark peggiorati oltre la soglia
+    """
+    regressions = []
+    print(f"\n{'Benchmark':<45} {'baseline':>12} {'corrente':>12} {'delta':>8}")
+    for name, entry in current['results'].items():
+        base = baseline.get('results', {}).get(name)
+        if not base or 'median_s' not in base or 'median_s' not in entry:
+            continue
+        delta = entry['median_s'] / base['median_s'] - 1 if base['median_s'] else 0.0
+        marker = ''
+        if delta > threshold:
+            regressions.append(name)
+            marker = '  REGRESSIONE'
+        print(
+            f"{name:<45} {base['median_s'] * 1000:10.2f}ms {entry['median_s'] * 1000:10.2f}ms "
+            f"{delta:+8.1%}{marker}"
+        )
+    return regressions
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    server = FakeEDCServer(SyntheticCatalog(CatalogSpec(assets=100)), latency_ms=args.latency_ms)
+    base_url = await server.start('127.0.0.1', 0)
+
+    results: Dict[str, Any] = {}
+    try:
+        with tempfile.TemporaryDirectory(prefix='edc-benchmark-') as storage_dir:
+            configure_environment(base_url, storage_dir)
+            for name in args.only or BENCHMARKS:
+                print(f"\n[{name}]")
+                for result in await BENCHMARKS[name](server, args):
+                    results[result.name] = result.to_dict()
+    finally:
+        await server.stop()
+
+    return {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'git_commit': git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'rounds': args.rounds,
+            'sizes': args.sizes,
+            'latency_ms': args.latency_ms
+        },
+        'results': results
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark percorsi critici EDC/lineage")
+    parser.add_argument('--output', help="File JSON dei risultati")
+    parser.add_argument('--compare', help="JSON baseline da confrontare")
+    parser.add_argument('--threshold', type=float, default=0.2, help="Peggioramento tollerato (0.2 = 20%%)")
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000], help="Asset per i benchmark bulk/CSV")
+    parser.add_argument('--tree-assets', type=int, default=20000, help="Asset del catalogo per build_tree")
+    parser.add_argument('--latency-ms', type=float, default=0.0, help="Latenza iniettata nell'EDC finto")
+    parser.add_argument('--only', nargs='+', choices=list(BENCHMARKS), help="Esegue solo i gruppi indicati")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding='utf-8')
+        print(f"\nRisultati salvati in {args.output}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding='utf-8'))
+        regressions = compare_results(report, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regressioni oltre {args.threshold:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
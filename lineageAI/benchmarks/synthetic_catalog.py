@@ -0,0 +1,311 @@
+"""
+Generatore di cataloghi EDC sintetici per benchmark offline.
+Il grafo di lineage e organizzato in livelli (sorgenti -> ... -> data mart):
+ogni asset ha fan_in link upstream verso il livello precedente e ogni asset
+alimenta in media fan_out asset del livello successivo. I link sono salvati in
+formato CSR (array di offset + array di destinazioni), quindi anche un
+catalogo da 1M asset resta in poche decine di MB.
+"""
+import random
+from array import array
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+TABLE_CLASS = 'com.infa.ldm.relational.Table'
+VIEW_CLASS = 'com.infa.ldm.relational.View'
+LINEAGE_ASSOCIATION = 'core.DirectionalDataFlow'
+
+# Parole usate nei nomi: ognuna compare in circa 1/len(NAME_WORDS) degli asset
+NAME_WORDS = (
+    'CLIENTI', 'GARANZIE', 'CONTI', 'MOVIMENTI',
+    'RAPPORTI', 'ANAGRAFE', 'TASSI', 'PRESTITI'
+)
+
+
+@dataclass
+class CatalogSpec:
+    """Parametri del catalogo sintetico."""
+
+    assets: int = 10000
+    resources: Tuple[str, ...] = ('DataPlatform',)
+    depth: int = 6
+    fan_in: int = 2
+    fan_out: int = 2
+    cycle_ratio: float = 0.0
+    view_ratio: float = 0.1
+    seed: int = 42
+
+
+class SyntheticCatalog:
+    """
+    Catalogo sintetico deterministico (stesso seed = stesso grafo).
+    Gli asset sono identificati dall'indice; ID e nome vengono ricavati
+    dall'indice su richiesta, senza tenere stringhe in memoria.
+    """
+
+    def __init__(self, spec: Optional[CatalogSpec] = None):
+        self.spec = spec or CatalogSpec()
+        if self.spec.assets < self.spec.depth:
+            raise ValueError("assets deve essere >= depth")
+
+        rng = random.Random(self.spec.seed)
+        self._layer_starts = self._build_layers()
+        self._classes = bytearray(
+            1 if rng.random() < self.spec.view_ratio else 0
+            for _ in range(self.spec.assets)
+        )
+
+        edges = self._build_edges(rng)
+        cycle_edges = self._build_cycles(rng, edges)
+        edges.extend(cycle_edges)
+        self._up_offsets, self._up_targets = self._build_csr(edges, reverse=False)
+        self._down_offsets, self._down_targets = self._build_csr(edges, reverse=True)
+
+        self.edge_count = len(edges)
+        self.cycle_count = len(cycle_edges)
+
+    # ------------------------------------------------------------------
+    # Costruzione
+    # ------------------------------------------------------------------
+
+    def _build_layers(self) -> List[int]:
+        """
+        Dimensioni dei livelli in progressione geometrica fan_out/fan_in,
+        cosi i link richiesti da un livello corrispondono a quelli offerti
+        dal precedente. Restituisce gli indici di inizio di ogni livello.
+        """
+        spec = self.spec
+        ratio = spec.fan_out / spec.fan_in
+        weights = [ratio ** layer for layer in range(spec.depth)]
+        total_weight = sum(weights)
+        sizes = [max(1, int(spec.assets * w / total_weight)) for w in weights]
+        sizes[-1] += spec.assets - sum(sizes)
+        if sizes[-1] < 1:
+            raise ValueError("Combinazione assets/depth/fan non valida")
+
+        starts = [0]
+        for size in sizes[:-1]:
+            starts.append(starts[-1] + size)
+        return starts
+
+    def _layer_range(self, layer: int) -> range:
+        start = self._layer_starts[layer]
+        end = self._layer_starts[layer + 1] if layer + 1 < self.spec.depth else self.spec.assets
+        return range(start, end)
+
+    def _build_edges(self, rng: random.Random) -> List[Tuple[int, int]]:
+        """
+        Link (upstream, downstream) tra livelli adiacenti: ogni parent offre
+        fan_out slot mescolati, ogni figlio ne prende fan_in (senza duplicati).
+        """
+        edges: List[Tuple[int, int]] = []
+        for layer in range(1, self.spec.depth):
+            parents = self._layer_range(layer - 1)
+            slots = list(parents) * self.spec.fan_out
+            rng.shuffle(slots)
+            position = 0
+            for child in self._layer_range(layer):
+                chosen = set()
+                for _ in range(min(self.spec.fan_in, len(parents))):
+                    parent = slots[position % len(slots)]
+                    position += 1
+                    if parent not in chosen:
+                        chosen.add(parent)
+                        edges.append((parent, child))
+        return edges
+
+    def _build_cycles(
+        self,
+        rng: random.Random,
+        edges: Sequence[Tuple[int, int]]
+    ) -> List[Tuple[int, int]]:
+        """
+        Chiude cycle_ratio degli asset sorgente in un ciclo: si scende lungo
+        il primo figlio fino all'ultimo livello e si aggiunge il link foglia -> sorgente.
+        """
+        sources = self._layer_range(0)
+        count = round(self.spec.cycle_ratio * len(sources))
+        if not count:
+            return []
+
+        first_child = array('i', [-1]) * self.spec.assets
+        for upstream, downstream in edges:
+            if first_child[upstream] < 0:
+                first_child[upstream] = downstream
+
+        cycle_edges = []
+        for source in rng.sample(sources, min(count, len(sources))):
+            node = source
+            while first_child[node] >= 0:
+                node = first_child[node]
+            if node != source:
+                cycle_edges.append((node, source))
+        return cycle_edges
+
+    def _build_csr(
+        self,
+        edges: Sequence[Tuple[int, int]],
+        reverse: bool
+    ) -> Tuple[array, array]:
+        """
+        Indicizza i link per nodo: upstream (reverse=False, chiave = downstream)
+        o downstream (reverse=True, chiave = upstream).
+        """
+        size = self.spec.assets
+        counts = array('I', [0]) * (size + 1)
+        for upstream, downstream in edges:
+            counts[(upstream if reverse else downstream) + 1] += 1
+
+        offsets = array('I', counts)
+        for i in range(1, size + 1):
+            offsets[i] += offsets[i - 1]
+
+        targets = array('I', [0]) * len(edges)
+        fill = array('I', offsets)
+        for upstream, downstream in edges:
+            key, target = (upstream, downstream) if reverse else (downstream, upstream)
+            targets[fill[key]] = target
+            fill[key] += 1
+
+        return offsets, targets
+
+    # ------------------------------------------------------------------
+    # Accesso agli asset
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return self.spec.assets
+
+    @property
+    def layer_count(self) -> int:
+        return self.spec.depth
+
+    def layer(self, index: int) -> int:
+        return bisect_right(self._layer_starts, index) - 1
+
+    def resource(self, index: int) -> str:
+        return self.spec.resources[index % len(self.spec.resources)]
+
+    def word(self, index: int) -> str:
+        # Hash moltiplicativo: parole indipendenti da risorsa e livello
+        return NAME_WORDS[((index * 2654435761) >> 16) % len(NAME_WORDS)]
+
+    def name(self, index: int) -> str:
+        return f"T{self.layer(index):02d}_{self.word(index)}_{index}"
+
+    def class_type(self, index: int) -> str:
+        return VIEW_CLASS if self._classes[index] else TABLE_CLASS
+
+    def asset_id(self, index: int) -> str:
+        return f"{self.resource(index)}://L{self.layer(index):02d}/{self.name(index)}"
+
+    def index_of(self, asset_id: str) -> Optional[int]:
+        """Indice di un asset dal suo ID (None se non appartiene al catalogo)."""
+        try:
+            index = int(asset_id.rsplit('_', 1)[1])
+        except (IndexError, ValueError):
+            return None
+        if 0 <= index < self.spec.assets and self.asset_id(index) == asset_id:
+            return index
+        return None
+
+    def upstream(self, index: int) -> array:
+        return self._up_targets[self._up_offsets[index]:self._up_offsets[index + 1]]
+
+    def downstream(self, index: int) -> array:
+        return self._down_targets[self._down_offsets[index]:self._down_offsets[index + 1]]
+
+    def leaf_ids(self, count: int = 1) -> List[str]:
+        """ID di asset dell'ultimo livello: radici con il lineage upstream piu profondo."""
+        leaves = self._layer_range(self.spec.depth - 1)
+        step = max(1, len(leaves) // count)
+        return [self.asset_id(i) for i in leaves[::step][:count]]
+
+    def search(self, matches: Optional[Callable[[str], bool]] = None) -> Iterator[int]:
+        """Indici degli asset il cui nome soddisfa il predicato (tutti se None)."""
+        for index in range(self.spec.assets):
+            if matches is None or matches(self.name(index)):
+                yield index
+
+    # ------------------------------------------------------------------
+    # Payload in formato EDC
+    # ------------------------------------------------------------------
+
+    def _link(self, index: int) -> Dict[str, str]:
+        asset_id = self.asset_id(index)
+        return {
+            'id': asset_id,
+            'href': f"/2/catalog/data/objects/{asset_id}",
+            'association': LINEAGE_ASSOCIATION,
+            'name': self.name(index),
+            'classType': self.class_type(index)
+        }
+
+    def to_item(
+        self,
+        index: int,
+        include_src_links: bool = True,
+        include_dst_links: bool = True
+    ) -> Dict:
+        """Item dell'API objects (facts + srcLinks/dstLinks)."""
+        asset_id = self.asset_id(index)
+        item = {
+            'id': asset_id,
+            'href': f"/2/catalog/data/objects/{asset_id}",
+            'facts': [
+                {'attributeId': 'core.name', 'value': self.name(index)},
+                {'attributeId': 'core.classType', 'value': self.class_type(index)},
+                {'attributeId': 'core.resourceName', 'value': self.resource(index)},
+                {
+                    'attributeId': 'core.description',
+                    'value': f"Asset sintetico livello {self.layer(index)} ({self.word(index).lower()})"
+                }
+            ]
+        }
+        if include_src_links:
+            item['srcLinks'] = [self._link(i) for i in self.upstream(index)]
+        if include_dst_links:
+            item['dstLinks'] = [self._link(i) for i in self.downstream(index)]
+        return item
+
+    def referenced_objects(self, indexes: Iterable[int]) -> List[Dict]:
+        """Oggetti referenziati dai link (includeRefObjects=true)."""
+        referenced = set()
+        for index in indexes:
+            referenced.update(self.upstream(index))
+            referenced.update(self.downstream(index))
+        return [
+            self.to_item(i, include_src_links=False, include_dst_links=False)
+            for i in sorted(referenced)
+        ]
+
+    def iter_bulk_rows(
+        self,
+        resource: str,
+        class_types: Optional[Iterable[str]] = None
+    ) -> Iterator[Tuple[str, str, str]]:
+        """Righe (id, core.name, core.classType) di una risorsa per l'API bulk."""
+        wanted = set(class_types) if class_types else None
+        resources = self.spec.resources
+        try:
+            first = resources.index(resource)
+        except ValueError:
+            return
+        for index in range(first, self.spec.assets, len(resources)):
+            class_type = self.class_type(index)
+            if wanted is None or class_type in wanted:
+                yield self.asset_id(index), self.name(index), class_type
+
+    def describe(self) -> Dict:
+        """Riepilogo del catalogo (per log e risultati dei benchmark)."""
+        return {
+            'assets': self.spec.assets,
+            'resources': list(self.spec.resources),
+            'depth': self.spec.depth,
+            'fan_in': self.spec.fan_in,
+            'fan_out': self.spec.fan_out,
+            'edges': self.edge_count,
+            'cycles': self.cycle_count,
+            'seed': self.spec.seed
+        }
@@ -4,17 +4,17 @@ EDC API Server - Bridge tra Interfaccia Web e Backend Python
 Espone le funzionalita MCP via REST API per l'interfaccia web.
 Sviluppato per Lorenzo - Principal Data Architect @ NTT Data Italia
 """
-import asyncio
 import sys
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional
 from datetime import datetime
 
 # Setup path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from pydantic import BaseModel
 import uvicorn
 
@@ -22,10 +22,11 @@ import uvicorn
 from src.edc.lineage import LineageBuilder
 from src.llm.factory import LLMFactory, LLMConfig
 from src.config.settings import settings, LLMProvider
+from src.metrics import metrics
 
 # Modelli Pydantic per validazione request
 class SearchAssetsRequest(BaseModel):
-    resource_name: str
+    resource_name: Optional[str] = None  # None o "*" = ricerca federata
     name_filter: Optional[str] = None
     asset_type: Optional[str] = None
     max_results: int = 20
@@ -39,6 +40,14 @@ class AnalyzeImpactRequest(BaseModel):
     asset_id: str
     change_type: str
     change_description: str
+    max_depth: int = 5
+
+class QueryLineageStoreRequest(BaseModel):
+    asset_id: str
+    direction: str = "downstream"
+    max_depth: int = 6
+    class_type: Optional[str] = None  # es. "Report", "Column"
+    max_results: int = 50
 
 class GenerateChecklistRequest(BaseModel):
     asset_id: str
@@ -65,6 +74,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.middleware("http")
+async def track_endpoint_metrics(request: Request, call_next):
+    """Misura gli endpoint /api/mcp/* come tool (durata e chiamate LLM)."""
+    if not request.url.path.startswith("/api/mcp/"):
+        return await call_next(request)
+    with metrics.tool_scope(request.url.path.rsplit("/", 1)[-1]):
+        return await call_next(request)
+
 # Stato globale
 lineage_builder: Optional[LineageBuilder] = None
 llm_client = None
@@ -165,12 +183,23 @@ async def search_assets(request: SearchAssetsRequest):
         print(f"  Filter: {request.name_filter}")
         print(f"  Type: {request.asset_type}")
         
-        # Chiama il metodo reale dell'EDC
-        results = await lineage_builder.edc_client.bulk_search_assets(
-            resource_name=request.resource_name,
-            name_filter=request.name_filter or "",
-            asset_type_filter=request.asset_type or ""
-        )
+        if request.resource_name in (None, "", "*"):
+            # Ricerca federata su tutte le risorse configurate, in parallelo
+            results = [
+                item async for item in lineage_builder.edc_client.iter_federated_assets(
+                    name_filter=request.name_filter or None,
+                    asset_type_filter=request.asset_type or None,
+                    max_results=request.max_results
+                )
+            ]
+        else:
+            # Ricerca sullo snapshot locale della risorsa (API bulk finche non e caricato)
+            results = await lineage_builder.edc_client.search_resource_assets(
+                resource_name=request.resource_name,
+                name_filter=request.name_filter or None,
+                asset_type_filter=request.asset_type or None,
+                max_results=request.max_results
+            )
         
         execution_time = (datetime.now() - start_time).total_seconds() * 1000
         
@@ -206,7 +235,8 @@ async def search_assets(request: SearchAssetsRequest):
                 "type": type_short,
                 "classType": class_type,
                 "connection": connection,
-                "schema": schema
+                "schema": schema,
+                "resource": item.get('resource', request.resource_name)
             })
         
         return {
@@ -214,7 +244,7 @@ async def search_assets(request: SearchAssetsRequest):
             "results": formatted_results,
             "results_count": len(formatted_results),
             "total_found": len(results),
-            "resource": request.resource_name,
+            "resource": request.resource_name or "*",
             "filter_applied": request.name_filter or "none",
             "execution_time_ms": int(execution_time)
         }
@@ -296,13 +326,14 @@ async def analyze_impact(request: AnalyzeImpactRequest):
         print(f"  Asset ID: {request.asset_id}")
         print(f"  Change type: {request.change_type}")
         
-        # Costruisci lineage per analisi
-        tree = await lineage_builder.build_tree(
-            root_asset_id=request.asset_id,
-            max_depth=3
+        # Asset downstream impattati (crawl multi-livello)
+        impacted = await lineage_builder.get_downstream_impact(
+            request.asset_id,
+            max_depth=request.max_depth
         )
         
-        downstream_count = sum(1 for node in tree if node.parent_id == request.asset_id)
+        downstream_count = len(impacted)
+        direct_count = sum(1 for asset in impacted if asset['depth'] == 1)
         
         # Genera analisi AI
         prompt = f"""
@@ -311,7 +342,7 @@ Analyze the impact of this change:
 Asset: {request.asset_id}
 Change Type: {request.change_type}
 Description: {request.change_description}
-Downstream Dependencies: {downstream_count}
+Downstream Dependencies: {downstream_count} ({direct_count} direct, up to {request.max_depth} levels)
 
 Provide:
 1. Risk level (LOW/MEDIUM/HIGH)
@@ -332,7 +363,7 @@ Provide:
             "success": True,
             "analysis_text": analysis,
             "impacted_assets": downstream_count,
-            "downstream_tables": downstream_count,
+            "downstream_tables": direct_count,
             "risk_level": "MEDIUM",  # TODO: parse from AI response
             "execution_time_ms": int(execution_time)
         }
@@ -344,6 +375,45 @@ Provide:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/api/mcp/query_lineage_store")
+async def query_lineage_store(request: QueryLineageStoreRequest):
+    """Interroga il grafo di lineage persistente (EDC solo per nodi sconosciuti o scaduti)."""
+    if not lineage_builder:
+        raise HTTPException(status_code=500, detail="Lineage builder not initialized")
+    
+    start_time = datetime.now()
+    
+    try:
+        print(f"\n[API] query_lineage_store chiamato")
+        print(f"  Asset ID: {request.asset_id}")
+        print(f"  Direction: {request.direction}, max_depth: {request.max_depth}")
+        
+        result = await lineage_builder.query_lineage_store(
+            request.asset_id,
+            direction=request.direction,
+            max_depth=request.max_depth,
+            class_filter=request.class_type,
+            max_results=request.max_results
+        )
+        
+        execution_time = (datetime.now() - start_time).total_seconds() * 1000
+        
+        print(f"  Trovati {len(result['assets'])} asset (ricaricati da EDC: {result['refreshed']})")
+        print(f"  Execution time: {execution_time:.0f}ms")
+        
+        return {
+            "success": True,
+            **result,
+            "execution_time_ms": int(execution_time)
+        }
+        
+    except Exception as e:
+        print(f"  ERROR: {e}")
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @app.post("/api/mcp/generate_operational_checklist")
 async def generate_checklist(request: GenerateChecklistRequest):
     """Genera checklist operativa."""
@@ -442,6 +512,15 @@ async def system_status():
     }
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Istogrammi di latenza, byte e parsing in formato testuale Prometheus."""
+    return PlainTextResponse(
+        metrics.render_prometheus(),
+        media_type="text/plain; version=0.0.4"
+    )
+
+
 def main():
     """Avvia il server API."""
     print("\n" + "=" * 70)
@@ -27,6 +27,7 @@ except ImportError:
 # Import sistema EDC
 try:
     from src.config.settings import settings
+    from src.edc.class_types import ClassTypeSelector
     from src.mcp.server import EDCMCPServer
 
     REAL_EDC = True
@@ -395,18 +396,32 @@ class EDCChatInterface:
         params = {}
         message_upper = message.upper()
 
-        # Estrai resource name
-        for resource in ["DataPlatform", "ORAC51", "ORAC52", "DWHEVO"]:
+        # Estrai resource name (senza risorsa search_assets usa la ricerca federata)
+        resources = settings.edc_federated_resources_list if REAL_EDC else ["DataPlatform", "ORAC51", "ORAC52", "DWHEVO"]
+        for resource in resources:
             if resource.upper() in message_upper:
                 params["resource_name"] = resource
                 break
 
-        # Estrai name filter
-        keywords = ["GARANZIE", "SOFFERENZE", "CLIENTE", "CUSTOMER", "ACCOUNT"]
-        for keyword in keywords:
-            if keyword in message_upper:
-                params["name_filter"] = keyword
-                break
+        # Estrai name filter: prima dall'indice dei nomi dello snapshot locale
+        lineage_builder = getattr(self.server, "lineage_builder", None)
+        if lineage_builder and "resource_name" in params:
+            suggested = lineage_builder.edc_client.suggest_name_filter(message, params["resource_name"])
+            if suggested:
+                params["name_filter"] = suggested
+
+        if "name_filter" not in params:
+            keywords = ["GARANZIE", "SOFFERENZE", "CLIENTE", "CUSTOMER", "ACCOUNT"]
+            for keyword in keywords:
+                if keyword in message_upper:
+                    params["name_filter"] = keyword
+                    break
+
+        # Estrai tipi asset (es. "tabelle e viste" -> Table + View, cercati in parallelo)
+        if intent == "search_assets" and REAL_EDC:
+            class_types = ClassTypeSelector.infer_class_types(message, default_to_columns=False)
+            if class_types:
+                params["asset_type"] = ",".join(sorted(class_types))
 
         # Estrai asset ID (pattern DataPlatform://...)
         if "://" in message:
@@ -65,9 +65,11 @@ async def standalone_server():
         tools = [
             "get_asset_details",
             "search_assets",
+            "refresh_resource_snapshot",
             "get_lineage_tree",
             "get_immediate_lineage",
             "analyze_change_impact",
+            "query_lineage_store",
             "generate_change_checklist",
             "enhance_asset_documentation",
             "switch_llm_provider",
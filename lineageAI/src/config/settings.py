@@ -50,14 +50,58 @@ class Settings(BaseSettings):
     edc_include_src_links: bool = Field(default=True)
     edc_page_size: int = Field(default=20)
     edc_offset: int = Field(default=0)
+    edc_batch_size: int = Field(default=25, description="ID per query batch sull'API objects")
+    edc_search_page_size: int = Field(default=100, description="Risultati per pagina nella ricerca objects")
+    edc_search_parallel_pages: int = Field(default=4, description="Pagine scaricate in parallelo con totalCount noto")
+    edc_keep_raw_metadata: bool = Field(default=False, description="Mantieni il payload raw EDC in 'metadata'")
+    edc_traversal_fetch: bool = Field(default=True, description="Crawl lineage con payload minimo (senza ref objects)")
 
     # Performance EDC
     edc_request_timeout: int = Field(default=30)
     edc_max_retries: int = Field(default=3)
+    edc_retry_backoff_base: float = Field(default=0.5, description="Backoff base retry (s)")
+    edc_retry_backoff_max: float = Field(default=8.0, description="Backoff massimo retry (s)")
+    edc_retry_budget: int = Field(default=20, description="Token di retry disponibili")
+    edc_circuit_failure_threshold: int = Field(default=5)
+    edc_circuit_reset_timeout: int = Field(default=30)
+    edc_concurrency_initial: int = Field(default=4, description="Richieste EDC parallele iniziali (AIMD)")
+    edc_concurrency_min: int = Field(default=1)
+    edc_concurrency_max: int = Field(default=10)
     edc_max_tree_depth: int = Field(default=100)
-    edc_max_total_nodes: int = Field(default=10000)
+    edc_max_total_nodes: int = Field(default=10000, description="Nodi massimi per costruzione lineage (0 = nessun limite)")
+    edc_build_deadline_seconds: float = Field(default=60.0, description="Tempo massimo per costruzione lineage (0 = nessun limite)")
     edc_enable_child_deduplication: bool = Field(default=True)
 
+    # Cache asset EDC (0 = nessun limite)
+    edc_cache_max_entries: int = Field(default=5000)
+    edc_cache_max_bytes: int = Field(default=0, description="Budget cache in byte stimati")
+    edc_cache_ttl_seconds: int = Field(default=3600)
+    edc_cache_backend: str = Field(default="memory", description="memory oppure sqlite (persistente)")
+    edc_cache_path: str = Field(default=".cache/edc_assets.sqlite", description="File cache sqlite (relativo al progetto)")
+    edc_cache_stale_seconds: int = Field(default=604800, description="Eta massima entry sqlite servite con refresh in background")
+    edc_negative_cache_ttl_seconds: int = Field(default=300, description="TTL asset vuoti/404 in cache (0 = disattivata)")
+
+    # Record/replay HTTP (test di carico offline con payload reali)
+    edc_http_mode: str = Field(default="live", description="live, record (registra su cassetta) oppure replay (solo cassetta)")
+    edc_http_cassette: str = Field(default=".cache/edc_cassette.jsonl", description="Cassetta JSONL (relativa al progetto)")
+    edc_replay_delay_factor: float = Field(default=0.0, description="Replay: 0 = massima velocita, 1 = tempi originali")
+
+    # Ricerca federata (search_assets senza risorsa)
+    edc_federated_resources: str = Field(
+        default="DataPlatform,ORAC51,ORAC52,DWHEVO",
+        description="Risorse EDC interrogate in parallelo dalla ricerca federata",
+    )
+
+    # Snapshot locali delle risorse per search_assets
+    edc_snapshot_enabled: bool = Field(default=True)
+    edc_snapshot_path: str = Field(default=".cache/edc_snapshots.sqlite", description="File snapshot sqlite (relativo al progetto)")
+    edc_snapshot_refresh_seconds: int = Field(default=86400, description="Eta oltre cui lo snapshot viene aggiornato in background (0 = solo refresh esplicito)")
+
+    # Store persistente del grafo di lineage (query ricorsive locali)
+    edc_graph_store_enabled: bool = Field(default=True)
+    edc_graph_store_path: str = Field(default=".cache/edc_lineage_graph.sqlite", description="File grafo lineage sqlite (relativo al progetto)")
+    edc_graph_store_ttl_seconds: int = Field(default=86400, description="Eta oltre cui un nodo dello store viene ricaricato da EDC (0 = mai)")
+
     # ========================================
     # LLM Configuration
     # ========================================
@@ -128,6 +172,12 @@ class Settings(BaseSettings):
         """Lista associations"""
         return [a.strip() for a in self.edc_associations.split(",") if a.strip()]
 
+    @computed_field
+    @property
+    def edc_federated_resources_list(self) -> List[str]:
+        """Lista risorse per la ricerca federata"""
+        return [r.strip() for r in self.edc_federated_resources.split(",") if r.strip()]
+
     def get_edc_headers(self) -> dict:
         """Headers per chiamate EDC"""
         return {
@@ -156,6 +206,16 @@ class Settings(BaseSettings):
 
         return params
 
+    def get_edc_traversal_params(self) -> list:
+        """
+        Parametri API EDC per il crawl del lineage (profilo traversal).
+        Stesse associations e link dei parametri statici, senza ref objects.
+        """
+        return [
+            (key, "false" if key == "includeRefObjects" else value)
+            for key, value in self.get_edc_static_params()
+        ]
+
     def is_claude_available(self) -> bool:
         """Verifica se Claude e configurato"""
         return self.claude_api_key is not None and len(self.claude_api_key) > 10
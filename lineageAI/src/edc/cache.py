@@ -0,0 +1,359 @@
+"""
+Cache degli asset EDC.
+Backend intercambiabili per EDCClient con limite di dimensione, TTL ed eviction LRU.
+Include un backend SQLite persistente che sopravvive ai riavvii del server MCP.
+"""
+import hashlib
+import json
+import sqlite3
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+def _json_default(value: Any) -> Any:
+    """Serializza i record compatti (Mapping, es. AssetRecord) come dict."""
+    if isinstance(value, Mapping):
+        return dict(value)
+    return str(value)
+
+
+def estimate_size(value: Any) -> int:
+    """
+    Stima la dimensione in byte di un valore serializzandolo in JSON.
+    Usata solo quando e configurato un budget in byte.
+    """
+    try:
+        return len(json.dumps(value, default=_json_default))
+    except (TypeError, ValueError):
+        return len(repr(value))
+
+
+class CacheBackend:
+    """
+    Interfaccia comune dei backend di cache usati da EDCClient.
+    """
+
+    def get(self, key: str, count: bool = True) -> Optional[Any]:
+        """
+        Restituisce il valore in cache o None se assente/scaduto.
+        Con count=False hit e miss non vengono contati: serve ai lookup che
+        provano piu chiavi e registrano un solo esito con record_lookup().
+        """
+        raise NotImplementedError
+
+    def record_lookup(self, hit: bool) -> None:
+        """Registra l'esito di un lookup logico fatto con get(count=False)."""
+        self._stats['cache_hits' if hit else 'cache_misses'] += 1
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Salva un valore, con TTL opzionale specifico per la entry."""
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        """Rimuove una entry se presente."""
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        """Svuota la cache."""
+        raise NotImplementedError
+
+    def get_statistics(self) -> Dict[str, int]:
+        """Restituisce contatori della cache."""
+        raise NotImplementedError
+
+    def is_stale(self, key: str) -> bool:
+        """
+        Indica se una entry valida andrebbe riconvalidata in background.
+        I backend senza stale-while-revalidate ritornano sempre False.
+        """
+        return False
+
+    def fetched_at(self, key: str) -> Optional[float]:
+        """Timestamp (time.time) del salvataggio della entry, None se assente."""
+        return None
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.set(key, value)
+
+
+class MemoryCache(CacheBackend):
+    """
+    Cache in memoria con eviction LRU.
+    Limiti: numero massimo di entry e/o budget in byte; TTL per entry.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 5000,
+        max_bytes: int = 0,
+        ttl: float = 3600,
+        size_func: Callable[[Any], int] = estimate_size
+    ):
+        """
+        Inizializza la cache.
+
+        Args:
+            max_entries: Numero massimo di entry (0 = illimitato)
+            max_bytes: Budget in byte stimati (0 = illimitato)
+            ttl: TTL di default in secondi (0 = nessuna scadenza)
+            size_func: Funzione di stima della dimensione di un valore
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.size_func = size_func
+
+        # key -> (valore, scadenza, dimensione, salvataggio)
+        self._entries: "OrderedDict[str, Tuple[Any, float, int, float]]" = OrderedDict()
+        self._bytes = 0
+        self._stats = {
+            'cache_hits': 0,
+            'cache_misses': 0,
+            'cache_evictions': 0,
+            'cache_expirations': 0
+        }
+
+    def get(self, key: str, count: bool = True) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            if count:
+                self._stats['cache_misses'] += 1
+            return None
+
+        value, expires_at, _, _ = entry
+        if expires_at and expires_at <= time.monotonic():
+            self._remove(key)
+            self._stats['cache_expirations'] += 1
+            if count:
+                self._stats['cache_misses'] += 1
+            return None
+
+        self._entries.move_to_end(key)
+        if count:
+            self._stats['cache_hits'] += 1
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        if key in self._entries:
+            self._remove(key)
+
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl else 0.0
+        size = self.size_func(value) if self.max_bytes else 0
+
+        self._entries[key] = (value, expires_at, size, time.time())
+        self._bytes += size
+        self._evict()
+
+    def peek(self, key: str) -> Optional[Any]:
+        """Legge un valore senza aggiornare LRU e contatori."""
+        entry = self._entries.get(key)
+        return entry[0] if entry is not None else None
+
+    def fetched_at(self, key: str) -> Optional[float]:
+        entry = self._entries.get(key)
+        return entry[3] if entry is not None else None
+
+    def delete(self, key: str) -> None:
+        if key in self._entries:
+            self._remove(key)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def get_statistics(self) -> Dict[str, int]:
+        return {
+            **self._stats,
+            'cache_entries': len(self._entries),
+            'cache_bytes': self._bytes
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key: str) -> None:
+        _, _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def _evict(self) -> None:
+        """Rimuove le entry meno usate finche i limiti sono rispettati."""
+        while self._entries and (
+            (self.max_entries and len(self._entries) > self.max_entries)
+            or (self.max_bytes and self._bytes > self.max_bytes)
+        ):
+            key, _ = next(iter(self._entries.items()))
+            self._remove(key)
+            self._stats['cache_evictions'] += 1
+
+
+def params_namespace(base_url: str, params: List[Tuple[str, str]]) -> str:
+    """
+    Calcola il namespace della cache a partire da URL e parametri statici.
+    Cambiando associations/include* le entry persistite non vengono riusate.
+    """
+    raw = json.dumps([base_url, sorted(params)])
+    return hashlib.sha1(raw.encode()).hexdigest()[:16]
+
+
+class SQLiteCache(CacheBackend):
+    """
+    Cache persistente su SQLite con front LRU in memoria.
+    Le entry sono chiavi (asset_id, namespace) con timestamp di fetch:
+    - eta < ttl: fresche
+    - ttl <= eta < stale_ttl: servite ma segnalate come da riconvalidare
+    - eta >= stale_ttl: scadute e rimosse
+    Le entry salvate con un TTL specifico (es. cache negativa) hanno una
+    scadenza propria (expires_at) e non vengono mai servite oltre.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        namespace: str,
+        max_entries: int = 5000,
+        ttl: float = 3600,
+        stale_ttl: float = 7 * 24 * 3600
+    ):
+        """
+        Inizializza la cache persistente.
+
+        Args:
+            path: Percorso del file SQLite
+            namespace: Namespace dei parametri statici (vedi params_namespace)
+            max_entries: Entry massime nel front in memoria (0 = illimitato)
+            ttl: Eta in secondi oltre cui una entry va riconvalidata
+            stale_ttl: Eta in secondi oltre cui una entry viene scartata
+        """
+        self.path = path
+        self.namespace = namespace
+        self.ttl = ttl
+        self.stale_ttl = max(stale_ttl, ttl)
+
+        # Front in memoria: key -> (valore, fetched_at, expires_at); scadenze gestite qui
+        self._front = MemoryCache(max_entries=max_entries, ttl=0)
+        self._stats = {
+            'cache_hits': 0,
+            'cache_misses': 0,
+            'cache_expirations': 0,
+            'cache_disk_hits': 0
+        }
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS asset_cache (
+                asset_id TEXT NOT NULL,
+                namespace TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                payload TEXT NOT NULL,
+                expires_at REAL,
+                PRIMARY KEY (asset_id, namespace)
+            )
+            """
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(asset_cache)")}
+        if 'expires_at' not in columns:
+            # File creati prima della scadenza per entry
+            self._conn.execute("ALTER TABLE asset_cache ADD COLUMN expires_at REAL")
+        self._conn.commit()
+
+    def get(self, key: str, count: bool = True) -> Optional[Any]:
+        entry = self._get_entry(key)
+        if count:
+            self.record_lookup(entry is not None)
+        return entry[0] if entry is not None else None
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        fetched_at = time.time()
+        expires_at = fetched_at + ttl if ttl else None
+
+        self._front.set(key, (value, fetched_at, expires_at))
+        self._conn.execute(
+            "INSERT OR REPLACE INTO asset_cache (asset_id, namespace, fetched_at, payload, expires_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (key, self.namespace, fetched_at, json.dumps(value, default=_json_default), expires_at)
+        )
+        self._conn.commit()
+
+    def delete(self, key: str) -> None:
+        self._front.delete(key)
+        self._conn.execute(
+            "DELETE FROM asset_cache WHERE asset_id = ? AND namespace = ?",
+            (key, self.namespace)
+        )
+        self._conn.commit()
+
+    def clear(self) -> None:
+        self._front.clear()
+        self._conn.execute("DELETE FROM asset_cache WHERE namespace = ?", (self.namespace,))
+        self._conn.commit()
+
+    def is_stale(self, key: str) -> bool:
+        entry = self._front.peek(key)
+        if entry is None:
+            return False
+        _, fetched_at, _ = entry
+        return time.time() - fetched_at >= self.ttl
+
+    def fetched_at(self, key: str) -> Optional[float]:
+        # Timestamp del fetch originale, anche per le entry servite stale
+        entry = self._get_entry(key)
+        return entry[1] if entry is not None else None
+
+    def get_statistics(self) -> Dict[str, int]:
+        row = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(payload)), 0) FROM asset_cache WHERE namespace = ?",
+            (self.namespace,)
+        ).fetchone()
+        front_stats = self._front.get_statistics()
+        return {
+            **self._stats,
+            'cache_evictions': front_stats['cache_evictions'],
+            'cache_entries': row[0],
+            'cache_bytes': row[1]
+        }
+
+    def close(self) -> None:
+        """Chiude la connessione SQLite."""
+        self._conn.close()
+
+    def __len__(self) -> int:
+        return self.get_statistics()['cache_entries']
+
+    def _get_entry(self, key: str) -> Optional[Tuple[Any, float, Optional[float]]]:
+        """Legge (valore, fetched_at, expires_at) dal front o dal disco, scartando le entry scadute."""
+        entry = self._front.get(key)
+        if entry is None:
+            row = self._conn.execute(
+                "SELECT payload, fetched_at, expires_at FROM asset_cache WHERE asset_id = ? AND namespace = ?",
+                (key, self.namespace)
+            ).fetchone()
+            if row is None:
+                return None
+            entry = (json.loads(row[0]), row[1], row[2])
+            self._front.set(key, entry)
+            self._stats['cache_disk_hits'] += 1
+
+        now = time.time()
+        if now - entry[1] >= self.stale_ttl or (entry[2] is not None and now >= entry[2]):
+            self.delete(key)
+            self._stats['cache_expirations'] += 1
+            return None
+
+        return entry
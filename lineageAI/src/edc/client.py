@@ -3,16 +3,164 @@ Client EDC per integrazione con API Informatica EDC.
 Versione aggiornata per Allitude EDC con gestione robusta delle risposte API.
 """
 import asyncio
+import codecs
+import csv
+import json
+import re
+import time
+from collections import deque
+from contextlib import asynccontextmanager
 import aiohttp
-from typing import Dict, List, Optional, Any
+from pathlib import Path
+from typing import AsyncIterator, Callable, Deque, Dict, List, Mapping, Optional, Any, Sequence, Set, Tuple, Union
 import logging
 import urllib3
 
 from src.config.settings import settings
+from src.metrics import (
+    EDC_PARSE_SECONDS,
+    EDC_REQUEST_SECONDS,
+    EDC_RESPONSE_BYTES,
+    metrics
+)
+from src.edc.class_types import ClassTypeSelector
+from src.edc.cache import CacheBackend, MemoryCache, SQLiteCache, params_namespace
+from src.edc.models import AssetLink, AssetRecord
+from src.edc.name_index import NamePattern
+from src.edc.recording import (
+    HTTP_MODE_RECORD,
+    HTTP_MODE_REPLAY,
+    Cassette,
+    RecordingSession,
+    ReplaySession
+)
+from src.edc.snapshot import SnapshotStore
+from src.edc.resilience import AdaptiveConcurrencyLimiter, CircuitBreaker, RetryPolicy, is_retryable
 
 # Disabilita warning SSL
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+# Dimensione dei blocchi letti dallo stream CSV dell'API bulk
+BULK_CSV_CHUNK_SIZE = 64 * 1024
+
+# Profili di fetch dell'API objects
+# - full: dettagli completi (facts, ref objects) per visualizzazione e LLM
+# - traversal: payload minimo per il crawl del lineage (id, nome, classType, link)
+FETCH_PROFILE_FULL = 'full'
+FETCH_PROFILE_TRAVERSAL = 'traversal'
+
+# classTypes dell'API bulk per i tipi brevi accettati da search_assets
+BULK_CLASS_TYPES = {
+    'table': 'com.infa.ldm.relational.Table',
+    'view': 'com.infa.ldm.relational.View',
+    'column': 'com.infa.ldm.relational.Column',
+    'viewcolumn': 'com.infa.ldm.relational.ViewColumn'
+}
+
+# suggest_name_filter: lunghezza minima e parole che non identificano un asset
+NAME_FILTER_MIN_LENGTH = 4
+NAME_FILTER_STOP_WORDS = frozenset({
+    'ASSET', 'ASSETS', 'CERCA', 'CERCARE', 'TROVA', 'MOSTRA', 'ELENCO', 'ELENCA',
+    'TABELLA', 'TABELLE', 'VISTA', 'VISTE', 'COLONNA', 'COLONNE', 'CAMPO', 'CAMPI',
+    'RISORSA', 'RISORSE', 'LINEAGE', 'UPSTREAM', 'DOWNSTREAM', 'IMPATTO', 'REPORT',
+    'DATI', 'TUTTI', 'TUTTE', 'QUALI', 'DELLA', 'DELLE', 'DEGLI', 'NELLA', 'NELLE',
+    'SEARCH', 'FIND', 'SHOW', 'LIST', 'TABLE', 'TABLES', 'VIEW', 'VIEWS',
+    'COLUMN', 'COLUMNS', 'RESOURCE', 'DATA', 'WITH', 'FROM', 'WHERE', 'WHICH'
+})
+
+
+# Item in coda per stream in parallelo (vedi merge_async_iterators)
+MERGE_QUEUE_SIZE = 256
+_STREAM_DONE = object()
+
+
+def resolve_bulk_class_type(asset_type_filter: Optional[str]) -> str:
+    """
+    Converte il tipo asset richiesto (Table, View, ... o classType completo)
+    nel classType dell'API bulk; default Table.
+    """
+    if not asset_type_filter:
+        return BULK_CLASS_TYPES['table']
+    if '.' in asset_type_filter:
+        return asset_type_filter
+    return BULK_CLASS_TYPES.get(asset_type_filter.lower(), BULK_CLASS_TYPES['table'])
+
+
+def resolve_bulk_class_types(asset_type_filter: Union[None, str, Sequence[str]]) -> List[str]:
+    """
+    Converte uno o piu tipi asset nei classTypes dell'API bulk, senza duplicati.
+    Accetta una lista, valori separati da virgola ("Table,View") o testo
+    libero interpretato da ClassTypeSelector ("tabelle e viste").
+    """
+    if not asset_type_filter:
+        return [resolve_bulk_class_type(None)]
+    
+    if isinstance(asset_type_filter, str):
+        asset_type_filter = asset_type_filter.split(',')
+    
+    available = ClassTypeSelector.get_available_types()
+    class_types: List[str] = []
+    for asset_type in (value.strip() for value in asset_type_filter):
+        if not asset_type:
+            continue
+        if '.' in asset_type or asset_type.lower() in BULK_CLASS_TYPES:
+            class_types.append(resolve_bulk_class_type(asset_type))
+            continue
+        
+        inferred = ClassTypeSelector.infer_class_types(asset_type, default_to_columns=False)
+        if inferred:
+            class_types.extend(sorted(inferred, key=available.index))
+        else:
+            class_types.append(resolve_bulk_class_type(asset_type))
+    
+    return list(dict.fromkeys(class_types)) or [resolve_bulk_class_type(None)]
+
+
+async def merge_async_iterators(
+    iterators: Sequence[AsyncIterator[Any]],
+    on_error: Optional[Callable[[int, Exception], None]] = None
+) -> AsyncIterator[Tuple[int, Any]]:
+    """
+    Consuma piu iteratori asincroni in parallelo e restituisce gli item man mano
+    che arrivano, come (indice sorgente, item).
+    Alla chiusura del generatore le sorgenti ancora attive vengono cancellate.
+    Se on_error e None il primo errore viene propagato, altrimenti viene
+    notificato e le altre sorgenti proseguono.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=MERGE_QUEUE_SIZE)
+    
+    async def drain(index: int, iterator: AsyncIterator[Any]) -> None:
+        error: Optional[Exception] = None
+        try:
+            async for item in iterator:
+                await queue.put((index, item, None))
+        except Exception as e:
+            error = e
+        finally:
+            # Chiude subito lo stream (risposta HTTP e slot di concorrenza)
+            aclose = getattr(iterator, 'aclose', None)
+            if aclose is not None:
+                await aclose()
+        await queue.put((index, _STREAM_DONE, error))
+    
+    tasks = [asyncio.ensure_future(drain(i, it)) for i, it in enumerate(iterators)]
+    active = len(tasks)
+    try:
+        while active:
+            index, item, error = await queue.get()
+            if item is _STREAM_DONE:
+                active -= 1
+                if error is not None:
+                    if on_error is None:
+                        raise error
+                    on_error(index, error)
+                continue
+            yield index, item
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
 
 class EDCClient:
     """
@@ -22,19 +170,58 @@ class EDCClient:
     
     def __init__(self):
         """Inizializza il client EDC usando settings centralizzato."""
-        self.session: Optional[aiohttp.ClientSession] = None
+        self.session: Optional[Union[aiohttp.ClientSession, RecordingSession, ReplaySession]] = None
         self._setup_from_settings()
         self._setup_logging()
         
         # Cache e statistiche
-        self._cache = {}
+        self._cache: CacheBackend = self._create_cache()
+        self._revalidation_tasks: Set[asyncio.Task] = set()
+        self._revalidating: Set[str] = set()
+        
+        # Retry e circuit breaker per le GET verso EDC
+        self._retry_policy = RetryPolicy(
+            max_retries=self.max_retries,
+            backoff_base=settings.edc_retry_backoff_base,
+            backoff_max=settings.edc_retry_backoff_max,
+            budget=settings.edc_retry_budget
+        )
+        self._circuit_breaker = CircuitBreaker(
+            failure_threshold=settings.edc_circuit_failure_threshold,
+            reset_timeout=settings.edc_circuit_reset_timeout
+        )
+        
+        # Concorrenza adattiva verso l'istanza EDC condivisa
+        self._limiter = AdaptiveConcurrencyLimiter(
+            initial_limit=settings.edc_concurrency_initial,
+            min_limit=settings.edc_concurrency_min,
+            max_limit=settings.edc_concurrency_max
+        )
+        
+        # Richieste in corso per asset (single-flight)
+        self._inflight: Dict[str, asyncio.Future] = {}
+        
+        # Snapshot locali delle risorse per search_assets
+        self._snapshots: Optional[SnapshotStore] = self._create_snapshot_store()
+        self._snapshot_tasks: Dict[Tuple[str, str], asyncio.Task] = {}
         self._stats = {
             'total_requests': 0,
-            'cache_hits': 0,
             'api_errors': 0,
             'empty_responses': 0,
+            'negative_cache_stores': 0,
+            'negative_cache_hits': 0,
             'invalid_links': 0,
-            'synonyms_filtered': 0
+            'synonyms_filtered': 0,
+            'batch_requests': 0,
+            'background_revalidations': 0,
+            'coalesced_requests': 0,
+            'bulk_early_stops': 0,
+            'traversal_fetches': 0,
+            'snapshot_searches': 0,
+            'snapshot_refreshes': 0,
+            'federated_searches': 0,
+            'federated_errors': 0,
+            'search_pages': 0
         }
 
     def _setup_from_settings(self) -> None:
@@ -42,30 +229,315 @@ class EDCClient:
         self.base_url = settings.edc_browse_url
         self.headers = settings.get_edc_headers()
         self.static_params = settings.get_edc_static_params()
+        self.traversal_params = settings.get_edc_traversal_params()
         self.request_timeout = settings.edc_request_timeout
         self.max_retries = settings.edc_max_retries
         
         logging.info(f"EDC Client configurato: {settings.edc_base_url}")
 
+    def _create_cache(self) -> CacheBackend:
+        """
+        Crea il backend di cache configurato (memory o sqlite).
+        Il backend sqlite e persistente e indicizzato anche sui parametri statici.
+        """
+        if settings.edc_cache_backend == 'sqlite':
+            cache_path = Path(settings.edc_cache_path)
+            if not cache_path.is_absolute():
+                cache_path = Path(__file__).parent.parent.parent / cache_path
+            
+            logging.info(f"EDC cache persistente: {cache_path}")
+            return SQLiteCache(
+                path=str(cache_path),
+                namespace=params_namespace(self.base_url, self.static_params),
+                max_entries=settings.edc_cache_max_entries,
+                ttl=settings.edc_cache_ttl_seconds,
+                stale_ttl=settings.edc_cache_stale_seconds
+            )
+        
+        return MemoryCache(
+            max_entries=settings.edc_cache_max_entries,
+            max_bytes=settings.edc_cache_max_bytes,
+            ttl=settings.edc_cache_ttl_seconds
+        )
+
+    def _create_snapshot_store(self) -> Optional[SnapshotStore]:
+        """Crea lo store degli snapshot di risorsa se abilitato."""
+        if not settings.edc_snapshot_enabled:
+            return None
+        
+        snapshot_path = Path(settings.edc_snapshot_path)
+        if not snapshot_path.is_absolute():
+            snapshot_path = Path(__file__).parent.parent.parent / snapshot_path
+        
+        logging.info(f"EDC snapshot risorse: {snapshot_path}")
+        return SnapshotStore(str(snapshot_path))
+
+    @staticmethod
+    def _cache_key(asset_id: str, profile: str) -> str:
+        """
+        Chiave di cache per profilo di fetch.
+        Il profilo full usa l'ID nudo (compatibile con le cache persistite).
+        """
+        if profile == FETCH_PROFILE_TRAVERSAL:
+            return f"{FETCH_PROFILE_TRAVERSAL}:{asset_id}"
+        return asset_id
+
+    @staticmethod
+    def _as_record(value: Mapping) -> AssetRecord:
+        """Record compatto da un valore in cache (il backend SQLite restituisce dict)."""
+        if isinstance(value, AssetRecord):
+            return value
+        return AssetRecord.from_dict(value)
+
+    def _get_cached(self, asset_id: str, profile: str) -> Optional[AssetRecord]:
+        """
+        Legge un asset dalla cache; per il profilo traversal va bene anche
+        un record full gia presente. Schedula il refresh delle entry stale.
+        Le chiavi provate (traversal, full, negativa) valgono un solo hit o miss.
+        """
+        profiles = [profile]
+        if profile == FETCH_PROFILE_TRAVERSAL:
+            profiles.append(FETCH_PROFILE_FULL)
+        
+        for candidate in profiles:
+            key = self._cache_key(asset_id, candidate)
+            cached = self._cache.get(key, count=False)
+            if cached is not None:
+                self._cache.record_lookup(True)
+                if self._cache.is_stale(key):
+                    self._schedule_revalidation(asset_id, candidate)
+                return self._as_record(cached)
+        
+        negative = self._get_negative_cached(asset_id)
+        self._cache.record_lookup(negative is not None)
+        return negative
+
+    @staticmethod
+    def _negative_cache_key(asset_id: str) -> str:
+        """Chiave di cache per un asset vuoto o inesistente (vale per ogni profilo)."""
+        return f"missing:{asset_id}"
+
+    def _get_negative_cached(self, asset_id: str) -> Optional[AssetRecord]:
+        """
+        Legge il placeholder di un asset gia risultato vuoto o 404.
+        Le entry negative non vengono riconvalidate: una volta stale si scartano.
+        """
+        if settings.edc_negative_cache_ttl_seconds <= 0:
+            return None
+        
+        key = self._negative_cache_key(asset_id)
+        cached = self._cache.get(key, count=False)
+        if cached is None:
+            return None
+        if self._cache.is_stale(key):
+            self._cache.delete(key)
+            return None
+        
+        self._stats['negative_cache_hits'] += 1
+        return self._as_record(cached)
+
+    def get_record_fetched_at(self, asset_id: str, profile: str = FETCH_PROFILE_FULL) -> Optional[float]:
+        """
+        Momento del fetch EDC del record che la cache serve per asset_id
+        (stesse chiavi e ordine di _get_cached), None se non e in cache.
+        """
+        keys = [self._cache_key(asset_id, profile)]
+        if profile == FETCH_PROFILE_TRAVERSAL:
+            keys.append(self._cache_key(asset_id, FETCH_PROFILE_FULL))
+        keys.append(self._negative_cache_key(asset_id))
+        
+        for key in keys:
+            fetched_at = self._cache.fetched_at(key)
+            if fetched_at is not None:
+                return fetched_at
+        return None
+
+    def _cache_result(self, asset_id: str, profile: str, result: AssetRecord, negative: bool = False) -> None:
+        """
+        Mette in cache il risultato di un fetch.
+        I placeholder (negative=True) usano la chiave negativa con TTL breve,
+        cosi i link verso asset cancellati non costano una chiamata a ogni traversal.
+        """
+        ttl = settings.edc_negative_cache_ttl_seconds
+        if not negative or ttl <= 0:
+            self._cache.set(self._cache_key(asset_id, profile), result)
+            return
+        
+        # Un record positivo ormai stale non deve prevalere sul placeholder
+        self._cache.delete(self._cache_key(asset_id, profile))
+        self._cache.set(self._negative_cache_key(asset_id), result, ttl=ttl)
+        self._stats['negative_cache_stores'] += 1
+
+    def _schedule_revalidation(self, asset_id: str, profile: str = FETCH_PROFILE_FULL) -> None:
+        """
+        Avvia in background il refresh di una entry di cache non piu fresca.
+        Il chiamante riceve subito il valore in cache (stale-while-revalidate).
+        """
+        key = self._cache_key(asset_id, profile)
+        if key in self._revalidating:
+            return
+        
+        self._revalidating.add(key)
+        self._stats['background_revalidations'] += 1
+        task = asyncio.create_task(self._revalidate(asset_id, profile))
+        self._revalidation_tasks.add(task)
+        task.add_done_callback(self._revalidation_tasks.discard)
+
+    async def _revalidate(self, asset_id: str, profile: str) -> None:
+        """Ricarica un asset da EDC aggiornando la cache."""
+        try:
+            await self._fetch_coalesced(asset_id, profile)
+        except Exception as e:
+            self.logger.warning(f"Revalidation failed for asset {asset_id}: {e}")
+        finally:
+            self._revalidating.discard(self._cache_key(asset_id, profile))
+
+    @asynccontextmanager
+    async def _get(
+        self,
+        url: str,
+        params: Any,
+        headers: Optional[Dict[str, str]] = None
+    ) -> AsyncIterator[aiohttp.ClientResponse]:
+        """
+        GET idempotente verso EDC con retry, circuit breaker e limite di
+        concorrenza adattivo (lo slot resta occupato fino al rilascio della risposta).
+        Restituisce solo risposte 200; gli errori HTTP vengono sollevati
+        come aiohttp.ClientResponseError dopo aver esaurito i retry.
+        """
+        response, latency = await self._get_with_retry(url, params, headers)
+        metrics.observe(EDC_REQUEST_SECONDS, latency, endpoint=self._endpoint_label(url))
+        try:
+            yield response
+        finally:
+            response.release()
+            self._limiter.release(latency=latency)
+
+    @staticmethod
+    def _endpoint_label(url: str) -> str:
+        """Label metriche dell'endpoint EDC (es. 'objects', 'bulk')."""
+        return url.rstrip('/').rsplit('/', 1)[-1]
+
+    async def _read_json(self, response: aiohttp.ClientResponse) -> Any:
+        """
+        Legge e decodifica una risposta JSON dell'API objects registrando
+        dimensione del payload e tempo di parsing.
+        """
+        body = await response.read()
+        metrics.observe(EDC_RESPONSE_BYTES, len(body), endpoint='objects')
+        with metrics.timer(EDC_PARSE_SECONDS, format='json'):
+            return json.loads(body)
+
+    async def _get_with_retry(
+        self,
+        url: str,
+        params: Any,
+        headers: Optional[Dict[str, str]] = None
+    ) -> Tuple[aiohttp.ClientResponse, float]:
+        """
+        Esegue la GET ritentando gli errori transitori (5xx, 429, timeout, rete)
+        con backoff esponenziale e jitter, nei limiti del budget di retry.
+        In caso di successo lo slot del limiter resta acquisito.
+        
+        Returns:
+            (risposta, latenza fino agli header in secondi)
+        
+        Raises:
+            CircuitOpenError: se EDC e considerato down
+            aiohttp.ClientResponseError: per errori HTTP non recuperati
+        """
+        attempt = 0
+        while True:
+            trial_id = self._circuit_breaker.before_request()
+            try:
+                await self._limiter.acquire()
+            except BaseException:
+                if trial_id is not None:
+                    self._circuit_breaker.release_trial(trial_id)
+                raise
+            started = time.monotonic()
+            
+            try:
+                response = await self.session.get(url, params=params, headers=headers)
+                latency = time.monotonic() - started
+                if response.status != 200:
+                    error_text = await response.text()
+                    self.logger.error(f"API error {response.status}: {error_text[:200]}")
+                    response.raise_for_status()
+                
+                self._circuit_breaker.record_success()
+                self._retry_policy.record_success()
+                return response, latency
+                
+            except BaseException as e:
+                if not is_retryable(e):
+                    # EDC risponde (es. 404) o chiamata annullata: il circuito resta chiuso
+                    self._limiter.release(latency=time.monotonic() - started)
+                    if isinstance(e, Exception):
+                        self._circuit_breaker.record_success()
+                    elif trial_id is not None:
+                        # Prova annullata senza esito: non deve bloccare il circuito in half_open
+                        self._circuit_breaker.release_trial(trial_id)
+                    raise
+                
+                # 429/5xx/timeout: segnale di sovraccarico per il limiter
+                self._limiter.release(overloaded=True)
+                self._circuit_breaker.record_failure()
+                
+                if attempt >= self._retry_policy.max_retries or not self._retry_policy.acquire_retry():
+                    raise
+                
+                delay = self._retry_policy.get_delay(attempt, e)
+                attempt += 1
+                self.logger.warning(
+                    f"Errore transitorio EDC ({e}), retry {attempt}/"
+                    f"{self._retry_policy.max_retries} tra {delay:.2f}s"
+                )
+                await asyncio.sleep(delay)
+
     def _setup_logging(self) -> None:
         """Setup logging per il client EDC."""
         self.logger = logging.getLogger('edc_client')
         self.logger.setLevel(getattr(logging, settings.log_level))
 
     async def _ensure_session(self) -> None:
-        """Assicura che la sessione HTTP sia inizializzata."""
+        """
+        Assicura che la sessione HTTP sia inizializzata.
+        Con edc_http_mode=record la sessione registra le risposte sulla
+        cassetta; con replay le risposte arrivano solo dalla cassetta.
+        """
         if self.session is None or self.session.closed:
+            if settings.edc_http_mode == HTTP_MODE_REPLAY:
+                cassette = self._create_cassette()
+                self.logger.info(f"EDC HTTP replay da cassetta: {cassette.path}")
+                self.session = ReplaySession(cassette, settings.edc_replay_delay_factor)
+                return
+            
             timeout = aiohttp.ClientTimeout(total=self.request_timeout)
+            # Il limite per host segue il massimo del limiter adattivo
             connector = aiohttp.TCPConnector(
                 ssl=False,  # Per self-signed certificates
-                limit=20,
-                limit_per_host=10
+                limit=max(20, settings.edc_concurrency_max),
+                limit_per_host=settings.edc_concurrency_max
             )
             self.session = aiohttp.ClientSession(
                 headers=self.headers,
                 timeout=timeout,
                 connector=connector
             )
+            
+            if settings.edc_http_mode == HTTP_MODE_RECORD:
+                cassette = self._create_cassette()
+                self.logger.info(f"EDC HTTP record su cassetta: {cassette.path}")
+                self.session = RecordingSession(self.session, cassette)
+
+    @staticmethod
+    def _create_cassette() -> Cassette:
+        """Cassetta record/replay (percorso relativo al progetto)."""
+        cassette_path = Path(settings.edc_http_cassette)
+        if not cassette_path.is_absolute():
+            cassette_path = Path(__file__).parent.parent.parent / cassette_path
+        return Cassette(str(cassette_path))
 
     def _extract_name_from_item(self, item: dict, asset_id: str) -> str:
         """
@@ -139,7 +611,7 @@ class EDCClient:
             technical_description
         )
 
-    def _process_src_links(self, src_links: List[Dict]) -> List[Dict]:
+    def _process_src_links(self, src_links: List[Dict]) -> List[AssetLink]:
         """
         Processa i src_links filtrando sinonimi e link invalidi.
         Mantiene la logica del TreeBuilder.
@@ -162,29 +634,137 @@ class EDCClient:
             # Estrai nome dal link
             link_name = self._extract_name_from_item(link, link_id)
             
-            # Aggiungi link valido
-            valid_links.append({
-                'id': link_id,
-                'association': association,
-                'name': link_name,
-                'classType': link.get('classType', 'Unknown'),
-                'href': link.get('href', '')
-            })
+            # Aggiungi link valido (record compatto, non copia del dict raw)
+            valid_links.append(AssetLink(
+                id=link_id,
+                association=association,
+                name=link_name,
+                class_type=link.get('classType', 'Unknown'),
+                href=link.get('href', '')
+            ))
         
         return valid_links
 
+    def _build_empty_result(self, asset_id: str) -> AssetRecord:
+        """
+        Crea il risultato di fallback per un asset non restituito da EDC.
+        """
+        self._stats['empty_responses'] += 1
+        self.logger.warning(f"Empty response for asset: {asset_id}")
+        
+        name_from_id = asset_id.split('/')[-1] if '/' in asset_id else asset_id
+        
+        return AssetRecord(asset_id=asset_id, name=name_from_id)
+
+    def _build_asset_result(
+        self,
+        asset_id: str,
+        item: dict,
+        profile: str = FETCH_PROFILE_FULL
+    ) -> AssetRecord:
+        """
+        Costruisce il risultato di get_asset_details da un item dell'API objects.
+        Il payload raw resta in 'metadata' solo con edc_keep_raw_metadata attivo.
+        Nel profilo traversal facts e payload raw non vengono conservati.
+        """
+        # Estrai campi con metodi robusti
+        name = self._extract_name_from_item(item, asset_id)
+        class_type = self._extract_classtype_from_item(item)
+        description = self._extract_description_from_facts(item)
+        
+        # Processa links (sia src che dst se disponibili)
+        src_links = self._process_src_links(item.get('srcLinks', []))
+        dst_links = self._process_src_links(item.get('dstLinks', []))
+        
+        # Log info estratte
+        self.logger.info(
+            f"Asset found: {name} ({class_type}) - "
+            f"{len(src_links)} src, {len(dst_links)} dst"
+        )
+        
+        if profile == FETCH_PROFILE_TRAVERSAL:
+            return AssetRecord(
+                asset_id=asset_id,
+                name=name,
+                class_type=class_type,
+                description=description,
+                src_links=src_links,
+                dst_links=dst_links
+            )
+        
+        return AssetRecord(
+            asset_id=asset_id,
+            name=name,
+            class_type=class_type,
+            description=description,
+            facts=list(item.get('facts', [])),
+            src_links=src_links,
+            dst_links=dst_links,
+            metadata=item if settings.edc_keep_raw_metadata else None
+        )
+
     async def bulk_search_assets(
         self, 
         resource_name: str,
         name_filter: Optional[str] = None,
-        asset_type_filter: Optional[str] = None
+        asset_type_filter: Union[None, str, Sequence[str]] = None
     ) -> List[Dict]:
         """
         Cerca assets usando l'API bulk di Allitude EDC.
         FIXED: 
         1. Usa GET invece di POST
         2. Parse CSV invece di JSON
+        
+        Restituisce tutti i risultati filtrati; per leggerli man mano
+        (e fermarsi ai primi N) usa iter_bulk_assets().
+        """
+        filtered_items = [
+            item async for item in self.iter_bulk_assets(
+                resource_name,
+                name_filter=name_filter,
+                asset_type_filter=asset_type_filter
+            )
+        ]
+        
+        self.logger.info(f"Filtered to {len(filtered_items)} items")
+        
+        return filtered_items
+
+    async def iter_bulk_assets(
+        self,
+        resource_name: str,
+        name_filter: Optional[str] = None,
+        asset_type_filter: Union[None, str, Sequence[str]] = None,
+        max_results: Optional[int] = None
+    ) -> AsyncIterator[Dict]:
         """
+        Variante in streaming di bulk_search_assets().
+        Il CSV viene letto e parsato a blocchi da response.content, il filtro
+        sul nome e applicato riga per riga e la lettura si interrompe appena
+        trovati max_results risultati.
+        Con piu classTypes le richieste bulk partono in parallelo e i
+        risultati vengono uniti senza duplicati.
+        
+        Args:
+            resource_name: Nome della risorsa EDC
+            name_filter: Filtro sul nome (case-insensitive, ricerca parziale
+                o con wildcard '*', es. IFR_*)
+            asset_type_filter: Tipo/i asset (vedi resolve_bulk_class_types)
+            max_results: Numero massimo di risultati (None = tutti)
+            
+        Yields:
+            Asset arricchiti con id, name, classType e campi CSV originali
+        """
+        class_types = resolve_bulk_class_types(asset_type_filter)
+        if len(class_types) > 1:
+            async for _, item in self._iter_bulk_merged(
+                [(resource_name, class_type) for class_type in class_types],
+                name_filter,
+                max_results
+            ):
+                yield item
+            return
+        
         await self._ensure_session()
         
         # URL API Bulk
@@ -193,27 +773,11 @@ class EDCClient:
         # Parametri
         params = {
             'resourceName': resource_name,
-            'classTypes': 'com.infa.ldm.relational.Table',
+            'classTypes': class_types[0],
             'facts': 'id,core.name,core.classType',
             'includeRefObjects': 'true'
         }
         
-        # Sovrascrivi classTypes se specificato
-        if asset_type_filter:
-            if '.' not in asset_type_filter:
-                class_mapping = {
-                    'table': 'com.infa.ldm.relational.Table',
-                    'view': 'com.infa.ldm.relational.View',
-                    'column': 'com.infa.ldm.relational.Column',
-                    'viewcolumn': 'com.infa.ldm.relational.ViewColumn'
-                }
-                params['classTypes'] = class_mapping.get(
-                    asset_type_filter.lower(), 
-                    'com.infa.ldm.relational.Table'
-                )
-            else:
-                params['classTypes'] = asset_type_filter
-        
         # Headers
         bulk_headers = {
             **self.headers,
@@ -224,9 +788,13 @@ class EDCClient:
         self.logger.info(f"Bulk search: {params}")
         self._stats['total_requests'] += 1
         
+        name_pattern = NamePattern(name_filter) if name_filter else None
+        rows_scanned = 0
+        yielded = 0
+        
         try:
             # FIX 1: Usa GET invece di POST
-            async with self.session.get(
+            async with self._get(
                 bulk_url, 
                 params=params,
                 headers=bulk_headers
@@ -236,40 +804,22 @@ class EDCClient:
                 content_type = response.headers.get('Content-Type', '')
                 self.logger.info(f"Response Content-Type: {content_type}")
                 
-                if response.status != 200:
-                    error_text = await response.text()
-                    self.logger.error(f"API error {response.status}: {error_text[:500]}")
-                    response.raise_for_status()
-                
-                # FIX 2: Leggi come testo (CSV)
-                csv_text = await response.text()
-                self.logger.info(f"Received {len(csv_text)} characters")
-                
-                # FIX 3: Parse CSV invece di JSON
-                import csv
-                from io import StringIO
-                
-                csv_reader = csv.DictReader(StringIO(csv_text))
-                items = list(csv_reader)
-                
-                self.logger.info(f"Parsed {len(items)} items from CSV")
-                
-                if items:
-                    self.logger.debug(f"CSV columns: {list(items[0].keys())}")
-                
-                # Filtraggio e arricchimento
-                filtered_items = []
-                
-                for item in items:
-                    asset_id = item.get('id', '')
+                # FIX 2/3: Parse CSV incrementale invece di JSON
+                async for item in self._iter_csv_rows(response):
+                    rows_scanned += 1
+                    asset_id = item.get('id') or ''
                     
                     # Estrai nome dai campi CSV
                     name = (
                         item.get('core.name') or 
                         item.get('name') or 
-                        asset_id.split('/')[-1] if '/' in asset_id else asset_id
+                        (asset_id.split('/')[-1] if '/' in asset_id else asset_id)
                     )
                     
+                    # Filtro nome (case-insensitive)
+                    if name_pattern and not name_pattern.matches(name):
+                        continue
+                    
                     # Estrai classType
                     class_type = (
                         item.get('core.classType') or 
@@ -277,23 +827,19 @@ class EDCClient:
                         'Unknown'
                     )
                     
-                    # Filtro nome (case-insensitive)
-                    if name_filter and name_filter.upper() not in name.upper():
-                        continue
-                    
                     # Arricchisci item
-                    enriched_item = {
+                    yield {
                         'id': asset_id,
                         'name': name,
                         'classType': class_type,
                         **item  # Include tutti i campi CSV originali
                     }
                     
-                    filtered_items.append(enriched_item)
-                
-                self.logger.info(f"Filtered to {len(filtered_items)} items")
-                
-                return filtered_items
+                    yielded += 1
+                    if max_results is not None and yielded >= max_results:
+                        self._stats['bulk_early_stops'] += 1
+                        self.logger.info(f"Bulk search: max_results={max_results} raggiunto")
+                        break
                 
         except Exception as e:
             self._stats['api_errors'] += 1
@@ -301,8 +847,363 @@ class EDCClient:
             import traceback
             self.logger.error(f"Traceback: {traceback.format_exc()}")
             raise
+        finally:
+            self.logger.info(f"Bulk search: {rows_scanned} righe lette, {yielded} risultati")
 
-    async def get_asset_details(self, asset_id: str) -> Dict[str, Any]:
+    async def _iter_bulk_merged(
+        self,
+        sources: List[Tuple[str, str]],
+        name_filter: Optional[str] = None,
+        max_results: Optional[int] = None,
+        on_error: Optional[Callable[[int, Exception], None]] = None
+    ) -> AsyncIterator[Tuple[int, Dict]]:
+        """
+        Esegue in parallelo le ricerche bulk (risorsa, classType) e unisce i
+        risultati nell'ordine di arrivo, senza duplicati. Raggiunto max_results
+        le richieste ancora in corso vengono cancellate.
+        
+        Yields:
+            (indice della sorgente, asset)
+        """
+        merged = merge_async_iterators(
+            [
+                self.iter_bulk_assets(resource_name, name_filter, class_type)
+                for resource_name, class_type in sources
+            ],
+            on_error
+        )
+        seen: Set[str] = set()
+        yielded = 0
+        
+        try:
+            async for index, item in merged:
+                if item['id'] in seen:
+                    continue
+                seen.add(item['id'])
+                
+                yield index, item
+                
+                yielded += 1
+                if max_results is not None and yielded >= max_results:
+                    self._stats['bulk_early_stops'] += 1
+                    self.logger.info(f"Bulk search parallela: max_results={max_results} raggiunto")
+                    break
+        finally:
+            await merged.aclose()
+
+    async def iter_federated_assets(
+        self,
+        name_filter: Optional[str] = None,
+        asset_type_filter: Union[None, str, Sequence[str]] = None,
+        max_results: Optional[int] = None,
+        resources: Optional[Sequence[str]] = None
+    ) -> AsyncIterator[Dict]:
+        """
+        Ricerca federata: interroga in parallelo piu risorse EDC e restituisce
+        i risultati man mano che arrivano, con la risorsa di provenienza in
+        'resource'. max_results e un limite globale: raggiunto il limite le
+        richieste ancora in corso vengono cancellate. L'errore di una risorsa
+        non interrompe le altre.
+        
+        Args:
+            name_filter: Filtro sul nome (case-insensitive, ricerca parziale)
+            asset_type_filter: Tipo/i asset (vedi resolve_bulk_class_types)
+            max_results: Numero massimo di risultati complessivi (None = tutti)
+            resources: Risorse da interrogare (default: settings.edc_federated_resources_list)
+            
+        Yields:
+            Asset come iter_bulk_assets() con in piu il campo 'resource'
+        """
+        resources = list(resources or settings.edc_federated_resources_list)
+        class_types = resolve_bulk_class_types(asset_type_filter)
+        sources = [
+            (resource_name, class_type)
+            for resource_name in resources
+            for class_type in class_types
+        ]
+        
+        self._stats['federated_searches'] += 1
+        self.logger.info(f"Ricerca federata su {len(resources)} risorse: {resources}")
+        
+        def on_error(index: int, error: Exception) -> None:
+            self._stats['federated_errors'] += 1
+            self.logger.warning(f"Ricerca federata: risorsa {sources[index][0]} in errore: {error}")
+        
+        merged = self._iter_bulk_merged(sources, name_filter, max_results, on_error)
+        try:
+            async for index, item in merged:
+                item['resource'] = sources[index][0]
+                yield item
+        finally:
+            await merged.aclose()
+
+    async def search_resource_assets(
+        self,
+        resource_name: str,
+        name_filter: Optional[str] = None,
+        asset_type_filter: Union[None, str, Sequence[str]] = None,
+        max_results: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Cerca asset di una risorsa usando lo snapshot locale.
+        Al primo uso lo snapshot viene caricato in background via API bulk (uno
+        per classType) e la ricerca usa intanto iter_bulk_assets(), con stop
+        anticipato a max_results; gli snapshot piu vecchi di
+        edc_snapshot_refresh_seconds vengono serviti subito e aggiornati in
+        background. Senza snapshot usa sempre iter_bulk_assets().
+        
+        Args:
+            resource_name: Nome della risorsa EDC
+            name_filter: Filtro sul nome (case-insensitive, ricerca parziale)
+            asset_type_filter: Tipo/i asset (vedi resolve_bulk_class_types)
+            max_results: Numero massimo di risultati (None = tutti)
+            
+        Returns:
+            Lista di asset con id, name, classType
+        """
+        class_types = resolve_bulk_class_types(asset_type_filter)
+        infos = [
+            self._get_snapshot_info(resource_name, class_type) for class_type in class_types
+        ] if self._snapshots is not None else []
+        
+        if self._snapshots is None or None in infos:
+            return [
+                item async for item in self.iter_bulk_assets(
+                    resource_name,
+                    name_filter=name_filter,
+                    asset_type_filter=asset_type_filter,
+                    max_results=max_results
+                )
+            ]
+        
+        self._stats['snapshot_searches'] += 1
+        results: List[Dict] = []
+        seen: Set[str] = set()
+        for class_type, info in zip(class_types, infos):
+            remaining = None if max_results is None else max_results - len(results)
+            if remaining is not None and remaining <= 0:
+                break
+            
+            # Indice dei nomi e letture SQLite fuori dall'event loop
+            items = await asyncio.to_thread(self._snapshots.search, info['snapshot_id'], name_filter, remaining)
+            for item in items:
+                if item['id'] not in seen:
+                    seen.add(item['id'])
+                    results.append(item)
+            
+            self.logger.info(
+                f"Snapshot search {resource_name}/{class_type}: "
+                f"{len(results)} risultati su {info['row_count']} asset"
+            )
+        
+        return results
+
+    def _get_snapshot_info(self, resource_name: str, class_type: str) -> Optional[Dict[str, Any]]:
+        """
+        Restituisce lo snapshot di risorsa/classType (None se non ancora
+        caricato), pianificandone il caricamento o il refresh in background.
+        """
+        info = self._snapshots.get_snapshot_info(resource_name, class_type)
+        
+        if info is None:
+            self._schedule_snapshot_refresh(resource_name, class_type)
+        elif (
+            settings.edc_snapshot_refresh_seconds
+            and time.time() - info['refreshed_at'] >= settings.edc_snapshot_refresh_seconds
+        ):
+            self._schedule_snapshot_refresh(resource_name, class_type)
+        
+        return info
+
+    def suggest_name_filter(
+        self,
+        message: str,
+        resource_name: str,
+        asset_type_filter: Union[None, str, Sequence[str]] = None
+    ) -> Optional[str]:
+        """
+        Sceglie dal testo libero la parola piu selettiva presente nei nomi
+        degli asset della risorsa, usando l'indice a n-grammi dello snapshot.
+        Sono candidate solo le parole con l'aspetto di un nome di asset
+        (maiuscole o con underscore, es. GARANZIE o DT_AP), di almeno
+        NAME_FILTER_MIN_LENGTH caratteri e fuori da NAME_FILTER_STOP_WORDS:
+        parole comuni e refusi non devono restringere la ricerca.
+        Non scarica ne indicizza nulla: senza snapshot con indice gia in memoria
+        (costruito al caricamento o dalla prima ricerca) restituisce None.
+        
+        Args:
+            message: Testo dell'utente
+            resource_name: Risorsa EDC in cui cercare
+            asset_type_filter: Tipo/i asset (vedi resolve_bulk_class_types)
+            
+        Returns:
+            Keyword da usare come name_filter o None
+        """
+        if self._snapshots is None:
+            return None
+        
+        infos = [
+            self._snapshots.get_snapshot_info(resource_name, class_type)
+            for class_type in resolve_bulk_class_types(asset_type_filter)
+        ]
+        infos = [info for info in infos if info is not None]
+        if not infos:
+            return None
+        
+        keywords = sorted({
+            word.upper() for word in re.findall(r"[A-Za-z0-9_]+", message)
+            if len(word.strip('_')) >= NAME_FILTER_MIN_LENGTH
+            and (word.isupper() or '_' in word)
+            and word.upper() not in NAME_FILTER_STOP_WORDS
+            and word.upper() != resource_name.upper()
+        })
+        if not keywords:
+            return None
+        
+        counts: Dict[str, int] = {}
+        for info in infos:
+            for keyword, count in self._snapshots.match_keywords(info['snapshot_id'], keywords):
+                counts[keyword] = counts.get(keyword, 0) + count
+        matches = list(counts.items())
+        if not matches:
+            return None
+        
+        # Meno asset trovati = keyword piu specifica; a parita la piu lunga
+        keyword, _ = min(matches, key=lambda match: (match[1], -len(match[0])))
+        return keyword
+
+    async def refresh_snapshot(
+        self,
+        resource_name: str,
+        asset_type_filter: Union[None, str, Sequence[str]] = None
+    ) -> int:
+        """
+        Ricarica lo snapshot locale di una risorsa tramite API bulk
+        (in parallelo se sono richiesti piu classTypes).
+        Refresh concorrenti della stessa risorsa/classType vengono accorpati.
+        
+        Returns:
+            Numero di asset negli snapshot
+        """
+        if self._snapshots is None:
+            raise RuntimeError("Snapshot risorse disabilitati (EDC_SNAPSHOT_ENABLED=false)")
+        
+        tasks = []
+        for class_type in resolve_bulk_class_types(asset_type_filter):
+            key = (resource_name, class_type)
+            task = self._snapshot_tasks.get(key)
+            if task is None:
+                task = asyncio.ensure_future(self._load_snapshot(*key))
+                self._snapshot_tasks[key] = task
+                task.add_done_callback(lambda _, key=key: self._snapshot_tasks.pop(key, None))
+            tasks.append(task)
+        
+        counts = await asyncio.shield(asyncio.gather(*tasks))
+        return sum(counts)
+
+    def _schedule_snapshot_refresh(self, resource_name: str, class_type: str) -> None:
+        """Avvia in background il refresh di uno snapshot scaduto."""
+        if (resource_name, class_type) in self._snapshot_tasks:
+            return
+        
+        task = asyncio.create_task(self._refresh_snapshot_quietly(resource_name, class_type))
+        self._revalidation_tasks.add(task)
+        task.add_done_callback(self._revalidation_tasks.discard)
+
+    async def _refresh_snapshot_quietly(self, resource_name: str, class_type: str) -> None:
+        try:
+            await self.refresh_snapshot(resource_name, class_type)
+        except Exception as e:
+            self.logger.warning(f"Snapshot refresh failed for {resource_name}/{class_type}: {e}")
+
+    async def _load_snapshot(self, resource_name: str, class_type: str) -> int:
+        """Scarica la risorsa in streaming e la salva come nuovo snapshot."""
+        self._stats['snapshot_refreshes'] += 1
+        self.logger.info(f"Snapshot refresh: {resource_name}/{class_type}")
+        
+        count = await self._snapshots.load(
+            resource_name,
+            class_type,
+            self.iter_bulk_assets(resource_name, asset_type_filter=class_type)
+        )
+        
+        self.logger.info(f"Snapshot {resource_name}/{class_type}: {count} asset salvati")
+        return count
+
+    async def _iter_csv_rows(self, response: aiohttp.ClientResponse) -> AsyncIterator[Dict[str, Optional[str]]]:
+        """
+        Parsa il CSV della risposta bulk in streaming, riga per riga.
+        Un record e completo quando le virgolette sono bilanciate, cosi i
+        campi quotati su piu linee vengono gestiti correttamente.
+        """
+        decoder = codecs.getincrementaldecoder(response.charset or 'utf-8')(errors='replace')
+        header: Optional[List[str]] = None
+        buffer = ''
+        pending_lines: List[str] = []
+        quote_count = 0
+        
+        def complete_records(lines: List[str]) -> List[str]:
+            nonlocal pending_lines, quote_count
+            records = []
+            for line in lines:
+                pending_lines.append(line)
+                quote_count += line.count('"')
+                if quote_count % 2 == 0:
+                    records.append('\n'.join(pending_lines))
+                    pending_lines = []
+                    quote_count = 0
+            return records
+        
+        def to_dicts(records: List[str]) -> List[Dict[str, Optional[str]]]:
+            nonlocal header
+            rows = []
+            for row in csv.reader(records):
+                if not row:
+                    continue
+                if header is None:
+                    header = row
+                    self.logger.debug(f"CSV columns: {header}")
+                    continue
+                if len(row) < len(header):
+                    row = row + [None] * (len(header) - len(row))
+                rows.append(dict(zip(header, row)))
+            return rows
+        
+        # Metriche: byte ricevuti e tempo di parsing (escluso il consumo delle righe)
+        received_bytes = 0
+        parse_seconds = 0.0
+        
+        try:
+            async for chunk in response.content.iter_chunked(BULK_CSV_CHUNK_SIZE):
+                received_bytes += len(chunk)
+                started = time.perf_counter()
+                buffer += decoder.decode(chunk)
+                lines = buffer.split('\n')
+                buffer = lines.pop()
+                rows = to_dicts(complete_records(lines))
+                parse_seconds += time.perf_counter() - started
+                for row in rows:
+                    yield row
+            
+            # Coda finale senza newline
+            started = time.perf_counter()
+            buffer += decoder.decode(b'', final=True)
+            tail = complete_records([buffer]) if buffer else []
+            if pending_lines:
+                tail.append('\n'.join(pending_lines))
+            rows = to_dicts(tail)
+            parse_seconds += time.perf_counter() - started
+            for row in rows:
+                yield row
+        finally:
+            metrics.observe(EDC_RESPONSE_BYTES, received_bytes, endpoint='bulk')
+            metrics.observe(EDC_PARSE_SECONDS, parse_seconds, format='csv')
+
+    async def get_asset_details(
+        self,
+        asset_id: str,
+        profile: str = FETCH_PROFILE_FULL
+    ) -> Dict[str, Any]:
         """
         Recupera i dettagli completi di un asset specifico.
         Usa l'API objects per un singolo asset conosciuto.
@@ -310,22 +1211,90 @@ class EDCClient:
         
         Args:
             asset_id: ID dell'asset da recuperare
+            profile: FETCH_PROFILE_FULL (default) o FETCH_PROFILE_TRAVERSAL
+                per il solo crawl del lineage (senza facts e ref objects)
             
         Returns:
-            Dict con metadati asset, src_links, descrizione, etc.
+            Dict (copia modificabile e serializzabile JSON) con metadati asset,
+            src_links, descrizione, etc.
+        """
+        record = await self.get_asset_record(asset_id, profile)
+        return record.to_dict()
+
+    async def get_asset_record(
+        self,
+        asset_id: str,
+        profile: str = FETCH_PROFILE_FULL
+    ) -> AssetRecord:
+        """
+        Come get_asset_details ma restituisce il record compatto in sola lettura
+        condiviso con la cache (nessuna copia), per il crawl del lineage.
         """
         await self._ensure_session()
         
         # Controllo cache
-        if asset_id in self._cache:
-            self._stats['cache_hits'] += 1
+        cached = self._get_cached(asset_id, profile)
+        if cached is not None:
             self.logger.info(f"Cache hit for asset: {asset_id}")
-            return self._cache[asset_id]
+            return cached
+
+        return await self._fetch_coalesced(asset_id, profile)
+
+    def _register_inflight(self, asset_id: str, future: asyncio.Future) -> None:
+        """Registra una richiesta in corso, rimossa automaticamente al termine."""
+        def _done(fut: asyncio.Future) -> None:
+            if self._inflight.get(asset_id) is fut:
+                del self._inflight[asset_id]
+            # Evita warning "exception was never retrieved" se nessuno attende
+            if not fut.cancelled():
+                fut.exception()
+        
+        self._inflight[asset_id] = future
+        future.add_done_callback(_done)
+
+    async def _fetch_coalesced(
+        self,
+        asset_id: str,
+        profile: str = FETCH_PROFILE_FULL
+    ) -> AssetRecord:
+        """
+        Recupera un asset deduplicando le richieste concorrenti.
+        I chiamanti che arrivano mentre il fetch e in corso attendono lo stesso future;
+        un fetch traversal puo riusare un fetch full gia in corso.
+        """
+        key = self._cache_key(asset_id, profile)
+        inflight = self._inflight.get(key)
+        if inflight is None and profile == FETCH_PROFILE_TRAVERSAL:
+            inflight = self._inflight.get(asset_id)
+        if inflight is not None:
+            self._stats['coalesced_requests'] += 1
+            self.logger.info(f"Coalesced request for asset: {asset_id}")
+            return await asyncio.shield(inflight)
+        
+        task = asyncio.ensure_future(self._fetch_asset_details(asset_id, profile))
+        self._register_inflight(key, task)
+        return await asyncio.shield(task)
 
+    def _get_profile_params(self, profile: str) -> List[tuple]:
+        """Parametri statici dell'API objects per il profilo di fetch."""
+        if profile == FETCH_PROFILE_TRAVERSAL:
+            return self.traversal_params
+        return self.static_params
+
+    async def _fetch_asset_details(
+        self,
+        asset_id: str,
+        profile: str = FETCH_PROFILE_FULL
+    ) -> AssetRecord:
+        """
+        Esegue la chiamata objects per un singolo asset e aggiorna la cache.
+        """
         self._stats['total_requests'] += 1
+        if profile == FETCH_PROFILE_TRAVERSAL:
+            self._stats['traversal_fetches'] += 1
         
         # Costruisci parametri query
-        params = list(self.static_params)
+        params = list(self._get_profile_params(profile))
         params.append(('q', f'id:{asset_id}'))
         
         # Log per debug
@@ -333,7 +1302,7 @@ class EDCClient:
         self.logger.debug(f"Query params: {params}")
         
         try:
-            async with self.session.get(
+            async with self._get(
                 self.base_url,
                 params=params
             ) as response:
@@ -341,13 +1310,7 @@ class EDCClient:
                 # Log status
                 self.logger.info(f"Response status: {response.status}")
                 
-                # Gestisci errori HTTP
-                if response.status != 200:
-                    error_text = await response.text()
-                    self.logger.error(f"API error {response.status}: {error_text[:200]}")
-                
-                response.raise_for_status()
-                data = await response.json()
+                data = await self._read_json(response)
                 
                 # Log risposta per debug
                 self.logger.debug(f"API Response keys: {list(data.keys())}")
@@ -356,56 +1319,22 @@ class EDCClient:
                 
                 if not items:
                     # Nessun risultato - crea oggetto vuoto con fallback
-                    self._stats['empty_responses'] += 1
-                    self.logger.warning(f"Empty response for asset: {asset_id}")
-                    
-                    name_from_id = asset_id.split('/')[-1] if '/' in asset_id else asset_id
-                    
-                    result = {
-                        'asset_id': asset_id,
-                        'metadata': {},
-                        'src_links': [],
-                        'dst_links': [],
-                        'description': '',
-                        'name': name_from_id,
-                        'classType': 'Unknown',
-                        'facts': []
-                    }
+                    result = self._build_empty_result(asset_id)
                 else:
                     # Processa primo item
-                    item = items[0]
-                    
-                    # Estrai campi con metodi robusti
-                    name = self._extract_name_from_item(item, asset_id)
-                    class_type = self._extract_classtype_from_item(item)
-                    description = self._extract_description_from_facts(item)
-                    
-                    # Processa links (sia src che dst se disponibili)
-                    src_links = self._process_src_links(item.get('srcLinks', []))
-                    dst_links = self._process_src_links(item.get('dstLinks', []))
-                    
-                    result = {
-                        'asset_id': asset_id,
-                        'metadata': item,
-                        'src_links': src_links,
-                        'dst_links': dst_links,
-                        'description': description,
-                        'facts': item.get('facts', []),
-                        'name': name,
-                        'classType': class_type
-                    }
-                    
-                    # Log info estratte
-                    self.logger.info(
-                        f"Asset found: {name} ({class_type}) - "
-                        f"{len(src_links)} src, {len(dst_links)} dst"
-                    )
+                    result = self._build_asset_result(asset_id, items[0], profile)
                 
                 # Cache del risultato
-                self._cache[asset_id] = result
+                self._cache_result(asset_id, profile, result, negative=not items)
                 return result
                 
         except aiohttp.ClientResponseError as e:
+            if e.status == 404 and settings.edc_negative_cache_ttl_seconds > 0:
+                # Asset inesistente: placeholder in cache negativa invece dell'errore
+                self.logger.warning(f"Asset not found (404): {asset_id}")
+                result = self._build_empty_result(asset_id)
+                self._cache_result(asset_id, profile, result, negative=True)
+                return result
             self._stats['api_errors'] += 1
             self.logger.error(f"HTTP error fetching asset {asset_id}: {e.status} - {e.message}")
             raise
@@ -414,67 +1343,362 @@ class EDCClient:
             self.logger.error(f"Error fetching asset {asset_id}: {e}")
             raise
 
+    async def get_assets_details_batch(
+        self,
+        asset_ids: List[str],
+        batch_size: Optional[int] = None,
+        profile: str = FETCH_PROFILE_FULL
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Versione batch di get_asset_details (vedi get_asset_records_batch).
+        
+        Returns:
+            Dict asset_id -> dict nello stesso formato di get_asset_details
+        """
+        records = await self.get_asset_records_batch(asset_ids, batch_size, profile)
+        return {asset_id: record.to_dict() for asset_id, record in records.items()}
+
+    async def get_asset_records_batch(
+        self,
+        asset_ids: List[str],
+        batch_size: Optional[int] = None,
+        profile: str = FETCH_PROFILE_FULL,
+        refresh: bool = False
+    ) -> Dict[str, AssetRecord]:
+        """
+        Recupera i dettagli di piu asset con poche chiamate all'API objects.
+        Gli ID vengono raggruppati in query OR (q=id:"A" OR id:"B" ...) e le
+        risposte paginate con pageSize/offset; ogni item viene ricondotto al
+        proprio asset e messo in cache come in get_asset_details().
+        
+        Args:
+            asset_ids: ID degli asset da recuperare
+            batch_size: ID per singola query (default: settings.edc_batch_size)
+            profile: Profilo di fetch (vedi get_asset_details)
+            refresh: Ignora la cache (anche stale o negativa) e ricarica da EDC;
+                le richieste gia in corso vengono comunque riusate
+            
+        Returns:
+            Dict asset_id -> record compatto (come get_asset_record)
+        """
+        await self._ensure_session()
+        
+        batch_size = batch_size or settings.edc_batch_size
+        ordered_ids = list(dict.fromkeys(asset_ids))
+        results: Dict[str, AssetRecord] = {}
+        missing: List[str] = []
+        pending: Dict[str, asyncio.Future] = {}
+        
+        # Cache, richieste gia in corso e deduplicazione mantenendo l'ordine
+        for asset_id in ordered_ids:
+            key = self._cache_key(asset_id, profile)
+            cached = None if refresh else self._get_cached(asset_id, profile)
+            if cached is not None:
+                results[asset_id] = cached
+            elif key in self._inflight:
+                self._stats['coalesced_requests'] += 1
+                pending[asset_id] = self._inflight[key]
+            else:
+                missing.append(asset_id)
+        
+        if not missing:
+            for asset_id, future in pending.items():
+                results[asset_id] = await asyncio.shield(future)
+            return {asset_id: results[asset_id] for asset_id in ordered_ids}
+        
+        self.logger.info(
+            f"Batch fetch: {len(missing)} asset da EDC "
+            f"({len(results)} da cache)"
+        )
+        
+        # Parametri statici senza paginazione (gestita per ogni batch)
+        base_params = [
+            (key, value) for key, value in self._get_profile_params(profile)
+            if key not in ('offset', 'pageSize')
+        ]
+        
+        # Registra gli ID come in corso: chiamate concorrenti li attenderanno
+        loop = asyncio.get_running_loop()
+        futures = {asset_id: loop.create_future() for asset_id in missing}
+        for asset_id, future in futures.items():
+            self._register_inflight(self._cache_key(asset_id, profile), future)
+        
+        try:
+            for start in range(0, len(missing), batch_size):
+                chunk = missing[start:start + batch_size]
+                items_by_id = await self._fetch_objects_batch(chunk, base_params)
+                if profile == FETCH_PROFILE_TRAVERSAL:
+                    self._stats['traversal_fetches'] += len(chunk)
+                
+                for asset_id in chunk:
+                    item = items_by_id.get(asset_id)
+                    if item is None:
+                        result = self._build_empty_result(asset_id)
+                    else:
+                        result = self._build_asset_result(asset_id, item, profile)
+                    
+                    self._cache_result(asset_id, profile, result, negative=item is None)
+                    results[asset_id] = result
+                    futures[asset_id].set_result(result)
+        except BaseException as e:
+            for future in futures.values():
+                if future.done():
+                    continue
+                if isinstance(e, asyncio.CancelledError):
+                    future.cancel()
+                else:
+                    future.set_exception(e)
+            raise
+        
+        for asset_id, future in pending.items():
+            results[asset_id] = await asyncio.shield(future)
+        
+        return {asset_id: results[asset_id] for asset_id in ordered_ids}
+
+    async def _fetch_objects_batch(
+        self,
+        asset_ids: List[str],
+        base_params: List[tuple]
+    ) -> Dict[str, dict]:
+        """
+        Esegue una query objects per un gruppo di ID, scorrendo tutte le pagine.
+        
+        Returns:
+            Dict asset_id -> item API
+        """
+        query = ' OR '.join(f'id:"{asset_id}"' for asset_id in asset_ids)
+        wanted = set(asset_ids)
+        items_by_id: Dict[str, dict] = {}
+        page_size = len(asset_ids)
+        offset = 0
+        
+        while True:
+            params = list(base_params)
+            params.extend([
+                ('q', query),
+                ('offset', str(offset)),
+                ('pageSize', str(page_size))
+            ])
+            
+            self._stats['total_requests'] += 1
+            self._stats['batch_requests'] += 1
+            
+            try:
+                async with self._get(
+                    self.base_url,
+                    params=params
+                ) as response:
+                    data = await self._read_json(response)
+                    
+            except aiohttp.ClientResponseError as e:
+                self._stats['api_errors'] += 1
+                self.logger.error(f"HTTP error fetching batch at offset {offset}: {e.status} - {e.message}")
+                raise
+            except Exception as e:
+                self._stats['api_errors'] += 1
+                self.logger.error(f"Error fetching batch at offset {offset}: {e}")
+                raise
+            
+            items = data.get('items', [])
+            for item in items:
+                item_id = item.get('id')
+                if item_id in wanted:
+                    items_by_id.setdefault(item_id, item)
+            
+            offset += len(items)
+            total_count = data.get('metadata', {}).get('totalCount')
+            
+            # Fine paginazione: pagina vuota, totale raggiunto o tutti trovati
+            # (una pagina corta non basta: EDC puo limitare pageSize)
+            if (
+                not items
+                or (total_count is not None and offset >= total_count)
+                or len(items_by_id) == len(wanted)
+            ):
+                break
+        
+        self.logger.info(f"Batch: {len(items_by_id)}/{len(asset_ids)} asset trovati")
+        return items_by_id
+
     async def search_assets(
         self, 
         query: str, 
-        filters: Optional[Dict] = None
+        filters: Optional[Dict] = None,
+        max_results: Optional[int] = None
     ) -> List[Dict]:
         """
         Cerca assets nel catalogo EDC usando query diretta.
         NOTA: Questo metodo usa l'API objects con query, non bulk.
         Per ricerche generiche in una risorsa, usa bulk_search_assets().
+        Scorre tutte le pagine; per leggerle man mano usa iter_search_assets().
         
         Args:
             query: Query di ricerca (es. "*", "*GARANZIE*", "name:CUSTOMER*")
             filters: Filtri aggiuntivi opzionali
+            max_results: Numero massimo di risultati (None = tutti)
             
         Returns:
             Lista di asset trovati
         """
+        self.logger.info(f"Searching assets with query: {query}")
+        
+        try:
+            enriched_items = [
+                item async for item in self.iter_search_assets(
+                    query,
+                    filters=filters,
+                    max_results=max_results
+                )
+            ]
+        except Exception as e:
+            self.logger.error(f"Error searching assets with query '{query}': {e}")
+            raise
+        
+        self.logger.info(f"Found {len(enriched_items)} assets")
+        return enriched_items
+
+    async def iter_search_assets(
+        self,
+        query: str,
+        filters: Optional[Dict] = None,
+        page_size: Optional[int] = None,
+        max_results: Optional[int] = None,
+        parallel_pages: Optional[int] = None
+    ) -> AsyncIterator[Dict]:
+        """
+        Scorre tutte le pagine dei risultati dell'API objects.
+        La pagina successiva viene richiesta mentre il chiamante consuma quella
+        corrente; quando EDC restituisce totalCount fino a parallel_pages pagine
+        vengono scaricate in parallelo (l'ordine dei risultati resta invariato).
+        La ricerca termina con una pagina vuota o a totalCount: se EDC limita
+        pageSize (pagina corta) la dimensione restituita diventa quella delle
+        pagine successive e le pagine gia richieste vengono ripianificate.
+        Interrompendo il ciclo le pagine in anticipo vengono cancellate alla
+        chiusura del generatore.
+        
+        Args:
+            query: Query di ricerca (es. "*GARANZIE*", "name:CUSTOMER*")
+            filters: Filtri aggiuntivi opzionali
+            page_size: Risultati per pagina (default: settings.edc_search_page_size)
+            max_results: Numero massimo di risultati (None = tutti)
+            parallel_pages: Pagine in parallelo con totalCount noto
+                (default: settings.edc_search_parallel_pages)
+            
+        Yields:
+            Asset con name e classType estratti
+        """
         await self._ensure_session()
         
-        params = list(self.static_params)
-        params.append(('q', query))
+        page_size = page_size or settings.edc_search_page_size
+        if parallel_pages is None:
+            parallel_pages = settings.edc_search_parallel_pages
         
+        # Parametri statici senza paginazione (gestita pagina per pagina)
+        base_params = [
+            (key, value) for key, value in self.static_params
+            if key not in ('offset', 'pageSize')
+        ]
+        base_params.append(('q', query))
         if filters:
-            for key, value in filters.items():
-                params.append((key, value))
+            base_params.extend(filters.items())
         
-        self.logger.info(f"Searching assets with query: {query}")
+        # (offset, task) delle pagine richieste in anticipo, in ordine di offset
+        pending: Deque[Tuple[int, asyncio.Task]] = deque()
+        next_offset = 0
+        total_count: Optional[int] = None
+        exhausted = False
+        yielded = 0
+        
+        def schedule_pages() -> None:
+            """Riempie la finestra di pagine richieste in anticipo."""
+            nonlocal next_offset
+            window = max(1, parallel_pages) if total_count is not None else 1
+            while (
+                not exhausted
+                and len(pending) < window
+                and (total_count is None or next_offset < total_count)
+                and (max_results is None or next_offset < max_results)
+            ):
+                pending.append((next_offset, asyncio.ensure_future(
+                    self._fetch_search_page(base_params, next_offset, page_size)
+                )))
+                next_offset += page_size
         
+        async def cancel_pending() -> None:
+            tasks = [task for _, task in pending]
+            pending.clear()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        
+        schedule_pages()
         try:
-            async with self.session.get(
-                self.base_url,
-                params=params
-            ) as response:
-                response.raise_for_status()
-                data = await response.json()
-                
-                items = data.get('items', [])
+            while pending:
+                offset, task = pending.popleft()
+                items, page_total = await task
+                if page_total is not None:
+                    total_count = page_total
                 
-                # Arricchisci risultati con nomi estratti
-                enriched_items = []
-                for item in items:
-                    asset_id = item.get('id', '')
-                    
-                    # Estrai nome
-                    name = self._extract_name_from_item(item, asset_id)
-                    class_type = self._extract_classtype_from_item(item)
-                    
-                    # Crea oggetto arricchito
-                    enriched_item = {
-                        **item,
-                        'name': name,
-                        'classType': class_type
-                    }
-                    enriched_items.append(enriched_item)
+                if not items:
+                    # Pagina vuota: non ci sono altri risultati
+                    exhausted = True
+                    await cancel_pending()
+                elif len(items) < page_size:
+                    # Pagina corta: EDC ha limitato pageSize (o e l'ultima pagina);
+                    # le pagine gia richieste usavano offset sbagliati
+                    page_size = len(items)
+                    next_offset = offset + len(items)
+                    await cancel_pending()
                 
-                self.logger.info(f"Found {len(enriched_items)} assets")
-                return enriched_items
+                schedule_pages()
                 
-        except Exception as e:
-            self.logger.error(f"Error searching assets with query '{query}': {e}")
-            raise
+                for item in items:
+                    yield item
+                    yielded += 1
+                    if max_results is not None and yielded >= max_results:
+                        return
+        finally:
+            await cancel_pending()
+
+    async def _fetch_search_page(
+        self,
+        base_params: List[tuple],
+        offset: int,
+        page_size: int
+    ) -> Tuple[List[Dict], Optional[int]]:
+        """
+        Scarica una pagina dell'API objects.
+        
+        Returns:
+            (asset arricchiti, totalCount se restituito da EDC)
+        """
+        params = list(base_params)
+        params.extend([
+            ('offset', str(offset)),
+            ('pageSize', str(page_size))
+        ])
+        
+        self._stats['total_requests'] += 1
+        self._stats['search_pages'] += 1
+        
+        async with self._get(
+            self.base_url,
+            params=params
+        ) as response:
+            data = await self._read_json(response)
+        
+        items = [self._enrich_search_item(item) for item in data.get('items', [])]
+        return items, data.get('metadata', {}).get('totalCount')
+
+    def _enrich_search_item(self, item: dict) -> Dict:
+        """Arricchisce un item dell'API objects con nome e classType estratti."""
+        asset_id = item.get('id', '')
+        
+        return {
+            **item,
+            'name': self._extract_name_from_item(item, asset_id),
+            'classType': self._extract_classtype_from_item(item)
+        }
 
     async def get_lineage_upstream(
         self, 
@@ -514,14 +1738,21 @@ class EDCClient:
         asset_details = await self.get_asset_details(asset_id)
         return asset_details['dst_links']
 
-    def get_statistics(self) -> Dict[str, int]:
+    def get_statistics(self) -> Dict[str, Any]:
         """
         Restituisce le statistiche delle chiamate API.
         
         Returns:
-            Dict con statistiche di utilizzo
+            Dict con statistiche di utilizzo (incluse cache, retry e circuit breaker)
         """
-        return self._stats.copy()
+        return {
+            **self._stats,
+            **self._cache.get_statistics(),
+            **self._retry_policy.get_statistics(),
+            **self._circuit_breaker.get_statistics(),
+            **self._limiter.get_statistics(),
+            **(self._snapshots.get_statistics() if self._snapshots else {})
+        }
 
     def clear_cache(self) -> None:
         """Svuota la cache degli asset."""
@@ -530,6 +1761,9 @@ class EDCClient:
 
     async def close(self) -> None:
         """Chiude la sessione HTTP e rilascia risorse."""
+        for task in [*self._revalidation_tasks, *self._snapshot_tasks.values()]:
+            task.cancel()
+        
         if self.session and not self.session.closed:
             await self.session.close()
             self.logger.info("EDC session closed")
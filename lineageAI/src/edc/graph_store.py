@@ -0,0 +1,257 @@
+"""
+Store persistente del grafo di lineage.
+Ogni asset recuperato durante le costruzioni viene salvato su SQLite con i
+suoi link (tabella nodi + tabella archi indicizzata su entrambi gli estremi):
+le domande di impatto ("tutto il downstream di X entro 6 hop", "quali report
+dipendono da questa colonna") diventano query ricorsive (WITH RECURSIVE)
+locali, senza rifare il crawl su EDC.
+"""
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+# Hop massimi consentiti in una query ricorsiva
+GRAPH_STORE_MAX_HOPS = 50
+
+
+class LineageGraphStore:
+    """
+    Store SQLite dei nodi e degli archi di lineage.
+    Un nodo con fetched_at NULL e noto solo come estremo di un link (mai
+    recuperato); has_src_links/has_dst_links indicano quali link sono stati
+    letti nell'ultimo fetch, quindi quali direzioni sono complete per il nodo.
+    """
+
+    def __init__(self, path: str, ttl: float = 86400):
+        """
+        Inizializza lo store.
+
+        Args:
+            path: Percorso del file SQLite
+            ttl: Eta in secondi oltre cui un nodo va ricaricato da EDC (0 = mai)
+        """
+        self.path = path
+        self.ttl = ttl
+        self._stats = {
+            'graph_store_writes': 0
+        }
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS lineage_nodes (
+                asset_id TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                class_type TEXT NOT NULL,
+                fetched_at REAL,
+                has_src_links INTEGER NOT NULL DEFAULT 0,
+                has_dst_links INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE INDEX IF NOT EXISTS idx_lineage_nodes_class
+                ON lineage_nodes (class_type);
+
+            CREATE TABLE IF NOT EXISTS lineage_edges (
+                src_id TEXT NOT NULL,
+                dst_id TEXT NOT NULL,
+                association TEXT,
+                PRIMARY KEY (src_id, dst_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_lineage_edges_dst
+                ON lineage_edges (dst_id, src_id);
+            """
+        )
+        self._conn.commit()
+
+    def record_assets(
+        self,
+        records: Iterable[Tuple[str, Mapping]],
+        has_src_links: bool = True,
+        has_dst_links: bool = True,
+        fetched_at: Optional[Mapping[str, float]] = None
+    ) -> int:
+        """
+        Salva gli asset recuperati e i loro link in un'unica transazione.
+        I link di una direzione letta sostituiscono quelli gia salvati
+        (es. link rimossi in EDC); gli estremi sconosciuti diventano nodi
+        non recuperati con nome e classType presi dal link. Un classType
+        'Unknown' non sovrascrive quello gia noto (es. dal link).
+        Un record piu vecchio di quello gia salvato viene ignorato.
+
+        Args:
+            records: Coppie (asset_id, dettagli nel formato di get_asset_details)
+            has_src_links: Il fetch includeva i src_links
+            has_dst_links: Il fetch includeva i dst_links
+            fetched_at: asset_id -> momento del fetch EDC (es. record serviti
+                dalla cache); per gli asset assenti vale l'istante corrente
+
+        Returns:
+            Numero di asset salvati
+        """
+        now = time.time()
+        fetched_at = fetched_at or {}
+        count = 0
+        with self._conn:
+            for asset_id, details in records:
+                record_fetched_at = fetched_at.get(asset_id) or now
+                row = self._conn.execute(
+                    "SELECT fetched_at FROM lineage_nodes WHERE asset_id = ?", (asset_id,)
+                ).fetchone()
+                if row is not None and row[0] is not None and row[0] > record_fetched_at:
+                    continue
+
+                self._conn.execute(
+                    "INSERT INTO lineage_nodes "
+                    "(asset_id, name, class_type, fetched_at, has_src_links, has_dst_links) "
+                    "VALUES (?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT(asset_id) DO UPDATE SET name = excluded.name, "
+                    "class_type = CASE WHEN excluded.class_type = 'Unknown' "
+                    "THEN lineage_nodes.class_type ELSE excluded.class_type END, "
+                    "fetched_at = excluded.fetched_at, "
+                    "has_src_links = excluded.has_src_links, has_dst_links = excluded.has_dst_links",
+                    (
+                        asset_id,
+                        details.get('name', ''),
+                        details.get('classType') or 'Unknown',
+                        record_fetched_at,
+                        int(has_src_links),
+                        int(has_dst_links)
+                    )
+                )
+
+                src_links = details.get('src_links', []) if has_src_links else []
+                dst_links = details.get('dst_links', []) if has_dst_links else []
+                if has_src_links:
+                    self._conn.execute("DELETE FROM lineage_edges WHERE dst_id = ?", (asset_id,))
+                if has_dst_links:
+                    self._conn.execute("DELETE FROM lineage_edges WHERE src_id = ?", (asset_id,))
+
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO lineage_edges (src_id, dst_id, association) VALUES (?, ?, ?)",
+                    [(link['id'], asset_id, link.get('association')) for link in src_links]
+                    + [(asset_id, link['id'], link.get('association')) for link in dst_links]
+                )
+                self._conn.executemany(
+                    "INSERT INTO lineage_nodes (asset_id, name, class_type) VALUES (?, ?, ?) "
+                    "ON CONFLICT(asset_id) DO UPDATE SET class_type = excluded.class_type "
+                    "WHERE lineage_nodes.class_type = 'Unknown' AND excluded.class_type != 'Unknown'",
+                    [
+                        (link['id'], link.get('name', ''), link.get('classType') or 'Unknown')
+                        for link in (*src_links, *dst_links)
+                    ]
+                )
+                count += 1
+
+        self._stats['graph_store_writes'] += count
+        return count
+
+    def walk(
+        self,
+        asset_id: str,
+        downstream: bool = True,
+        max_hops: int = 6,
+        class_filter: Optional[str] = None,
+        max_results: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Asset raggiungibili da asset_id entro max_hops (query ricorsiva).
+
+        Args:
+            asset_id: Asset di partenza (escluso dal risultato)
+            downstream: True = segue src -> dst, False = dst -> src (upstream)
+            max_hops: Distanza massima
+            class_filter: Sottostringa del classType (case-insensitive, es. 'Report')
+            max_results: Numero massimo di risultati (None = tutti)
+
+        Returns:
+            Lista ordinata per distanza di dict con asset_id, name, classType,
+            hops (distanza minima), fetched_at (None se mai recuperato)
+        """
+        join_from, join_to = ('src_id', 'dst_id') if downstream else ('dst_id', 'src_id')
+        query = (
+            "WITH RECURSIVE walk(asset_id, hops) AS ("
+            " SELECT ?, 0"
+            " UNION"
+            f" SELECT e.{join_to}, w.hops + 1 FROM lineage_edges e"
+            f" JOIN walk w ON e.{join_from} = w.asset_id"
+            " WHERE w.hops < ?"
+            ") "
+            "SELECT w.asset_id, MIN(w.hops) AS hops, n.name, n.class_type, n.fetched_at "
+            "FROM walk w LEFT JOIN lineage_nodes n ON n.asset_id = w.asset_id "
+            "WHERE w.asset_id != ?"
+        )
+        params: List[Any] = [asset_id, min(max_hops, GRAPH_STORE_MAX_HOPS), asset_id]
+        if class_filter:
+            # % e _ nel filtro sono caratteri letterali, non jolly di LIKE
+            escaped = class_filter.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            query += " AND n.class_type LIKE ? ESCAPE '\\'"
+            params.append(f"%{escaped}%")
+        query += " GROUP BY w.asset_id ORDER BY hops, w.asset_id"
+        if max_results is not None:
+            query += " LIMIT ?"
+            params.append(max_results)
+
+        return [
+            {
+                'asset_id': row_id,
+                'name': name or '',
+                'classType': class_type or 'Unknown',
+                'hops': hops,
+                'fetched_at': fetched_at
+            }
+            for row_id, hops, name, class_type, fetched_at in self._conn.execute(query, params)
+        ]
+
+    def find_expandable(
+        self,
+        asset_id: str,
+        downstream: bool = True,
+        max_hops: int = 6
+    ) -> List[str]:
+        """
+        Nodi entro max_hops - 1 (radice inclusa) la cui direzione richiesta non
+        e affidabile: mai recuperati, recuperati senza quei link o piu vecchi del TTL.
+        Sono gli asset da ricaricare da EDC prima di rispondere dallo store.
+        """
+        join_from, join_to = ('src_id', 'dst_id') if downstream else ('dst_id', 'src_id')
+        links_column = 'has_dst_links' if downstream else 'has_src_links'
+        stale_before = time.time() - self.ttl if self.ttl else 0
+        rows = self._conn.execute(
+            "WITH RECURSIVE walk(asset_id, hops) AS ("
+            " SELECT ?, 0"
+            " UNION"
+            f" SELECT e.{join_to}, w.hops + 1 FROM lineage_edges e"
+            f" JOIN walk w ON e.{join_from} = w.asset_id"
+            " WHERE w.hops < ?"
+            ") "
+            "SELECT DISTINCT w.asset_id FROM walk w "
+            "LEFT JOIN lineage_nodes n ON n.asset_id = w.asset_id "
+            f"WHERE n.fetched_at IS NULL OR n.{links_column} = 0 OR n.fetched_at < ?",
+            (asset_id, max(0, min(max_hops, GRAPH_STORE_MAX_HOPS) - 1), stale_before)
+        )
+        return [row[0] for row in rows]
+
+    def clear(self) -> None:
+        """Rimuove nodi e archi."""
+        with self._conn:
+            self._conn.execute("DELETE FROM lineage_edges")
+            self._conn.execute("DELETE FROM lineage_nodes")
+
+    def get_statistics(self) -> Dict[str, int]:
+        nodes, fetched = self._conn.execute(
+            "SELECT COUNT(*), COUNT(fetched_at) FROM lineage_nodes"
+        ).fetchone()
+        edges = self._conn.execute("SELECT COUNT(*) FROM lineage_edges").fetchone()[0]
+        return {
+            **self._stats,
+            'graph_store_nodes': nodes,
+            'graph_store_fetched_nodes': fetched,
+            'graph_store_edges': edges
+        }
+
+    def close(self) -> None:
+        """Chiude la connessione SQLite."""
+        self._conn.close()
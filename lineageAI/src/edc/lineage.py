@@ -3,11 +3,25 @@ LineageBuilder - Wrapper moderno per TreeBuilder con integrazione LLM.
 Mantiene compatibilità con logica TreeBuilder esistente.
 """
 import asyncio
-from typing import Dict, List, Optional, Any
+import time
+from collections import OrderedDict, deque
+from pathlib import Path
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Any, Tuple
 import logging
 
-from .client import EDCClient
-from .models import TreeNode, LineageDirection
+from ..config.settings import settings
+from .client import EDCClient, FETCH_PROFILE_FULL, FETCH_PROFILE_TRAVERSAL
+from .graph_store import LineageGraphStore
+from .models import (
+    TreeNode, AssetRecord, LineageGraph, LineageDirection, LineageProgress,
+    TRUNCATED_MAX_NODES, TRUNCATED_DEADLINE, PROGRESS_NODE, PROGRESS_LEVEL, PROGRESS_DONE
+)
+
+# Callback opzionale per gli eventi di avanzamento della costruzione
+ProgressCallback = Callable[[LineageProgress], Awaitable[None]]
+
+# Costruzioni interrotte conservate per la ripresa (le piu vecchie vengono scartate)
+RESUMABLE_BUILDS_MAX = 16
 
 
 class LineageBuilder:
@@ -21,6 +35,14 @@ class LineageBuilder:
         self.edc_client = EDCClient()
         self.logger = logging.getLogger('lineage_builder')
         
+        # Limite chiamate EDC parallele durante la visita per livelli
+        self.max_concurrent_requests = settings.max_concurrent_requests
+        
+        # Il crawl usa il payload minimo; i dettagli completi solo per asset mostrati/LLM
+        self.traversal_profile = (
+            FETCH_PROFILE_TRAVERSAL if settings.edc_traversal_fetch else FETCH_PROFILE_FULL
+        )
+        
         # Statistiche (compatibilità TreeBuilder)
         self._stats = {
             'nodes_created': 0,
@@ -31,87 +53,402 @@ class LineageBuilder:
             'field_cross_references_found': 0,
             'api_errors': 0,
             'deduplication_sessions': 0,
-            'duplicate_children_removed': 0
+            'duplicate_children_removed': 0,
+            'shared_references': 0,
+            'builds_truncated': 0,
+            'graph_store_queries': 0,
+            'graph_store_refreshes': 0
         }
         
-        # Cache nodi visitati per prevenire cicli
-        self._visited_nodes = set()
+        # Costruzioni interrotte riprendibili, per (radice, direzione): ogni
+        # chiamata usa il proprio grafo, anche con tool MCP concorrenti
+        self._interrupted: 'OrderedDict[Tuple[str, LineageDirection], LineageGraph]' = OrderedDict()
+        # Statistiche del grafo dell'ultima costruzione terminata (solo contatori)
+        self._last_build_stats: Dict[str, int] = {}
+        
+        # Store persistente di nodi e archi recuperati (query di impatto locali)
+        self.graph_store: Optional[LineageGraphStore] = self._create_graph_store()
+    
+    def _create_graph_store(self) -> Optional[LineageGraphStore]:
+        """Crea lo store persistente del grafo se abilitato."""
+        if not settings.edc_graph_store_enabled:
+            return None
+        
+        store_path = Path(settings.edc_graph_store_path)
+        if not store_path.is_absolute():
+            store_path = Path(__file__).parent.parent.parent / store_path
+        
+        self.logger.info(f"Store grafo lineage: {store_path}")
+        return LineageGraphStore(str(store_path), ttl=settings.edc_graph_store_ttl_seconds)
         
     async def build_tree(
         self,
         node_id: str,
         code: str,
         depth: int = 0,
-        max_depth: int = 100
+        max_depth: int = 100,
+        direction: str = LineageDirection.UPSTREAM,
+        resume: bool = False,
+        on_progress: Optional[ProgressCallback] = None
     ) -> Optional[TreeNode]:
         """
         Costruisce albero lineage completo (logica TreeBuilder).
+        L'albero e la vista del grafo costruito da build_graph: gli asset
+        condivisi da piu rami vengono recuperati una volta e compaiono su ogni ramo.
+        Se la costruzione viene interrotta (budget di nodi o deadline) la radice
+        riporta metadata['truncated'] e metadata['frontier'] (asset non espansi);
+        metadata['resumed'] indica se e stata ripresa una costruzione interrotta.
         
         Args:
             node_id: ID dell'asset radice
             code: Codice progressivo (es. "001")
             depth: Profondità corrente
             max_depth: Profondità massima
+            direction: "upstream", "downstream" o "both" (figli della radice
+                in entrambe le direzioni, con metadata['direction'])
+            resume: Riprende dalla frontiera la costruzione interrotta della
+                stessa radice e direzione invece di ripartire da zero
+            on_progress: Coroutine chiamata a ogni evento di iter_build
             
         Returns:
             TreeNode radice dell'albero o None
         """
-        # Prevenzione cicli
-        if node_id in self._visited_nodes:
-            self._stats['cycles_prevented'] += 1
-            self.logger.warning(f"Ciclo rilevato per {node_id}")
-            return None
+        # La ripresa prende in carico il grafo: una chiamata concorrente riparte da zero
+        resume_graph = None
+        if resume:
+            resume_graph = self._interrupted.pop((node_id, LineageDirection(direction)), None)
+            if resume_graph is None:
+                self.logger.info(f"Nessuna costruzione interrotta da riprendere per {node_id}")
         
-        if depth >= max_depth:
-            self.logger.warning(f"Max depth {max_depth} raggiunta")
-            return None
+        graph = await self.build_graph(
+            node_id, max_depth - depth, direction, resume=resume_graph, on_progress=on_progress
+        )
         
-        try:
-            # Recupera dettagli asset
-            asset_details = await self.edc_client.get_asset_details(node_id)
-            
-            # Crea nodo
-            node = TreeNode(
-                id=node_id,
-                code=code,
-                name=asset_details.get('name', ''),
-                description=asset_details.get('description', ''),
-                class_type=asset_details.get('classType', ''),
-                facts=asset_details.get('facts', [])
-            )
+        # La vista non scende sotto la dimensione del grafo (anche se ripreso piu volte)
+        view_budget = max(settings.edc_max_total_nodes, len(graph)) if settings.edc_max_total_nodes else None
+        root = graph.to_tree(
+            node_id,
+            code,
+            direction=LineageDirection(direction),
+            max_depth=max_depth - depth,
+            max_nodes=view_budget
+        )
+        self._stats['cycles_prevented'] += graph.cycles_skipped
+        
+        if root is not None and resume_graph is not None:
+            root.metadata['resumed'] = True
+        if root is not None and graph.truncated:
+            root.metadata['truncated'] = graph.truncated
+            root.metadata['frontier'] = [asset_id for asset_id, _, _ in graph.frontier]
+        return root
+    
+    async def build_graph(
+        self,
+        node_id: str,
+        max_depth: int = 100,
+        direction: str = LineageDirection.UPSTREAM,
+        max_nodes: Optional[int] = None,
+        deadline_seconds: Optional[float] = None,
+        resume: Optional[LineageGraph] = None,
+        on_progress: Optional[ProgressCallback] = None
+    ) -> LineageGraph:
+        """
+        Costruisce il grafo di lineage consumando iter_build.
+        
+        Args:
+            node_id, max_depth, direction, max_nodes, deadline_seconds, resume:
+                vedi iter_build
+            on_progress: Coroutine chiamata a ogni evento di avanzamento
+            
+        Returns:
+            LineageGraph della costruzione (con truncated e frontier se interrotta)
+        """
+        graph = None
+        async for progress in self.iter_build(
+            node_id, max_depth, direction, max_nodes, deadline_seconds, resume
+        ):
+            if on_progress is not None:
+                await on_progress(progress)
+            if progress.event == PROGRESS_DONE:
+                graph = progress.graph
+        return graph
+    
+    async def iter_build(
+        self,
+        node_id: str,
+        max_depth: int = 100,
+        direction: str = LineageDirection.UPSTREAM,
+        max_nodes: Optional[int] = None,
+        deadline_seconds: Optional[float] = None,
+        resume: Optional[LineageGraph] = None
+    ) -> AsyncIterator[LineageProgress]:
+        """
+        Costruisce il grafo di lineage a partire da un asset, emettendo
+        l'avanzamento: un evento 'node' per ogni asset appena recuperato, uno
+        'level' a fine livello e un 'done' finale con il grafo.
+        Visita breadth-first: ogni livello viene recuperato in parallelo,
+        con al massimo `max_concurrent_requests` chiamate EDC contemporanee.
+        Gli asset sono notificati in ordine di arrivo ma entrano nel grafo
+        nell'ordine della frontiera, quindi il risultato non dipende dai tempi.
+        Ogni asset viene recuperato una sola volta per direzione; i link verso
+        asset gia visitati diventano archi verso il nodo esistente.
+        In modalita "both" la radice viene espansa sia su src_links sia su
+        dst_links nello stesso passaggio; gli asset trovati proseguono poi
+        solo nella direzione da cui sono stati raggiunti.
+        
+        Raggiunto il budget di nodi o la deadline la visita si ferma e il grafo
+        parziale viene restituito con graph.truncated e graph.frontier; i fetch
+        ancora in corso alla deadline vengono annullati e tornano in frontiera.
+        
+        Args:
+            node_id: ID dell'asset radice
+            max_depth: Livelli massimi da visitare (radice inclusa)
+            direction: "upstream", "downstream" o "both"
+            max_nodes: Nodi massimi recuperati in questa chiamata
+                (default: settings.edc_max_total_nodes, 0 = nessun limite)
+            deadline_seconds: Tempo massimo della chiamata
+                (default: settings.edc_build_deadline_seconds, 0 = nessun limite)
+            resume: Grafo interrotto da completare a partire dalla sua frontiera
+                (stessa radice e direzione)
             
-            self._stats['nodes_created'] += 1
-            self._visited_nodes.add(node_id)
+        Yields:
+            LineageProgress (l'ultimo evento, 'done', contiene il grafo)
             
-            # Processa src_links (upstream)
-            src_links = asset_details.get('src_links', [])
+        Raises:
+            ValueError: se resume appartiene a un'altra radice o direzione
+        """
+        if max_nodes is None:
+            max_nodes = settings.edc_max_total_nodes
+        if deadline_seconds is None:
+            deadline_seconds = settings.edc_build_deadline_seconds
+        deadline = time.monotonic() + deadline_seconds if deadline_seconds else None
+        
+        direction = LineageDirection(direction)
+        if resume is not None:
+            if resume.root_id != node_id or resume.direction != direction:
+                raise ValueError(
+                    f"Ripresa non valida: costruzione interrotta di {resume.root_id} "
+                    f"({getattr(resume.direction, 'value', None)}), richiesta {node_id} ({direction.value})"
+                )
+            graph = resume
+            queue = deque(graph.frontier)
+            self.logger.info(f"Ripresa costruzione {node_id}: frontiera={len(queue)}")
+        else:
+            if direction == LineageDirection.BOTH:
+                root_directions = (LineageDirection.UPSTREAM, LineageDirection.DOWNSTREAM)
+            else:
+                root_directions = (direction,)
+            graph = LineageGraph(node_id, direction)
+            # Stato di visita della singola costruzione, per direzione
+            graph.visited = {d: {node_id} for d in root_directions}
+            # Coda: (asset_id, direzioni da espandere, livello)
+            queue = deque([(node_id, root_directions, 0)])
+        
+        graph.truncated = None
+        graph.frontier = []
+        
+        semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+        nodes_at_start = len(graph)
+        fetched = 0
+        level = queue[0][2] if queue else 0
+        
+        while queue:
+            level = queue[0][2]
+            if level >= max_depth:
+                self.logger.warning(f"Max depth {max_depth} raggiunta")
+                break
             
-            for i, link in enumerate(src_links, 1):
-                child_id = link['id']
-                child_code = f"{code}{i:03d}"
+            frontier = []
+            while queue and queue[0][2] == level:
+                frontier.append(queue.popleft())
+            
+            # Budget di nodi: la parte del livello oltre il budget resta in frontiera
+            if max_nodes:
+                allowed = max(0, max_nodes - (len(graph) - nodes_at_start))
+                if allowed < len(frontier):
+                    graph.truncated = TRUNCATED_MAX_NODES
+                    queue.extendleft(reversed(frontier[allowed:]))
+                    frontier = frontier[:allowed]
+            
+            if deadline is not None and time.monotonic() >= deadline:
+                graph.truncated = TRUNCATED_DEADLINE
+                queue.extendleft(reversed(frontier))
+                break
+            
+            # Recupera dettagli dell'intero livello in parallelo (entro la deadline)
+            results: List[Any] = [None] * len(frontier)
+            fetched_at: Dict[str, float] = {}
+            completed = 0
+            async for index, outcome in self._iter_fetch_level(
+                [asset_id for asset_id, _, _ in frontier], semaphore, deadline
+            ):
+                asset_details = outcome
+                if not isinstance(outcome, Exception):
+                    asset_details, record_fetched_at = outcome
+                    if record_fetched_at is not None:
+                        fetched_at[frontier[index][0]] = record_fetched_at
+                results[index] = asset_details
+                completed += 1
+                if not isinstance(asset_details, Exception):
+                    fetched += 1
+                    yield LineageProgress(
+                        event=PROGRESS_NODE,
+                        level=level,
+                        fetched=fetched,
+                        pending=len(frontier) - completed + len(queue),
+                        asset_id=frontier[index][0],
+                        name=asset_details.get('name', '')
+                    )
+            
+            next_frontier = []
+            not_fetched = []
+            fetched_records = []
+            for entry, asset_details in zip(frontier, results):
+                asset_id, directions, _ = entry
+                if asset_details is None:
+                    graph.truncated = TRUNCATED_DEADLINE
+                    not_fetched.append(entry)
+                    continue
+                if isinstance(asset_details, Exception):
+                    self._stats['api_errors'] += 1
+                    self.logger.error(f"Errore costruzione nodo {asset_id}: {asset_details}")
+                    continue
                 
-                # Ricorsione
-                child_node = await self.build_tree(
-                    child_id,
-                    child_code,
-                    depth + 1,
-                    max_depth
-                )
+                if graph.add_node(asset_id, asset_details):
+                    self._stats['nodes_created'] += 1
+                fetched_records.append((asset_id, asset_details))
                 
-                if child_node:
-                    node.add_child(child_node)
+                for link_direction in directions:
+                    # src_links: link_id -> asset_id; dst_links: asset_id -> link_id
+                    upstream = link_direction == LineageDirection.UPSTREAM
+                    links = asset_details.get('src_links' if upstream else 'dst_links', [])
+                    seen = graph.visited[link_direction]
+                    for position, link in enumerate(links, 1):
+                        link_id = link['id']
+                        if upstream:
+                            graph.add_edge(link_id, asset_id, src_position=position)
+                        else:
+                            graph.add_edge(asset_id, link_id, dst_position=position)
+                        if link_id in seen:
+                            self._stats['shared_references'] += 1
+                            continue
+                        seen.add(link_id)
+                        next_frontier.append((link_id, (link_direction,), level + 1))
             
             self.logger.info(
-                f"Nodo {node_id} creato - "
-                f"depth={depth}, children={len(node.children)}"
+                f"Livello {level} completato - "
+                f"nodi={len(frontier) - len(not_fetched)}, frontiera successiva={len(next_frontier)}"
             )
             
-            return node
-            
+            self._record_in_store(fetched_records, fetched_at)
+            queue.extendleft(reversed(not_fetched))
+            queue.extend(next_frontier)
+            yield LineageProgress(
+                event=PROGRESS_LEVEL,
+                level=level,
+                fetched=fetched,
+                pending=len(queue)
+            )
+            if graph.truncated:
+                break
+        
+        if graph.truncated:
+            graph.frontier = list(queue)
+            self._stats['builds_truncated'] += 1
+            self.logger.warning(
+                f"Costruzione {node_id} interrotta ({graph.truncated}): "
+                f"nodi={len(graph)}, frontiera non espansa={len(graph.frontier)}"
+            )
+        self._remember_build(graph)
+        
+        yield LineageProgress(
+            event=PROGRESS_DONE,
+            level=level,
+            fetched=fetched,
+            pending=len(graph.frontier),
+            truncated=graph.truncated,
+            graph=graph
+        )
+    
+    def _remember_build(self, graph: LineageGraph) -> None:
+        """Conserva il grafo interrotto per la ripresa (build_tree con resume)."""
+        key = (graph.root_id, graph.direction)
+        self._interrupted.pop(key, None)
+        if graph.truncated:
+            self._interrupted[key] = graph
+            while len(self._interrupted) > RESUMABLE_BUILDS_MAX:
+                self._interrupted.popitem(last=False)
+        self._last_build_stats = graph.get_statistics()
+    
+    def _record_in_store(
+        self,
+        records: List[Tuple[str, Any]],
+        fetched_at: Optional[Dict[str, float]] = None
+    ) -> None:
+        """
+        Salva nello store persistente gli asset recuperati (un livello per transazione).
+        fetched_at: momento del fetch EDC dei record serviti dalla cache (default: ora).
+        """
+        if self.graph_store is None or not records:
+            return
+        try:
+            self.graph_store.record_assets(
+                records,
+                has_src_links=settings.edc_include_src_links,
+                has_dst_links=settings.edc_include_dst_links,
+                fetched_at=fetched_at
+            )
         except Exception as e:
-            self._stats['api_errors'] += 1
-            self.logger.error(f"Errore costruzione nodo {node_id}: {e}")
-            return None
+            self.logger.warning(f"Scrittura store grafo fallita: {e}")
+    
+    async def _iter_fetch_level(
+        self,
+        asset_ids: List[str],
+        semaphore: asyncio.Semaphore,
+        deadline: Optional[float]
+    ) -> AsyncIterator[Tuple[int, Any]]:
+        """
+        Recupera i dettagli di un livello in parallelo fino alla deadline.
+        Gli asset non completati in tempo vengono annullati e non emessi.
+        
+        Yields:
+            (indice in asset_ids, dettagli o eccezione) in ordine di completamento
+        """
+        tasks = {
+            asyncio.ensure_future(self._fetch_asset_details(asset_id, semaphore)): index
+            for index, asset_id in enumerate(asset_ids)
+        }
+        pending = set(tasks)
+        try:
+            while pending:
+                timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+                done, pending = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    break
+                for task in sorted(done, key=tasks.get):
+                    yield tasks[task], task.exception() or task.result()
+        finally:
+            unfinished = [task for task in tasks if not task.done()]
+            for task in unfinished:
+                task.cancel()
+            if unfinished:
+                await asyncio.gather(*unfinished, return_exceptions=True)
+    
+    async def _fetch_asset_details(
+        self,
+        asset_id: str,
+        semaphore: asyncio.Semaphore
+    ) -> Tuple[AssetRecord, Optional[float]]:
+        """
+        Recupera i dettagli di un asset rispettando il limite di concorrenza,
+        con il momento del fetch EDC (letto prima che una riconvalidazione
+        in background possa aggiornare la cache).
+        """
+        async with semaphore:
+            record = await self.edc_client.get_asset_record(asset_id, self.traversal_profile)
+            return record, self.edc_client.get_record_fetched_at(asset_id, self.traversal_profile)
     
     async def get_asset_metadata(self, asset_id: str) -> Dict[str, Any]:
         """
@@ -131,8 +468,8 @@ class LineageBuilder:
             'classType': details.get('classType', ''),
             'description': details.get('description', ''),
             'facts': details.get('facts', []),
-            'src_links': details.get('src_links', []),
-            'dst_links': details.get('dst_links', [])
+            'src_links': [dict(link) for link in details.get('src_links', [])],
+            'dst_links': [dict(link) for link in details.get('dst_links', [])]
         }
     
     async def get_immediate_lineage(
@@ -150,7 +487,7 @@ class LineageBuilder:
         Returns:
             Lista di link immediati
         """
-        details = await self.edc_client.get_asset_details(asset_id)
+        details = await self.edc_client.get_asset_record(asset_id, self.traversal_profile)
         
         results = []
         
@@ -176,7 +513,190 @@ class LineageBuilder:
         
         return results
     
-    def get_statistics(self) -> Dict[str, int]:
+    async def get_downstream_impact(
+        self,
+        asset_id: str,
+        max_depth: int = 5,
+        on_progress: Optional[ProgressCallback] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Recupera tutti gli asset downstream entro max_depth livelli
+        (crawl su dst_links), ad es. per l'analisi di impatto.
+        
+        Args:
+            asset_id: ID dell'asset modificato
+            max_depth: Livelli downstream da esplorare
+            on_progress: Coroutine chiamata a ogni evento di avanzamento del crawl
+            
+        Returns:
+            Lista di asset impattati nello stesso formato di get_immediate_lineage,
+            con 'depth' = distanza dall'asset (1 = consumatore diretto)
+        """
+        impacted, _ = await self.build_downstream_impact(asset_id, max_depth, on_progress)
+        return impacted
+    
+    async def build_downstream_impact(
+        self,
+        asset_id: str,
+        max_depth: int = 5,
+        on_progress: Optional[ProgressCallback] = None
+    ) -> Tuple[List[Dict[str, Any]], LineageGraph]:
+        """
+        Come get_downstream_impact, restituendo anche il grafo del crawl
+        (graph.truncated e graph.frontier se interrotto da budget o deadline).
+        """
+        graph = await self.build_graph(
+            asset_id, max_depth + 1, LineageDirection.DOWNSTREAM, on_progress=on_progress
+        )
+        
+        results = []
+        for impacted_id, distance, parent_id in graph.walk(asset_id, LineageDirection.DOWNSTREAM):
+            if parent_id is None:
+                continue
+            # Nome e tipo dal link (il profilo traversal non include i facts)
+            link = next(
+                (link for link in graph.nodes[parent_id].get('dst_links', [])
+                 if link['id'] == impacted_id),
+                None
+            ) or {}
+            details = graph.nodes[impacted_id]
+            results.append({
+                'asset_id': impacted_id,
+                'name': link.get('name') or details.get('name', ''),
+                'classType': link.get('classType') or details.get('classType', ''),
+                'association': link.get('association'),
+                'direction': 'downstream',
+                'depth': distance
+            })
+        
+        return results, graph
+    
+    async def query_lineage_store(
+        self,
+        asset_id: str,
+        direction: str = LineageDirection.DOWNSTREAM,
+        max_depth: int = 6,
+        class_filter: Optional[str] = None,
+        max_results: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Risponde a una domanda di lineage dallo store persistente (query
+        ricorsiva locale). Prima vengono ricaricati da EDC, a batch, solo i nodi
+        dello store sconosciuti o scaduti che servono a raggiungere max_depth;
+        senza store si ricade su un crawl con build_graph.
+        
+        Args:
+            asset_id: Asset di partenza
+            direction: "downstream" (es. impatto) o "upstream" (es. sorgenti)
+            max_depth: Hop massimi
+            class_filter: Sottostringa del classType (es. "Report", "Column")
+            max_results: Numero massimo di asset restituiti
+            
+        Returns:
+            Dict con assets (asset_id, name, classType, hops), refreshed
+            (asset ricaricati da EDC), complete (False se restano nodi da
+            ricaricare, es. budget esaurito o errori EDC) e source
+        """
+        self._stats['graph_store_queries'] += 1
+        downstream = LineageDirection(direction) != LineageDirection.UPSTREAM
+        
+        if self.graph_store is None:
+            return await self._query_lineage_crawl(asset_id, downstream, max_depth, class_filter, max_results)
+        
+        budget = settings.edc_max_total_nodes
+        attempted = set()
+        refreshed = 0
+        complete = True
+        # Ogni giro rende affidabile almeno un hop in piu
+        for _ in range(max_depth + 1):
+            expandable = [
+                node_id for node_id in self.graph_store.find_expandable(asset_id, downstream, max_depth)
+                if node_id not in attempted
+            ]
+            if not expandable:
+                break
+            if budget and len(attempted) + len(expandable) > budget:
+                expandable = expandable[:max(0, budget - len(attempted))]
+                complete = False
+                if not expandable:
+                    break
+            
+            attempted.update(expandable)
+            try:
+                # Refresh reale: la cache (anche stale) non rende affidabile un nodo
+                details = await self.edc_client.get_asset_records_batch(
+                    expandable, profile=self.traversal_profile, refresh=True
+                )
+            except Exception as e:
+                self._stats['api_errors'] += 1
+                self.logger.error(f"Refresh store grafo fallito per {asset_id}: {e}")
+                complete = False
+                break
+            
+            self._record_in_store(list(details.items()))
+            refreshed += len(details)
+            self._stats['graph_store_refreshes'] += len(details)
+        
+        # Completo solo se dopo i refresh non resta nulla da ricaricare (anche asset non restituiti da EDC)
+        if complete and self.graph_store.find_expandable(asset_id, downstream, max_depth):
+            complete = False
+        
+        assets = self.graph_store.walk(asset_id, downstream, max_depth, class_filter, max_results)
+        return {
+            'asset_id': asset_id,
+            'direction': 'downstream' if downstream else 'upstream',
+            'assets': assets,
+            'refreshed': refreshed,
+            'complete': complete,
+            'source': 'graph_store'
+        }
+    
+    async def _query_lineage_crawl(
+        self,
+        asset_id: str,
+        downstream: bool,
+        max_depth: int,
+        class_filter: Optional[str],
+        max_results: Optional[int]
+    ) -> Dict[str, Any]:
+        """query_lineage_store senza store: crawl EDC e visita del grafo in memoria."""
+        direction = LineageDirection.DOWNSTREAM if downstream else LineageDirection.UPSTREAM
+        graph = await self.build_graph(asset_id, max_depth + 1, direction)
+        
+        links_key = 'dst_links' if downstream else 'src_links'
+        assets = []
+        for node_id, hops, parent_id in graph.walk(asset_id, direction):
+            if parent_id is None:
+                continue
+            # Nome e tipo dal link, come in get_downstream_impact
+            link = next(
+                (link for link in graph.nodes[parent_id].get(links_key, []) if link['id'] == node_id),
+                None
+            ) or {}
+            details = graph.nodes[node_id]
+            class_type = link.get('classType') or details.get('classType') or 'Unknown'
+            if class_filter and class_filter.lower() not in class_type.lower():
+                continue
+            assets.append({
+                'asset_id': node_id,
+                'name': link.get('name') or details.get('name', ''),
+                'classType': class_type,
+                'hops': hops,
+                'fetched_at': None
+            })
+            if max_results is not None and len(assets) >= max_results:
+                break
+        
+        return {
+            'asset_id': asset_id,
+            'direction': direction.value,
+            'assets': assets,
+            'refreshed': len(graph),
+            'complete': not graph.truncated,
+            'source': 'edc'
+        }
+    
+    def get_statistics(self) -> Dict[str, Any]:
         """
         Restituisce statistiche di costruzione.
         
@@ -188,19 +708,34 @@ class LineageBuilder:
         
         combined_stats = {**self._stats}
         combined_stats['total_requests'] = client_stats['total_requests']
-        combined_stats['cache_hits'] = client_stats['cache_hits']
+        combined_stats['coalesced_requests'] = client_stats['coalesced_requests']
+        combined_stats['traversal_fetches'] = client_stats['traversal_fetches']
+        for key, value in client_stats.items():
+            if key.startswith((
+                'cache_', 'retr', 'circuit_', 'concurrency_', 'latency_', 'snapshot_', 'federated_',
+                'negative_'
+            )):
+                combined_stats[key] = value
+        
+        combined_stats.update(self._last_build_stats)
+        combined_stats['resumable_builds'] = len(self._interrupted)
+        if self.graph_store is not None:
+            combined_stats.update(self.graph_store.get_statistics())
         
         return combined_stats
     
     def clear_cache(self) -> None:
-        """Pulisce cache e nodi visitati."""
-        self._visited_nodes.clear()
+        """Pulisce la cache degli asset e le costruzioni interrotte."""
+        self._interrupted.clear()
         self.edc_client.clear_cache()
         self.logger.info("Cache cleared")
     
     async def close(self) -> None:
         """Chiude risorse."""
         await self.edc_client.close()
+        if self.graph_store is not None:
+            self.graph_store.close()
+            self.graph_store = None
     
     async def __aenter__(self):
         """Context manager entry."""
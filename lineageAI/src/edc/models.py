@@ -1,9 +1,12 @@
 """
 Modelli dati per EDC Lineage.
-Include TreeNode e altri dataclass per gestione lineage.
+Include TreeNode, LineageGraph, record compatti degli asset e altri dataclass per gestione lineage.
 """
-from typing import List, Dict, Optional, Any
-from dataclasses import dataclass, field
+import sys
+from collections import deque
+from collections.abc import Mapping
+from typing import Iterator, List, Dict, Optional, Any, Set, Tuple
+from dataclasses import dataclass
 from enum import Enum
 
 
@@ -14,6 +17,164 @@ class LineageDirection(str, Enum):
     BOTH = "both"
 
 
+# Motivi di interruzione di una costruzione di lineage (LineageGraph.truncated)
+TRUNCATED_MAX_NODES = "max_nodes"
+TRUNCATED_DEADLINE = "deadline"
+
+# Eventi di avanzamento di una costruzione (LineageProgress.event)
+PROGRESS_NODE = "node"
+PROGRESS_LEVEL = "level"
+PROGRESS_DONE = "done"
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    """Interna le stringhe ripetute (ID, classType, association) per risparmiare memoria."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class AssetLink(Mapping):
+    """
+    Link di lineage (src/dst) in forma compatta.
+    Si comporta come il dict originale: link['id'], link['classType'], dict(link).
+    """
+    
+    __slots__ = ('id', 'association', 'name', 'class_type', 'href')
+    
+    _KEYS = ('id', 'association', 'name', 'classType', 'href')
+    
+    def __init__(
+        self,
+        id: str,
+        association: Optional[str],
+        name: str,
+        class_type: str = 'Unknown',
+        href: str = ''
+    ):
+        self.id = _intern(id)
+        self.association = _intern(association)
+        self.name = name
+        self.class_type = _intern(class_type)
+        self.href = href
+    
+    @classmethod
+    def from_dict(cls, data: Mapping) -> 'AssetLink':
+        """Ricostruisce il link da un dict (es. letto dalla cache SQLite)."""
+        return cls(
+            id=data['id'],
+            association=data.get('association'),
+            name=data.get('name', ''),
+            class_type=data.get('classType') or 'Unknown',
+            href=data.get('href', '')
+        )
+    
+    def __getitem__(self, key: str) -> Any:
+        if key == 'classType':
+            return self.class_type
+        if key in self._KEYS:
+            return getattr(self, key)
+        raise KeyError(key)
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._KEYS)
+    
+    def __len__(self) -> int:
+        return len(self._KEYS)
+    
+    def __repr__(self) -> str:
+        return f"AssetLink(id={self.id}, association={self.association})"
+
+
+class AssetRecord(Mapping):
+    """
+    Dettagli di un asset EDC in forma compatta (__slots__ e stringhe internate).
+    Vista dict-compatibile in sola lettura usata da cache e crawl del lineage
+    (EDCClient.get_asset_record); l'API pubblica get_asset_details restituisce
+    to_dict(). Chiavi asset_id, name, classType, description, facts,
+    src_links, dst_links, metadata.
+    Il payload raw dell'API ('metadata') viene mantenuto solo se richiesto.
+    """
+    
+    __slots__ = (
+        'asset_id', 'name', 'class_type', 'description',
+        'facts', 'src_links', 'dst_links', 'metadata'
+    )
+    
+    _KEYS = {
+        'asset_id': 'asset_id',
+        'metadata': 'metadata',
+        'src_links': 'src_links',
+        'dst_links': 'dst_links',
+        'description': 'description',
+        'facts': 'facts',
+        'name': 'name',
+        'classType': 'class_type'
+    }
+    
+    def __init__(
+        self,
+        asset_id: str,
+        name: str,
+        class_type: str = 'Unknown',
+        description: str = '',
+        facts: Optional[List[Dict]] = None,
+        src_links: Optional[List[AssetLink]] = None,
+        dst_links: Optional[List[AssetLink]] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ):
+        self.asset_id = _intern(asset_id)
+        self.name = name
+        self.class_type = _intern(class_type)
+        self.description = description
+        self.facts = facts or []
+        self.src_links = src_links or []
+        self.dst_links = dst_links or []
+        self.metadata = metadata or {}
+    
+    def __getitem__(self, key: str) -> Any:
+        attr = self._KEYS.get(key)
+        if attr is None:
+            raise KeyError(key)
+        return getattr(self, attr)
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._KEYS)
+    
+    def __len__(self) -> int:
+        return len(self._KEYS)
+    
+    @classmethod
+    def from_dict(cls, data: Mapping) -> 'AssetRecord':
+        """Ricostruisce il record da un dict (es. letto dalla cache SQLite)."""
+        return cls(
+            asset_id=data.get('asset_id', ''),
+            name=data.get('name', ''),
+            class_type=data.get('classType') or 'Unknown',
+            description=data.get('description', ''),
+            facts=list(data.get('facts') or []),
+            src_links=[AssetLink.from_dict(link) for link in data.get('src_links') or []],
+            dst_links=[AssetLink.from_dict(link) for link in data.get('dst_links') or []],
+            metadata=data.get('metadata') or None
+        )
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Converte in dict semplice e modificabile (link inclusi), ad es. per
+        serializzazione JSON; le liste sono copie, il record in cache non cambia.
+        """
+        result = dict(self)
+        result['facts'] = list(self.facts)
+        result['metadata'] = dict(self.metadata)
+        result['src_links'] = [dict(link) for link in self.src_links]
+        result['dst_links'] = [dict(link) for link in self.dst_links]
+        return result
+    
+    def __repr__(self) -> str:
+        return (
+            f"AssetRecord(id={self.asset_id}, src={len(self.src_links)}, "
+            f"dst={len(self.dst_links)})"
+        )
+
+
 class TreeNode:
     """
     Nodo dell'albero di lineage.
@@ -118,6 +279,256 @@ class TreeNode:
         return f"TreeNode(id={self.id}, code={self.code}, children={len(self.children)})"
 
 
+class LineageGraph:
+    """
+    Grafo di lineage di una costruzione: un nodo per asset (deduplicato) e
+    indici di adiacenza upstream/downstream nell'ordine dei link EDC.
+    Un asset raggiunto da piu percorsi viene memorizzato una sola volta;
+    gli alberi (TreeNode) sono viste derivate con to_tree, dove compare su ogni ramo.
+    Una costruzione interrotta (budget di nodi o deadline) lascia in truncated
+    il motivo e in frontier gli asset non espansi, da cui si puo riprendere.
+    """
+    
+    def __init__(
+        self,
+        root_id: Optional[str] = None,
+        direction: Optional[LineageDirection] = None
+    ):
+        """
+        Inizializza il grafo.
+        
+        Args:
+            root_id: ID dell'asset da cui parte la costruzione
+            direction: Direzione della costruzione (una ripresa deve usare la stessa)
+        """
+        self.root_id = root_id
+        self.direction = direction
+        # asset_id -> dettagli (AssetRecord o dict compatibile)
+        self.nodes: Dict[str, Mapping] = {}
+        # asset_id -> ID adiacenti -> posizione (da 1) del link nei src_links/dst_links
+        # dell'asset come restituiti da EDC, duplicati inclusi (None se non letta)
+        self._upstream: Dict[str, Dict[str, Optional[int]]] = {}
+        self._downstream: Dict[str, Dict[str, Optional[int]]] = {}
+        self.edge_count = 0
+        # Riferimenti ciclici saltati dall'ultima vista ad albero
+        self.cycles_skipped = 0
+        
+        # Stato della costruzione: asset visitati per direzione e frontiera
+        # non espansa (asset_id, direzioni, livello) se interrotta
+        self.visited: Dict[LineageDirection, Set[str]] = {}
+        self.frontier: List[Tuple[str, Tuple[LineageDirection, ...], int]] = []
+        self.truncated: Optional[str] = None
+    
+    def add_node(self, asset_id: str, details: Mapping) -> bool:
+        """
+        Aggiunge (o aggiorna) i dettagli di un asset.
+        
+        Returns:
+            True se l'asset non era ancora nel grafo
+        """
+        is_new = asset_id not in self.nodes
+        self.nodes[asset_id] = details
+        return is_new
+    
+    def add_edge(
+        self,
+        upstream_id: str,
+        downstream_id: str,
+        src_position: Optional[int] = None,
+        dst_position: Optional[int] = None
+    ) -> bool:
+        """
+        Aggiunge il link upstream -> downstream (i duplicati vengono ignorati).
+        Le posizioni servono ai codici della vista ad albero; per un link
+        duplicato resta la prima.
+        
+        Args:
+            upstream_id, downstream_id: Estremi del link
+            src_position: Posizione del link nei src_links di downstream_id
+            dst_position: Posizione del link nei dst_links di upstream_id
+        
+        Returns:
+            True se il link e nuovo
+        """
+        targets = self._downstream.setdefault(upstream_id, {})
+        sources = self._upstream.setdefault(downstream_id, {})
+        is_new = downstream_id not in targets
+        if targets.get(downstream_id) is None:
+            targets[downstream_id] = dst_position
+        if sources.get(upstream_id) is None:
+            sources[upstream_id] = src_position
+        if is_new:
+            self.edge_count += 1
+        return is_new
+    
+    def upstream(self, asset_id: str) -> List[str]:
+        """ID degli asset che alimentano asset_id."""
+        return list(self._upstream.get(asset_id, ()))
+    
+    def downstream(self, asset_id: str) -> List[str]:
+        """ID degli asset alimentati da asset_id."""
+        return list(self._downstream.get(asset_id, ()))
+    
+    def walk(
+        self,
+        root_id: Optional[str] = None,
+        direction: LineageDirection = LineageDirection.UPSTREAM
+    ) -> Iterator[Tuple[str, int, Optional[str]]]:
+        """
+        Visita breadth-first degli asset caricati raggiungibili da root_id.
+        Ogni asset compare una volta, alla distanza minima.
+        
+        Yields:
+            (asset_id, distanza dalla radice, asset da cui e stato raggiunto o None)
+        """
+        root_id = root_id or self.root_id
+        if root_id not in self.nodes:
+            return
+        
+        adjacency = self._downstream if direction == LineageDirection.DOWNSTREAM else self._upstream
+        seen = {root_id}
+        queue = deque([(root_id, 0, None)])
+        while queue:
+            asset_id, distance, parent_id = queue.popleft()
+            yield asset_id, distance, parent_id
+            for next_id in adjacency.get(asset_id, ()):
+                if next_id in self.nodes and next_id not in seen:
+                    seen.add(next_id)
+                    queue.append((next_id, distance + 1, asset_id))
+    
+    def __contains__(self, asset_id: object) -> bool:
+        return asset_id in self.nodes
+    
+    def __len__(self) -> int:
+        return len(self.nodes)
+    
+    def to_tree(
+        self,
+        root_id: Optional[str] = None,
+        code: str = "001",
+        direction: LineageDirection = LineageDirection.UPSTREAM,
+        max_depth: Optional[int] = None,
+        max_nodes: Optional[int] = None
+    ) -> Optional[TreeNode]:
+        """
+        Vista ad albero del grafo a partire da root_id.
+        Ogni percorso diventa un ramo: un asset condiviso produce un TreeNode per
+        percorso (stessi dati). Un asset gia presente tra gli antenati del ramo
+        (ciclo) non viene riespanso; i link verso asset non caricati sono omessi.
+        I codici seguono la posizione del link nei src_links/dst_links restituiti
+        da EDC, duplicati inclusi (es. "001002"), come nella visita ricorsiva.
+        Con BOTH la radice ha prima i rami upstream e poi quelli downstream,
+        distinti da metadata['direction'] sui figli diretti.
+        
+        Args:
+            root_id: Radice della vista (default: radice della costruzione)
+            code: Codice della radice
+            direction: UPSTREAM (src_links), DOWNSTREAM (dst_links) o BOTH
+            max_depth: Livelli massimi della vista (None = tutto il grafo)
+            max_nodes: Nodi massimi della vista, contro l'esplosione dei DAG molto condivisi
+                (se raggiunto la radice riporta metadata['truncated'])
+            
+        Returns:
+            TreeNode radice o None se la radice non e nel grafo
+        """
+        root_id = root_id or self.root_id
+        if root_id not in self.nodes:
+            return None
+        
+        if direction == LineageDirection.BOTH:
+            root_adjacencies = (
+                (LineageDirection.UPSTREAM, self._upstream),
+                (LineageDirection.DOWNSTREAM, self._downstream)
+            )
+        elif direction == LineageDirection.DOWNSTREAM:
+            root_adjacencies = ((direction, self._downstream),)
+        else:
+            root_adjacencies = ((LineageDirection.UPSTREAM, self._upstream),)
+        
+        self.cycles_skipped = 0
+        root = self._create_tree_node(root_id, code)
+        created = 1
+        
+        # Visita per livelli: (nodo, adiacenze da seguire, antenati del ramo come catena (id, precedente))
+        queue = deque([(root, root_adjacencies, (root_id, None), 1)])
+        while queue:
+            node, adjacencies, ancestors, level = queue.popleft()
+            if max_depth is not None and level >= max_depth:
+                continue
+            
+            i = 0
+            for child_direction, adjacency in adjacencies:
+                # Con BOTH i codici downstream proseguono dopo quelli upstream
+                offset = i
+                for child_id, position in adjacency.get(node.id, {}).items():
+                    # Posizione del link restituita da EDC (i duplicati occupano un codice)
+                    i = offset + position if position is not None else i + 1
+                    if child_id not in self.nodes:
+                        continue
+                    if self._on_path(child_id, ancestors):
+                        self.cycles_skipped += 1
+                        continue
+                    if max_nodes is not None and created >= max_nodes:
+                        root.metadata['truncated'] = TRUNCATED_MAX_NODES
+                        return root
+                    
+                    child = self._create_tree_node(child_id, f"{node.code}{i:03d}")
+                    if len(adjacencies) > 1:
+                        child.metadata['direction'] = child_direction.value
+                    node.add_child(child)
+                    created += 1
+                    queue.append((child, ((child_direction, adjacency),), (child_id, ancestors), level + 1))
+        
+        return root
+    
+    @staticmethod
+    def _on_path(asset_id: str, ancestors: Optional[tuple]) -> bool:
+        """Verifica se asset_id compare nella catena di antenati del ramo."""
+        while ancestors is not None:
+            if ancestors[0] == asset_id:
+                return True
+            ancestors = ancestors[1]
+        return False
+    
+    def _create_tree_node(self, asset_id: str, code: str) -> TreeNode:
+        details = self.nodes[asset_id]
+        return TreeNode(
+            id=asset_id,
+            code=code,
+            name=details.get('name', ''),
+            description=details.get('description', ''),
+            class_type=details.get('classType', ''),
+            facts=details.get('facts', [])
+        )
+    
+    def get_statistics(self) -> Dict[str, int]:
+        """Statistiche del grafo."""
+        return {
+            'graph_nodes': len(self.nodes),
+            'graph_edges': self.edge_count,
+            'graph_frontier': len(self.frontier)
+        }
+    
+    def __repr__(self) -> str:
+        return (
+            f"LineageGraph(root={self.root_id}, nodes={len(self.nodes)}, "
+            f"edges={self.edge_count}, truncated={self.truncated})"
+        )
+
+
+@dataclass
+class LineageProgress:
+    """Evento di avanzamento emesso da LineageBuilder.iter_build."""
+    event: str
+    level: int
+    fetched: int
+    pending: int = 0
+    asset_id: Optional[str] = None
+    name: str = ""
+    truncated: Optional[str] = None
+    graph: Optional[LineageGraph] = None
+
+
 @dataclass
 class ImpactAnalysisRequest:
     """Request per analisi di impatto."""
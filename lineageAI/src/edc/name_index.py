@@ -0,0 +1,157 @@
+"""
+Indice invertito a n-grammi sui nomi degli asset EDC.
+Risponde a filtri per sottostringa (*GARANZIE*), prefisso (IFR_*) e suffisso
+(*_DT) verificando solo i candidati che contengono tutti gli n-grammi cercati.
+"""
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Union
+
+NGRAM_SIZE = 3
+
+# Marcatori di inizio/fine nome: rendono indicizzabili prefissi e suffissi
+NAME_START = '\x02'
+NAME_END = '\x03'
+
+
+class NamePattern:
+    """
+    Filtro sul nome con wildcard '*' (case-insensitive).
+    - GARANZIE o *GARANZIE*: il nome contiene GARANZIE
+    - IFR_*: il nome inizia con IFR_
+    - *_DT: il nome finisce con _DT
+    - IFR_*_DT: le parti compaiono nell'ordine indicato
+    """
+
+    __slots__ = ('parts', 'anchored_start', 'anchored_end')
+
+    def __init__(self, pattern: str):
+        text = pattern.strip().upper()
+        has_wildcard = '*' in text
+        self.anchored_start = has_wildcard and not text.startswith('*')
+        self.anchored_end = has_wildcard and not text.endswith('*')
+        self.parts = [part for part in text.split('*') if part]
+
+    def matches(self, name: str) -> bool:
+        """Verifica il pattern su un nome."""
+        name = name.upper()
+        position = 0
+
+        for i, part in enumerate(self.parts):
+            if i == 0 and self.anchored_start:
+                if not name.startswith(part):
+                    return False
+                position = len(part)
+                continue
+
+            if i == len(self.parts) - 1 and self.anchored_end:
+                return name.endswith(part) and len(name) - len(part) >= position
+
+            found = name.find(part, position)
+            if found < 0:
+                return False
+            position = found + len(part)
+
+        return True
+
+    def ngrams(self, n: int = NGRAM_SIZE) -> Set[str]:
+        """N-grammi che ogni nome compatibile deve contenere."""
+        grams: Set[str] = set()
+        for i, part in enumerate(self.parts):
+            if i == 0 and self.anchored_start:
+                part = NAME_START + part
+            if i == len(self.parts) - 1 and self.anchored_end:
+                part = part + NAME_END
+            grams.update(part[j:j + n] for j in range(len(part) - n + 1))
+        return grams
+
+
+def _contains(postings: Sequence[int], doc_id: int) -> bool:
+    index = bisect_left(postings, doc_id)
+    return index < len(postings) and postings[index] == doc_id
+
+
+class NGramIndex:
+    """
+    Indice invertito n-gramma -> ID documento (posizione di inserimento).
+    Le posting list sono array ordinati: l'intersezione parte dalla lista
+    piu corta e cerca gli ID nelle altre con ricerca binaria.
+    """
+
+    def __init__(self, n: int = NGRAM_SIZE):
+        self.n = n
+        self._names: List[str] = []
+        self._postings: Dict[str, array] = {}
+
+    def add(self, name: str) -> int:
+        """
+        Aggiunge un nome all'indice.
+
+        Returns:
+            ID del documento (ordine di inserimento)
+        """
+        doc_id = len(self._names)
+        name = name.upper()
+        self._names.append(name)
+
+        padded = NAME_START + name + NAME_END
+        for gram in {padded[i:i + self.n] for i in range(len(padded) - self.n + 1)}:
+            postings = self._postings.get(gram)
+            if postings is None:
+                postings = self._postings[gram] = array('I')
+            postings.append(doc_id)
+
+        return doc_id
+
+    def extend(self, names: Iterable[str]) -> None:
+        for name in names:
+            self.add(name)
+
+    def search(
+        self,
+        pattern: Union[str, NamePattern],
+        limit: Optional[int] = None
+    ) -> List[int]:
+        """
+        Cerca i documenti il cui nome soddisfa il pattern.
+
+        Args:
+            pattern: Filtro nome (vedi NamePattern)
+            limit: Numero massimo di risultati (None = tutti)
+
+        Returns:
+            ID dei documenti in ordine di inserimento
+        """
+        if not isinstance(pattern, NamePattern):
+            pattern = NamePattern(pattern)
+
+        grams = pattern.ngrams(self.n)
+        if grams:
+            postings = [self._postings.get(gram) for gram in grams]
+            if any(p is None for p in postings):
+                return []
+            postings.sort(key=len)
+            smallest, others = postings[0], postings[1:]
+            candidates: Iterable[int] = (
+                doc_id for doc_id in smallest
+                if all(_contains(other, doc_id) for other in others)
+            )
+        else:
+            # Pattern troppo corto per gli n-grammi: scansione completa
+            candidates = range(len(self._names))
+
+        results: List[int] = []
+        for doc_id in candidates:
+            if pattern.matches(self._names[doc_id]):
+                results.append(doc_id)
+                if limit is not None and len(results) >= limit:
+                    break
+
+        return results
+
+    def count(self, pattern: Union[str, NamePattern]) -> int:
+        """Numero di nomi che soddisfano il pattern."""
+        return len(self.search(pattern))
+
+    def __len__(self) -> int:
+        return len(self._names)
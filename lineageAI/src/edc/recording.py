@@ -0,0 +1,228 @@
+"""
+Registrazione e riproduzione delle risposte HTTP di EDC.
+In modalita record la sessione aiohttp reale viene avvolta e ogni risposta
+(status, header, body byte per byte, tempi) viene aggiunta a una cassetta JSONL.
+In modalita replay le risposte vengono servite dalla cassetta, a piena
+velocita o con i tempi originali (scalati da un fattore), senza rete.
+Le cassette non contengono gli header della richiesta (credenziali escluse).
+"""
+import asyncio
+import base64
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import aiohttp
+from multidict import CIMultiDict, CIMultiDictProxy
+from yarl import URL
+
+HTTP_MODE_LIVE = 'live'
+HTTP_MODE_RECORD = 'record'
+HTTP_MODE_REPLAY = 'replay'
+
+# Header della risposta conservati nella cassetta. Il body registrato e gia
+# decompresso da aiohttp: Content-Encoding e Content-Length non lo descrivono piu
+RECORDED_HEADERS = ('Content-Type', 'Retry-After')
+
+CassetteKey = Tuple[str, str, Tuple[Tuple[str, str], ...]]
+
+
+class ReplayMissError(LookupError):
+    """Sollevata in replay quando la richiesta non e presente nella cassetta."""
+
+
+def request_key(method: str, url: str, params: Any = None) -> CassetteKey:
+    """
+    Chiave di una richiesta: metodo, path (senza host) e parametri ordinati.
+    Senza host la stessa cassetta vale anche con un EDC_BASE_URL diverso.
+    """
+    items = params.items() if isinstance(params, dict) else (params or [])
+    return (
+        method.upper(),
+        urlsplit(url).path,
+        tuple(sorted((str(k), str(v)) for k, v in items))
+    )
+
+
+class Cassette:
+    """File JSONL di risposte registrate (una per riga, in ordine di arrivo)."""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+
+    def append(self, entry: Dict[str, Any]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open('a', encoding='utf-8') as f:
+            f.write(json.dumps(entry) + '\n')
+
+    def load(self) -> Dict[CassetteKey, List[Dict[str, Any]]]:
+        """Risposte registrate raggruppate per chiave, nell'ordine di registrazione."""
+        entries: Dict[CassetteKey, List[Dict[str, Any]]] = {}
+        if not self.path.exists():
+            return entries
+        with self.path.open(encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                key = request_key(entry['method'], entry['path'], entry['params'])
+                entries.setdefault(key, []).append(entry)
+        return entries
+
+
+class _ReplayContent:
+    """Body riprodotto con l'interfaccia di aiohttp.StreamReader usata dal client."""
+
+    def __init__(self, body: bytes, delay: float):
+        self._body = body
+        self._delay = delay
+
+    async def iter_chunked(self, size: int):
+        chunks = max(1, -(-len(self._body) // size))
+        for start in range(0, len(self._body), size):
+            if self._delay:
+                await asyncio.sleep(self._delay / chunks)
+            yield self._body[start:start + size]
+
+    async def read(self) -> bytes:
+        if self._delay:
+            await asyncio.sleep(self._delay)
+        return self._body
+
+
+class ReplayResponse:
+    """Risposta registrata con il sottoinsieme di aiohttp.ClientResponse usato da EDCClient."""
+
+    def __init__(self, entry: Dict[str, Any], url: str, delay_factor: float = 0.0):
+        self.status: int = entry['status']
+        self.reason: str = entry.get('reason', '')
+        # Cassette registrate prima del filtro possono contenere header del body compresso
+        self.headers = CIMultiDictProxy(CIMultiDict(
+            (name, value) for name, value in entry.get('headers', {}).items()
+            if name in RECORDED_HEADERS
+        ))
+        self.url = URL(url)
+        self._body = base64.b64decode(entry['body'])
+        self.content = _ReplayContent(self._body, entry.get('body_elapsed', 0.0) * delay_factor)
+
+    @property
+    def charset(self) -> Optional[str]:
+        content_type = self.headers.get('Content-Type', '')
+        for part in content_type.split(';')[1:]:
+            key, _, value = part.strip().partition('=')
+            if key.lower() == 'charset':
+                return value.strip('"') or None
+        return None
+
+    async def read(self) -> bytes:
+        return await self.content.read()
+
+    async def text(self, encoding: Optional[str] = None) -> str:
+        return (await self.read()).decode(encoding or self.charset or 'utf-8', errors='replace')
+
+    async def json(self, **kwargs) -> Any:
+        return json.loads(await self.read())
+
+    def release(self) -> None:
+        pass
+
+    def raise_for_status(self) -> None:
+        if self.status >= 400:
+            raise aiohttp.ClientResponseError(
+                aiohttp.RequestInfo(self.url, 'GET', CIMultiDictProxy(CIMultiDict()), self.url),
+                (),
+                status=self.status,
+                message=self.reason,
+                headers=self.headers
+            )
+
+
+class RecordingSession:
+    """
+    Avvolge una aiohttp.ClientSession e registra ogni GET nella cassetta.
+    Il body viene letto per intero prima di restituire la risposta (niente
+    streaming durante la registrazione).
+    """
+
+    def __init__(self, session: aiohttp.ClientSession, cassette: Cassette):
+        self._session = session
+        self._cassette = cassette
+        self.recorded = 0
+
+    @property
+    def closed(self) -> bool:
+        return self._session.closed
+
+    async def get(self, url: str, params: Any = None, headers: Optional[Dict[str, str]] = None, **kwargs) -> ReplayResponse:
+        started = time.monotonic()
+        response = await self._session.get(url, params=params, headers=headers, **kwargs)
+        try:
+            elapsed = time.monotonic() - started
+            body = await response.read()
+            body_elapsed = time.monotonic() - started - elapsed
+        finally:
+            response.release()
+
+        key = request_key('GET', url, params)
+        entry = {
+            'method': key[0],
+            'path': key[1],
+            'params': [list(pair) for pair in key[2]],
+            'status': response.status,
+            'reason': response.reason or '',
+            'headers': {
+                name: response.headers[name]
+                for name in RECORDED_HEADERS if name in response.headers
+            },
+            'body': base64.b64encode(body).decode('ascii'),
+            'elapsed': elapsed,
+            'body_elapsed': body_elapsed
+        }
+        self._cassette.append(entry)
+        self.recorded += 1
+        return ReplayResponse(entry, url)
+
+    async def close(self) -> None:
+        await self._session.close()
+
+
+class ReplaySession:
+    """
+    Serve le GET dalla cassetta, senza rete.
+    Richieste ripetute ricevono le risposte registrate in sequenza (es. un 503
+    seguito dal retry riuscito); esaurite le registrazioni si riusa l'ultima.
+    """
+
+    def __init__(self, cassette: Cassette, delay_factor: float = 0.0):
+        """
+        Args:
+            cassette: Cassetta da riprodurre
+            delay_factor: 0 = massima velocita, 1 = tempi originali
+        """
+        self._entries = cassette.load()
+        self._positions: Dict[CassetteKey, int] = {}
+        self.delay_factor = delay_factor
+        self.closed = False
+        self.replayed = 0
+        self.misses = 0
+
+    async def get(self, url: str, params: Any = None, headers: Optional[Dict[str, str]] = None, **kwargs) -> ReplayResponse:
+        key = request_key('GET', url, params)
+        entries = self._entries.get(key)
+        if not entries:
+            self.misses += 1
+            raise ReplayMissError(f"Richiesta non presente nella cassetta: {key[1]} {list(key[2])}")
+
+        position = self._positions.get(key, 0)
+        entry = entries[min(position, len(entries) - 1)]
+        self._positions[key] = position + 1
+        self.replayed += 1
+
+        if self.delay_factor:
+            await asyncio.sleep(entry.get('elapsed', 0.0) * self.delay_factor)
+        return ReplayResponse(entry, url, self.delay_factor)
+
+    async def close(self) -> None:
+        self.closed = True
@@ -0,0 +1,332 @@
+"""
+Politiche di resilienza per le chiamate EDC.
+Retry con backoff esponenziale, jitter e budget di retry; circuit breaker;
+limite di concorrenza adattivo (AIMD).
+"""
+import asyncio
+import random
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+import aiohttp
+
+
+# Status HTTP considerati transitori (ritentabili)
+RETRYABLE_STATUSES = {408, 429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(Exception):
+    """Sollevata quando il circuit breaker e aperto e la chiamata viene rifiutata."""
+
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    Indica se un errore di una GET idempotente e transitorio.
+    Errori 4xx (tranne 408/429) non vengono ritentati.
+    """
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status in RETRYABLE_STATUSES
+    return isinstance(error, (aiohttp.ClientError, asyncio.TimeoutError))
+
+
+class RetryPolicy:
+    """
+    Retry con backoff esponenziale e full jitter.
+    Il budget limita i retry complessivi: ogni retry consuma un token,
+    ogni successo ne restituisce una frazione (fino al massimo).
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0,
+        budget: float = 20,
+        budget_refill: float = 0.1
+    ):
+        """
+        Inizializza la policy.
+
+        Args:
+            max_retries: Retry massimi per singola richiesta
+            backoff_base: Attesa base in secondi (raddoppia a ogni tentativo)
+            backoff_max: Attesa massima in secondi
+            budget: Token di retry disponibili
+            budget_refill: Token restituiti per ogni richiesta riuscita
+        """
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.budget_max = budget
+        self.budget_refill = budget_refill
+        self._tokens = float(budget)
+        self._stats = {
+            'retries': 0,
+            'retry_budget_exhausted': 0
+        }
+
+    def get_delay(self, attempt: int, error: Optional[BaseException] = None) -> float:
+        """
+        Calcola l'attesa prima del retry (full jitter).
+        Per 429/503 rispetta l'header Retry-After se presente.
+        """
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+        headers = getattr(error, 'headers', None)
+        if headers:
+            retry_after = headers.get('Retry-After')
+            if retry_after and retry_after.isdigit():
+                delay = max(delay, min(float(retry_after), self.backoff_max))
+
+        return delay
+
+    def acquire_retry(self) -> bool:
+        """Consuma un token di retry; False se il budget e esaurito."""
+        if self._tokens < 1:
+            self._stats['retry_budget_exhausted'] += 1
+            return False
+        self._tokens -= 1
+        self._stats['retries'] += 1
+        return True
+
+    def record_success(self) -> None:
+        """Restituisce una frazione di token dopo una richiesta riuscita."""
+        self._tokens = min(self.budget_max, self._tokens + self.budget_refill)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            'retry_budget_tokens': round(self._tokens, 2)
+        }
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker a tre stati (closed, open, half_open).
+    Dopo `failure_threshold` fallimenti consecutivi il circuito si apre e le
+    chiamate falliscono subito per `reset_timeout` secondi; poi una chiamata
+    di prova decide se richiuderlo.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30):
+        """
+        Inizializza il circuit breaker.
+
+        Args:
+            failure_threshold: Fallimenti consecutivi prima dell'apertura
+            reset_timeout: Secondi di apertura prima della chiamata di prova
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._trial_in_progress = False
+        self._trial_id = 0
+        self._stats = {
+            'circuit_opened': 0,
+            'circuit_rejections': 0
+        }
+
+    def before_request(self) -> Optional[int]:
+        """
+        Verifica se la chiamata puo partire.
+
+        Returns:
+            Id della prova se la chiamata e quella di prova del circuito
+            half_open (da passare a release_trial se termina senza esito), altrimenti None
+
+        Raises:
+            CircuitOpenError: se il circuito e aperto
+        """
+        if self.state == self.OPEN:
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                self._stats['circuit_rejections'] += 1
+                raise CircuitOpenError("EDC circuit breaker aperto: chiamata rifiutata")
+            self.state = self.HALF_OPEN
+            self._trial_in_progress = False
+
+        if self.state == self.HALF_OPEN:
+            if self._trial_in_progress:
+                self._stats['circuit_rejections'] += 1
+                raise CircuitOpenError("EDC circuit breaker in prova: chiamata rifiutata")
+            self._trial_in_progress = True
+            self._trial_id += 1
+            return self._trial_id
+
+        return None
+
+    def release_trial(self, trial_id: int) -> None:
+        """
+        Libera la chiamata di prova terminata senza esito (es. annullata o
+        interrotta da una deadline): la chiamata successiva fara da nuova prova.
+        Prove gia concluse o sostituite da una piu recente vengono ignorate.
+        """
+        if self._trial_in_progress and trial_id == self._trial_id:
+            self._trial_in_progress = False
+
+    def record_success(self) -> None:
+        """Registra una chiamata riuscita e richiude il circuito."""
+        self._consecutive_failures = 0
+        self._trial_in_progress = False
+        self.state = self.CLOSED
+
+    def record_failure(self) -> None:
+        """Registra un fallimento transitorio; apre il circuito oltre soglia."""
+        self._consecutive_failures += 1
+        self._trial_in_progress = False
+
+        if self.state == self.HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                self._stats['circuit_opened'] += 1
+            self.state = self.OPEN
+            self._opened_at = time.monotonic()
+
+    def get_statistics(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            'circuit_state': self.state,
+            'circuit_consecutive_failures': self._consecutive_failures
+        }
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Limite di concorrenza adattivo in stile AIMD verso l'istanza EDC condivisa.
+    - Aumento additivo (+1) dopo ogni "giro" di richieste con latenza stabile
+    - Riduzione moltiplicativa su 429/5xx/timeout o p95 in crescita
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 10,
+        decrease_factor: float = 0.5,
+        latency_tolerance: float = 2.0,
+        window_size: int = 100
+    ):
+        """
+        Inizializza il limiter.
+
+        Args:
+            initial_limit: Richieste parallele iniziali
+            min_limit: Limite minimo
+            max_limit: Limite massimo
+            decrease_factor: Fattore di riduzione su sovraccarico
+            latency_tolerance: Rapporto p95/p95 di riferimento oltre cui ridurre
+            window_size: Campioni di latenza considerati per il p95
+        """
+        self.min_limit = min_limit
+        self.max_limit = max(max_limit, min_limit)
+        self.limit = min(max(initial_limit, min_limit), self.max_limit)
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+
+        self._inflight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._latencies: Deque[float] = deque(maxlen=window_size)
+        self._baseline_p95: Optional[float] = None
+        self._round_successes = 0
+        self._last_decrease = 0.0
+        self._stats = {
+            'concurrency_increases': 0,
+            'concurrency_decreases': 0
+        }
+
+    async def acquire(self) -> None:
+        """Attende uno slot libero entro il limite corrente."""
+        while self._inflight >= self.limit:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                # Se lo slot era gia stato assegnato, passalo al prossimo
+                if waiter.done() and not waiter.cancelled():
+                    self._wake_waiters()
+                raise
+        self._inflight += 1
+
+    def release(self, latency: Optional[float] = None, overloaded: bool = False) -> None:
+        """
+        Rilascia uno slot e aggiorna il limite.
+
+        Args:
+            latency: Latenza della richiesta in secondi (se completata)
+            overloaded: True se EDC ha segnalato sovraccarico (429/5xx/timeout)
+        """
+        self._inflight -= 1
+
+        if overloaded:
+            self._decrease()
+        elif latency is not None:
+            self._latencies.append(latency)
+            self._round_successes += 1
+            if self._round_successes >= self.limit:
+                self._round_successes = 0
+                self._evaluate_round()
+
+        self._wake_waiters()
+
+    def _wake_waiters(self) -> None:
+        """Sveglia tanti chiamanti in attesa quanti sono gli slot liberi."""
+        free_slots = self.limit - self._inflight
+        while free_slots > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free_slots -= 1
+
+    def _evaluate_round(self) -> None:
+        """Al termine di un giro confronta il p95 con il riferimento."""
+        p95 = self.get_percentile(95)
+        if p95 is None:
+            return
+
+        if self._baseline_p95 is None or p95 < self._baseline_p95:
+            self._baseline_p95 = p95
+        else:
+            # Il riferimento risale lentamente per adattarsi a EDC piu lento
+            self._baseline_p95 *= 1.01
+
+        if p95 > self._baseline_p95 * self.latency_tolerance:
+            self._decrease()
+        elif self.limit < self.max_limit:
+            self.limit += 1
+            self._stats['concurrency_increases'] += 1
+
+    def _decrease(self) -> None:
+        """Riduzione moltiplicativa, al massimo una volta al secondo."""
+        now = time.monotonic()
+        if now - self._last_decrease < 1.0:
+            return
+        self._last_decrease = now
+        self._round_successes = 0
+
+        new_limit = max(self.min_limit, int(self.limit * self.decrease_factor))
+        if new_limit < self.limit:
+            self.limit = new_limit
+            self._stats['concurrency_decreases'] += 1
+
+    def get_percentile(self, percentile: float) -> Optional[float]:
+        """Percentile delle latenze nella finestra corrente (secondi)."""
+        if not self._latencies:
+            return None
+        ordered = sorted(self._latencies)
+        index = min(len(ordered) - 1, int(len(ordered) * percentile / 100))
+        return ordered[index]
+
+    def get_statistics(self) -> Dict[str, Any]:
+        p95 = self.get_percentile(95)
+        return {
+            **self._stats,
+            'concurrency_limit': self.limit,
+            'concurrency_inflight': self._inflight,
+            'latency_p95_ms': int(p95 * 1000) if p95 is not None else 0
+        }
@@ -0,0 +1,324 @@
+"""
+Snapshot locale delle risorse EDC.
+Una risorsa (per classType) viene scaricata una volta tramite API bulk e salvata
+su SQLite con indici su nome e classType: le ricerche successive sono locali.
+I filtri sul nome usano un indice a n-grammi in memoria costruito per snapshot.
+Scritture e costruzione degli indici girano in thread (asyncio.to_thread) per
+non bloccare l'event loop; l'accesso alla connessione e serializzato da un lock.
+"""
+import asyncio
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+from .name_index import NamePattern, NGramIndex
+
+# Righe inserite per singolo executemany durante il caricamento
+SNAPSHOT_INSERT_CHUNK = 1000
+
+# Parametri per singola query IN (limite SQLite 999)
+SNAPSHOT_SELECT_CHUNK = 500
+
+
+class SnapshotStore:
+    """
+    Store SQLite degli snapshot di risorsa.
+    Ogni caricamento crea un nuovo snapshot_id e scrive a blocchi con commit
+    brevi; lo snapshot diventa visibile solo a caricamento completato, quindi
+    le ricerche durante un refresh continuano a usare lo snapshot precedente.
+    """
+
+    def __init__(self, path: str):
+        """
+        Inizializza lo store.
+
+        Args:
+            path: Percorso del file SQLite
+        """
+        self.path = path
+        self._name_indexes: Dict[int, NGramIndex] = {}
+        self._lock = threading.RLock()
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS snapshot_meta (
+                snapshot_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                resource TEXT NOT NULL,
+                class_filter TEXT NOT NULL,
+                refreshed_at REAL,
+                row_count INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE INDEX IF NOT EXISTS idx_snapshot_meta_resource
+                ON snapshot_meta (resource, class_filter);
+
+            CREATE TABLE IF NOT EXISTS snapshot_assets (
+                snapshot_id INTEGER NOT NULL,
+                seq INTEGER NOT NULL,
+                asset_id TEXT NOT NULL,
+                name TEXT NOT NULL,
+                name_upper TEXT NOT NULL,
+                class_type TEXT NOT NULL,
+                PRIMARY KEY (snapshot_id, seq)
+            );
+            CREATE INDEX IF NOT EXISTS idx_snapshot_assets_name
+                ON snapshot_assets (snapshot_id, name_upper);
+            CREATE INDEX IF NOT EXISTS idx_snapshot_assets_class
+                ON snapshot_assets (class_type, snapshot_id);
+            """
+        )
+        self._conn.commit()
+
+    def get_snapshot_info(self, resource: str, class_filter: str) -> Optional[Dict[str, Any]]:
+        """
+        Restituisce lo snapshot completo piu recente per risorsa e classType.
+
+        Returns:
+            Dict con snapshot_id, refreshed_at, row_count o None se assente
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT snapshot_id, refreshed_at, row_count FROM snapshot_meta "
+                "WHERE resource = ? AND class_filter = ? AND refreshed_at IS NOT NULL "
+                "ORDER BY snapshot_id DESC LIMIT 1",
+                (resource, class_filter)
+            ).fetchone()
+        if row is None:
+            return None
+
+        return {
+            'snapshot_id': row[0],
+            'refreshed_at': row[1],
+            'row_count': row[2]
+        }
+
+    async def load(
+        self,
+        resource: str,
+        class_filter: str,
+        rows: AsyncIterator[Dict[str, Any]]
+    ) -> int:
+        """
+        Carica un nuovo snapshot dalle righe bulk e rimuove i precedenti.
+        I blocchi di righe vengono scritti in un thread; l'indice dei nomi del
+        nuovo snapshot e costruito prima di renderlo visibile.
+
+        Args:
+            resource: Nome della risorsa EDC
+            class_filter: classType richiesto all'API bulk
+            rows: Asset con id, name, classType (es. da EDCClient.iter_bulk_assets)
+
+        Returns:
+            Numero di asset caricati
+        """
+        snapshot_id = await asyncio.to_thread(self._create_snapshot, resource, class_filter)
+        count = 0
+        batch: List[tuple] = []
+
+        try:
+            async for row in rows:
+                name = row.get('name') or ''
+                batch.append((
+                    snapshot_id,
+                    count,
+                    row.get('id') or '',
+                    name,
+                    name.upper(),
+                    row.get('classType') or 'Unknown'
+                ))
+                count += 1
+
+                if len(batch) >= SNAPSHOT_INSERT_CHUNK:
+                    await asyncio.to_thread(self._insert_rows, batch)
+                    batch = []
+
+            if batch:
+                await asyncio.to_thread(self._insert_rows, batch)
+
+            await asyncio.to_thread(self._publish_snapshot, resource, class_filter, snapshot_id, count)
+        except BaseException:
+            # Snapshot incompleto: mai reso visibile, viene rimosso
+            with self._lock:
+                self._delete_snapshot(snapshot_id)
+                self._conn.commit()
+            raise
+
+        return count
+
+    def search(
+        self,
+        snapshot_id: int,
+        name_filter: Optional[str] = None,
+        max_results: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Cerca asset in uno snapshot, nell'ordine restituito dall'API bulk.
+
+        Args:
+            snapshot_id: Snapshot da interrogare (vedi get_snapshot_info)
+            name_filter: Filtro sul nome (case-insensitive, ricerca parziale o
+                con wildcard '*', vedi NamePattern)
+            max_results: Numero massimo di risultati (None = tutti)
+
+        Returns:
+            Lista di asset con id, name, classType
+        """
+        with self._lock:
+            if name_filter:
+                seqs = self.get_name_index(snapshot_id).search(name_filter, max_results)
+                rows = self._select_seqs(snapshot_id, seqs)
+            else:
+                query = (
+                    "SELECT asset_id, name, class_type FROM snapshot_assets "
+                    "WHERE snapshot_id = ? ORDER BY seq"
+                )
+                params: List[Any] = [snapshot_id]
+                if max_results is not None:
+                    query += " LIMIT ?"
+                    params.append(max_results)
+                rows = self._conn.execute(query, params).fetchall()
+
+        return [
+            {'id': asset_id, 'name': name, 'classType': class_type}
+            for asset_id, name, class_type in rows
+        ]
+
+    def get_name_index(self, snapshot_id: int) -> NGramIndex:
+        """
+        Indice a n-grammi dei nomi di uno snapshot, costruito al primo uso
+        (costo proporzionale alla risorsa: dall'event loop usare asyncio.to_thread).
+        L'ID documento coincide con seq (ordine dell'API bulk).
+        """
+        with self._lock:
+            index = self._name_indexes.get(snapshot_id)
+            if index is None:
+                index = NGramIndex()
+                index.extend(
+                    name_upper for (name_upper,) in self._conn.execute(
+                        "SELECT name_upper FROM snapshot_assets WHERE snapshot_id = ? ORDER BY seq",
+                        (snapshot_id,)
+                    )
+                )
+                self._name_indexes[snapshot_id] = index
+            return index
+
+    def has_name_index(self, snapshot_id: int) -> bool:
+        """Indica se l'indice dei nomi dello snapshot e gia in memoria."""
+        return snapshot_id in self._name_indexes
+
+    def match_keywords(self, snapshot_id: int, keywords: Iterable[str]) -> List[Tuple[str, int]]:
+        """
+        Conta gli asset il cui nome contiene ciascuna keyword.
+        Usa solo un indice gia costruito: senza indice restituisce [].
+
+        Returns:
+            Lista (keyword, numero di asset) per le sole keyword presenti
+        """
+        index = self._name_indexes.get(snapshot_id)
+        if index is None:
+            return []
+        matches = []
+        for keyword in keywords:
+            count = index.count(NamePattern(keyword))
+            if count:
+                matches.append((keyword, count))
+        return matches
+
+    def clear(self) -> None:
+        """Rimuove tutti gli snapshot."""
+        with self._lock:
+            self._conn.execute("DELETE FROM snapshot_assets")
+            self._conn.execute("DELETE FROM snapshot_meta")
+            self._conn.commit()
+            self._name_indexes.clear()
+
+    def get_statistics(self) -> Dict[str, int]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(row_count), 0) FROM snapshot_meta "
+                "WHERE refreshed_at IS NOT NULL"
+            ).fetchone()
+        return {
+            'snapshot_count': row[0],
+            'snapshot_assets': row[1]
+        }
+
+    def close(self) -> None:
+        """Chiude la connessione SQLite."""
+        with self._lock:
+            self._conn.close()
+
+    def _create_snapshot(self, resource: str, class_filter: str) -> int:
+        """Registra un nuovo snapshot (non visibile finche refreshed_at e NULL)."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO snapshot_meta (resource, class_filter) VALUES (?, ?)",
+                (resource, class_filter)
+            )
+            self._conn.commit()
+            return cursor.lastrowid
+
+    def _insert_rows(self, rows: List[tuple]) -> None:
+        """
+        Scrive un blocco di righe con un commit breve. Un blocco ancora in
+        scrittura quando il caricamento viene annullato non resuscita lo snapshot rimosso.
+        """
+        with self._lock:
+            if not self._conn.execute(
+                "SELECT 1 FROM snapshot_meta WHERE snapshot_id = ?", (rows[0][0],)
+            ).fetchone():
+                return
+            self._conn.executemany(
+                "INSERT INTO snapshot_assets "
+                "(snapshot_id, seq, asset_id, name, name_upper, class_type) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+
+    def _publish_snapshot(self, resource: str, class_filter: str, snapshot_id: int, count: int) -> None:
+        """Costruisce l'indice dei nomi, rende visibile lo snapshot e rimuove i precedenti."""
+        self.get_name_index(snapshot_id)
+        with self._lock:
+            self._conn.execute(
+                "UPDATE snapshot_meta SET refreshed_at = ?, row_count = ? WHERE snapshot_id = ?",
+                (time.time(), count, snapshot_id)
+            )
+            self._delete_older(resource, class_filter, snapshot_id)
+            self._conn.commit()
+
+    def _delete_older(self, resource: str, class_filter: str, snapshot_id: int) -> None:
+        """Rimuove gli snapshot precedenti (e incompleti) della stessa risorsa/classType."""
+        old_ids = [
+            row[0] for row in self._conn.execute(
+                "SELECT snapshot_id FROM snapshot_meta "
+                "WHERE resource = ? AND class_filter = ? AND snapshot_id < ?",
+                (resource, class_filter, snapshot_id)
+            )
+        ]
+        for old_id in old_ids:
+            self._delete_snapshot(old_id)
+
+    def _select_seqs(self, snapshot_id: int, seqs: List[int]) -> List[tuple]:
+        """Legge le righe con le seq indicate, nello stesso ordine."""
+        rows_by_seq: Dict[int, tuple] = {}
+        for start in range(0, len(seqs), SNAPSHOT_SELECT_CHUNK):
+            chunk = seqs[start:start + SNAPSHOT_SELECT_CHUNK]
+            placeholders = ','.join('?' * len(chunk))
+            for seq, *row in self._conn.execute(
+                "SELECT seq, asset_id, name, class_type FROM snapshot_assets "
+                f"WHERE snapshot_id = ? AND seq IN ({placeholders})",
+                [snapshot_id, *chunk]
+            ):
+                rows_by_seq[seq] = tuple(row)
+        return [rows_by_seq[seq] for seq in seqs if seq in rows_by_seq]
+
+    def _delete_snapshot(self, snapshot_id: int) -> None:
+        self._name_indexes.pop(snapshot_id, None)
+        self._conn.execute("DELETE FROM snapshot_assets WHERE snapshot_id = ?", (snapshot_id,))
+        self._conn.execute("DELETE FROM snapshot_meta WHERE snapshot_id = ?", (snapshot_id,))
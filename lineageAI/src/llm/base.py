@@ -3,7 +3,9 @@ Classe base astratta per i client LLM.
 Definisce l'interfaccia comune per tutti i provider LLM.
 """
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Optional
+from typing import ContextManager, Dict, List, Any, Optional
+
+from ..metrics import LLM_CALL_SECONDS, metrics
 
 
 class BaseLLMClient(ABC):
@@ -160,6 +162,17 @@ class BaseLLMClient(ABC):
         """
         raise NotImplementedError("Subclass must implement _call_llm")
     
+    def _llm_timer(self) -> ContextManager[None]:
+        """
+        Misura la durata di una chiamata LLM per provider e tool MCP corrente.
+        Da usare nei _call_llm dei client specifici.
+        """
+        return metrics.timer(
+            LLM_CALL_SECONDS,
+            provider=self.config.provider.value,
+            tool=metrics.current_tool()
+        )
+    
     def _build_prompt(
         self,
         template: str,
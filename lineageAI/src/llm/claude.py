@@ -41,15 +41,16 @@ class ClaudeClient(BaseLLMClient):
     ) -> str:
         """Chiama Claude API."""
         try:
-            message = self.client.messages.create(
-                model=self.model_name,
-                max_tokens=self.max_tokens,
-                temperature=self.temperature,
-                system=system_message or "Sei un assistente esperto in data governance e lineage.",
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
-            )
+            with self._llm_timer():
+                message = self.client.messages.create(
+                    model=self.model_name,
+                    max_tokens=self.max_tokens,
+                    temperature=self.temperature,
+                    system=system_message or "Sei un assistente esperto in data governance e lineage.",
+                    messages=[
+                        {"role": "user", "content": prompt}
+                    ]
+                )
             return message.content[0].text
         except anthropic.APIConnectionError as e:
             return f"Error calling Claude: Connection error - {e.__class__.__name__}: {str(e)}"
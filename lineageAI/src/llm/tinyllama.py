@@ -45,10 +45,11 @@ class TinyLlamaClient(BaseLLMClient):
             payload["system"] = system_message
         
         try:
-            async with self.session.post(url, json=payload) as response:
-                response.raise_for_status()
-                result = await response.json()
-                return result.get('response', '')
+            with self._llm_timer():
+                async with self.session.post(url, json=payload) as response:
+                    response.raise_for_status()
+                    result = await response.json()
+            return result.get('response', '')
         except Exception as e:
             return f"Error calling TinyLlama: {str(e)}"
     
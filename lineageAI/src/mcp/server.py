@@ -8,6 +8,7 @@ import asyncio
 import logging
 import os
 import sys
+import time
 from typing import List, Optional
 
 from mcp.types import GetPromptResult, Prompt, PromptArgument, PromptMessage, TextContent, Tool
@@ -15,9 +16,13 @@ from mcp.types import GetPromptResult, Prompt, PromptArgument, PromptMessage, Te
 from mcp.server import Server
 
 from ..config.settings import LLMProvider, settings
-from ..edc.lineage import LineageBuilder
-from ..edc.models import TreeNode
+from ..edc.lineage import LineageBuilder, ProgressCallback
+from ..edc.models import LineageProgress, PROGRESS_NODE, PROGRESS_LEVEL
 from ..llm.factory import LLMConfig, LLMFactory
+from ..metrics import metrics
+
+# Intervallo minimo tra due notifiche di progress per singolo asset (s)
+PROGRESS_MIN_INTERVAL = 0.5
 
 
 class EDCMCPServer:
@@ -144,22 +149,23 @@ class EDCMCPServer:
                     ),
                     Tool(
                         name="search_assets",
-                        description="Cerca asset nel catalogo EDC usando API bulk per una risorsa specifica. Filtra i risultati per nome e tipo.",
+                        description="Cerca asset nel catalogo EDC usando API bulk per una risorsa specifica o, senza risorsa, su tutte le risorse configurate in parallelo. Filtra i risultati per nome e tipo.",
                         inputSchema={
                             "type": "object",
                             "properties": {
                                 "resource_name": {
                                     "type": "string",
-                                    "description": "Nome della risorsa EDC (es: DataPlatform, ORAC51, DWHEVO) - OBBLIGATORIO",
+                                    "description": "Nome della risorsa EDC (es: DataPlatform, ORAC51, DWHEVO); vuoto o '*' per la ricerca federata su tutte le risorse",
+                                    "default": "",
                                 },
                                 "name_filter": {
                                     "type": "string",
-                                    "description": "Filtro sul nome dell'asset (case-insensitive, ricerca parziale)",
+                                    "description": "Filtro sul nome dell'asset (case-insensitive, ricerca parziale; wildcard * per prefisso/suffisso, es: IFR_*)",
                                     "default": "",
                                 },
                                 "asset_type": {
                                     "type": "string",
-                                    "description": "Tipo di asset da cercare (Table, View, Column, ViewTable, etc.)",
+                                    "description": "Tipo di asset da cercare (Table, View, Column, ViewColumn, etc.); piu tipi separati da virgola (es: Table,View) vengono cercati in parallelo",
                                     "default": "",
                                 },
                                 "max_results": {
@@ -168,6 +174,25 @@ class EDCMCPServer:
                                     "default": 10,
                                 },
                             },
+                            "required": [],
+                        },
+                    ),
+                    Tool(
+                        name="refresh_resource_snapshot",
+                        description="Riscarica dal catalogo EDC lo snapshot locale usato da search_assets per una risorsa",
+                        inputSchema={
+                            "type": "object",
+                            "properties": {
+                                "resource_name": {
+                                    "type": "string",
+                                    "description": "Nome della risorsa EDC (es: DataPlatform, ORAC51, DWHEVO) - OBBLIGATORIO",
+                                },
+                                "asset_type": {
+                                    "type": "string",
+                                    "description": "Tipo di asset (Table, View, Column, ViewColumn o classType completo)",
+                                    "default": "",
+                                },
+                            },
                             "required": ["resource_name"],
                         },
                     ),
@@ -184,6 +209,11 @@ class EDCMCPServer:
                                     "default": "upstream",
                                 },
                                 "depth": {"type": "integer", "description": "ProfonditÃ  massima", "default": 3},
+                                "continue_build": {
+                                    "type": "boolean",
+                                    "description": "Riprende dalla frontiera la costruzione interrotta per lo stesso asset e direction",
+                                    "default": False,
+                                },
                             },
                             "required": ["asset_id"],
                         },
@@ -221,6 +251,32 @@ class EDCMCPServer:
                             "required": ["asset_id", "change_type", "change_description"],
                         },
                     ),
+                    Tool(
+                        name="query_lineage_store",
+                        description=(
+                            "Interroga il grafo di lineage persistente (query ricorsiva locale): "
+                            "asset a valle o a monte entro N hop, filtrabili per classType. "
+                            "Ricarica da EDC solo i nodi sconosciuti o scaduti"
+                        ),
+                        inputSchema={
+                            "type": "object",
+                            "properties": {
+                                "asset_id": {"type": "string", "description": "Asset di partenza"},
+                                "direction": {
+                                    "type": "string",
+                                    "enum": ["upstream", "downstream"],
+                                    "default": "downstream",
+                                },
+                                "max_depth": {"type": "integer", "description": "Hop massimi", "default": 6},
+                                "class_type": {
+                                    "type": "string",
+                                    "description": "Filtro sul classType (sottostringa, es. 'Report', 'Column')",
+                                },
+                                "max_results": {"type": "integer", "description": "Asset massimi restituiti", "default": 50},
+                            },
+                            "required": ["asset_id"],
+                        },
+                    ),
                     Tool(
                         name="generate_change_checklist",
                         description="Genera checklist operativa per una modifica",
@@ -441,31 +497,36 @@ class EDCMCPServer:
                         self.lineage_builder = LineageBuilder()
                         print("[MCP] >> [OK] LineageBuilder pronto", file=sys.stderr)
 
-                    # Route to appropriate handler
-                    if name == "get_asset_details":
-                        return await self._handle_get_asset_details(**arguments)
-                    elif name == "search_assets":
-                        return await self._handle_search_assets(**arguments)
-                    elif name == "get_lineage_tree":
-                        return await self._handle_get_lineage_tree(**arguments)
-                    elif name == "get_immediate_lineage":
-                        return await self._handle_get_immediate_lineage(**arguments)
-                    elif name == "analyze_change_impact":
-                        return await self._handle_analyze_change_impact(**arguments)
-                    elif name == "generate_change_checklist":
-                        return await self._handle_generate_change_checklist(**arguments)
-                    elif name == "enhance_asset_documentation":
-                        return await self._handle_enhance_asset_documentation(**arguments)
-                    elif name == "switch_llm_provider":
-                        return await self._handle_switch_llm_provider(**arguments)
-                    elif name == "get_llm_status":
-                        return await self._handle_get_llm_status()
-                    elif name == "get_system_statistics":
-                        return await self._handle_get_system_statistics()
-                    else:
-                        error_msg = f"Tool sconosciuto: {name}"
-                        print(f"[MCP] >> [ERROR] {error_msg}", file=sys.stderr)
-                        return [TextContent(type="text", text=error_msg)]
+                    # Route to appropriate handler (durata e chiamate LLM misurate per tool)
+                    with metrics.tool_scope(name):
+                        if name == "get_asset_details":
+                            return await self._handle_get_asset_details(**arguments)
+                        elif name == "search_assets":
+                            return await self._handle_search_assets(**arguments)
+                        elif name == "refresh_resource_snapshot":
+                            return await self._handle_refresh_resource_snapshot(**arguments)
+                        elif name == "get_lineage_tree":
+                            return await self._handle_get_lineage_tree(**arguments)
+                        elif name == "get_immediate_lineage":
+                            return await self._handle_get_immediate_lineage(**arguments)
+                        elif name == "analyze_change_impact":
+                            return await self._handle_analyze_change_impact(**arguments)
+                        elif name == "query_lineage_store":
+                            return await self._handle_query_lineage_store(**arguments)
+                        elif name == "generate_change_checklist":
+                            return await self._handle_generate_change_checklist(**arguments)
+                        elif name == "enhance_asset_documentation":
+                            return await self._handle_enhance_asset_documentation(**arguments)
+                        elif name == "switch_llm_provider":
+                            return await self._handle_switch_llm_provider(**arguments)
+                        elif name == "get_llm_status":
+                            return await self._handle_get_llm_status()
+                        elif name == "get_system_statistics":
+                            return await self._handle_get_system_statistics()
+                        else:
+                            error_msg = f"Tool sconosciuto: {name}"
+                            print(f"[MCP] >> [ERROR] {error_msg}", file=sys.stderr)
+                            return [TextContent(type="text", text=error_msg)]
 
                 except Exception as e:
                     error_msg = f"Errore esecuzione tool '{name}': {str(e)}"
@@ -485,12 +546,72 @@ class EDCMCPServer:
             traceback.print_exc(file=sys.stderr)
             raise
 
+    def _create_progress_reporter(self, operation: str) -> Optional[ProgressCallback]:
+        """
+        Inoltra l'avanzamento di una costruzione di lineage al client MCP:
+        notifiche di progress (se la richiesta ha un progressToken, al massimo
+        una ogni PROGRESS_MIN_INTERVAL secondi per gli asset e sempre crescenti,
+        come richiesto dal protocollo) e log a ogni livello.
+        Restituisce None fuori da una richiesta MCP (es. chiamate dirette ai handler).
+        """
+        try:
+            ctx = self.server.request_context
+        except LookupError:
+            return None
+
+        session = ctx.session
+        progress_token = getattr(ctx.meta, "progressToken", None) if ctx.meta else None
+        last_sent = 0.0
+        last_progress = 0
+
+        async def report(progress: LineageProgress) -> None:
+            nonlocal last_sent, last_progress
+            try:
+                if progress.event == PROGRESS_NODE:
+                    now = time.monotonic()
+                    if progress_token is None or now - last_sent < PROGRESS_MIN_INTERVAL:
+                        return
+                    last_sent = now
+                    last_progress = progress.fetched
+                    await session.send_progress_notification(
+                        progress_token,
+                        progress.fetched,
+                        message=f"{operation}: livello {progress.level}, {progress.fetched} asset ({progress.name})",
+                        related_request_id=ctx.request_id,
+                    )
+                    return
+
+                if progress.event == PROGRESS_LEVEL:
+                    message = (
+                        f"{operation}: livello {progress.level} completato, "
+                        f"{progress.fetched} asset recuperati, {progress.pending} in coda"
+                    )
+                else:
+                    message = f"{operation}: completato, {progress.fetched} asset recuperati"
+                    if progress.truncated:
+                        message += f" (interrotto: {progress.truncated}, {progress.pending} non espansi)"
+
+                if progress_token is not None and progress.fetched > last_progress:
+                    last_sent = time.monotonic()
+                    last_progress = progress.fetched
+                    await session.send_progress_notification(
+                        progress_token, progress.fetched, message=message, related_request_id=ctx.request_id
+                    )
+                await session.send_log_message(
+                    level="info", data=message, logger="edc-lineage", related_request_id=ctx.request_id
+                )
+            except Exception as e:
+                # Le notifiche sono best-effort: non devono interrompere la costruzione
+                print(f"[MCP] >> [WARN] Notifica avanzamento non inviata: {e}", file=sys.stderr)
+
+        return report
+
     # ====================================
     # HANDLER METHODS
     # ====================================
 
     async def _handle_search_assets(
-        self, resource_name: str, name_filter: str = "", asset_type: str = "", max_results: int = 10
+        self, resource_name: str = "", name_filter: str = "", asset_type: str = "", max_results: int = 10
     ) -> List[TextContent]:
         """Search assets using EDC bulk API."""
         print(
@@ -499,15 +620,28 @@ class EDCMCPServer:
         )
 
         try:
-            # Usa API bulk
-            results = await self.lineage_builder.edc_client.bulk_search_assets(
-                resource_name=resource_name,
-                name_filter=name_filter if name_filter else None,
-                asset_type_filter=asset_type if asset_type else None,
-            )
-
-            # Limita risultati
-            results = results[:max_results]
+            federated = resource_name in ("", "*")
+            if federated:
+                # Ricerca federata: tutte le risorse configurate in parallelo
+                resources = settings.edc_federated_resources_list
+                resource_name = ", ".join(resources)
+                results = [
+                    asset
+                    async for asset in self.lineage_builder.edc_client.iter_federated_assets(
+                        name_filter=name_filter if name_filter else None,
+                        asset_type_filter=asset_type if asset_type else None,
+                        max_results=max_results,
+                        resources=resources,
+                    )
+                ]
+            else:
+                # Snapshot locale della risorsa (al primo uso caricato in background, intanto API bulk)
+                results = await self.lineage_builder.edc_client.search_resource_assets(
+                    resource_name=resource_name,
+                    name_filter=name_filter if name_filter else None,
+                    asset_type_filter=asset_type if asset_type else None,
+                    max_results=max_results,
+                )
 
             if not results:
                 msg = f"Nessun asset trovato nella risorsa '{resource_name}'"
@@ -527,6 +661,8 @@ class EDCMCPServer:
 
             for i, asset in enumerate(results, 1):
                 result_text += f"{i}. {asset.get('name', 'N/A')}\n"
+                if federated:
+                    result_text += f"   Resource: {asset.get('resource', 'N/A')}\n"
                 result_text += f"   Type: {asset.get('classType', 'N/A')}\n"
                 result_text += f"   ID: {asset.get('id', 'N/A')}\n\n"
 
@@ -541,6 +677,33 @@ class EDCMCPServer:
             traceback.print_exc(file=sys.stderr)
             return [TextContent(type="text", text=error_msg)]
 
+    async def _handle_refresh_resource_snapshot(self, resource_name: str, asset_type: str = "") -> List[TextContent]:
+        """Refresh esplicito dello snapshot locale di una risorsa."""
+        print(
+            f"[MCP] >> Executing refresh_resource_snapshot: resource={resource_name}, type={asset_type}",
+            file=sys.stderr,
+        )
+
+        try:
+            count = await self.lineage_builder.edc_client.refresh_snapshot(
+                resource_name, asset_type if asset_type else None
+            )
+
+            result_text = f"Snapshot della risorsa '{resource_name}' aggiornato: {count} asset"
+            if asset_type:
+                result_text += f" di tipo '{asset_type}'"
+
+            print(f"[MCP] >> refresh_resource_snapshot completed: {count} assets", file=sys.stderr)
+            return [TextContent(type="text", text=result_text)]
+
+        except Exception as e:
+            error_msg = f"Errore refresh snapshot: {str(e)}"
+            print(f"[MCP] >> [ERROR] {error_msg}", file=sys.stderr)
+            import traceback
+
+            traceback.print_exc(file=sys.stderr)
+            return [TextContent(type="text", text=error_msg)]
+
     async def _handle_get_asset_details(self, asset_id: str) -> List[TextContent]:
         """Get asset details with AI enhancement."""
         print(f"[MCP] >> Executing get_asset_details for: {asset_id}", file=sys.stderr)
@@ -579,30 +742,26 @@ class EDCMCPServer:
             return [TextContent(type="text", text=error_msg)]
 
     async def _handle_get_lineage_tree(
-        self, asset_id: str, direction: str = "upstream", depth: int = 3
+        self, asset_id: str, direction: str = "upstream", depth: int = 3, continue_build: bool = False
     ) -> List[TextContent]:
         """Build complete lineage tree with AI analysis."""
         print(f"[MCP] >> Executing get_lineage_tree: {asset_id}, direction={direction}, depth={depth}", file=sys.stderr)
 
         try:
-            import time
-
             start_time = time.time()
 
-            if direction == "upstream":
-                root_node = await self.lineage_builder.build_tree(
-                    node_id=asset_id, code="001", depth=0, max_depth=depth
-                )
-            elif direction == "downstream":
-                immediate_lineage = await self.lineage_builder.get_immediate_lineage(asset_id, "downstream")
-                root_node = TreeNode(asset_id, "001")
-                for i, link in enumerate(immediate_lineage, 1):
-                    child_node = TreeNode(link["asset_id"], f"001{i:03d}")
-                    root_node.children.append(child_node)
-            else:
-                root_node = await self.lineage_builder.build_tree(
-                    node_id=asset_id, code="001", depth=0, max_depth=depth
-                )
+            if direction not in ("upstream", "downstream", "both"):
+                direction = "upstream"
+
+            root_node = await self.lineage_builder.build_tree(
+                node_id=asset_id,
+                code="001",
+                depth=0,
+                max_depth=depth,
+                direction=direction,
+                resume=continue_build,
+                on_progress=self._create_progress_reporter("Lineage"),
+            )
 
             build_time = time.time() - start_time
 
@@ -614,6 +773,27 @@ class EDCMCPServer:
             result_text += "Statistiche:\n"
             result_text += f"- Nodi totali: {stats['total_nodes']}\n"
             result_text += f"- Profondita max: {stats['max_depth']}\n"
+            if direction == "both":
+                upstream_count = sum(
+                    1 for child in root_node.children if child.metadata.get("direction") == "upstream"
+                )
+                result_text += f"- Rami upstream: {upstream_count}\n"
+                result_text += f"- Rami downstream: {len(root_node.children) - upstream_count}\n"
+            if continue_build and not root_node.metadata.get("resumed"):
+                result_text += "- Nessuna costruzione interrotta da riprendere: costruito da zero\n"
+            if root_node.metadata.get("truncated"):
+                frontier = root_node.metadata.get("frontier", [])
+                limit = "deadline" if root_node.metadata["truncated"] == "deadline" else "budget di nodi"
+                result_text += f"- RISULTATO PARZIALE: {limit} raggiunto, {len(frontier)} asset non espansi\n"
+                for frontier_id in frontier[:10]:
+                    result_text += f"    * {frontier_id}\n"
+                if len(frontier) > 10:
+                    result_text += f"    ... e altri {len(frontier) - 10}\n"
+                if frontier:
+                    result_text += (
+                        "  Richiama get_lineage_tree con continue_build=true "
+                        "(stessi asset_id e direction) per proseguire\n"
+                    )
             result_text += f"- Tempo costruzione: {build_time:.2f}s\n\n"
 
             print(f"[MCP] >> get_lineage_tree completed: {stats['total_nodes']} nodes", file=sys.stderr)
@@ -662,6 +842,50 @@ class EDCMCPServer:
             traceback.print_exc(file=sys.stderr)
             return [TextContent(type="text", text=error_msg)]
 
+    async def _handle_query_lineage_store(
+        self,
+        asset_id: str,
+        direction: str = "downstream",
+        max_depth: int = 6,
+        class_type: Optional[str] = None,
+        max_results: int = 50,
+    ) -> List[TextContent]:
+        """Query the persistent lineage graph store."""
+        print(f"[MCP] >> Executing query_lineage_store: {asset_id}, direction={direction}", file=sys.stderr)
+
+        try:
+            result = await self.lineage_builder.query_lineage_store(
+                asset_id, direction, max_depth, class_filter=class_type, max_results=max_results
+            )
+            assets = result["assets"]
+
+            filter_text = f", classType ~ '{class_type}'" if class_type else ""
+            result_text = f"Lineage {result['direction']} di {asset_id} (max {max_depth} hop{filter_text}):\n\n"
+
+            if not assets:
+                result_text += "Nessun asset trovato\n"
+            for asset in assets:
+                result_text += f"[{asset['hops']}] {asset['name'] or asset['asset_id']} ({asset['classType']})\n"
+                result_text += f"    ID: {asset['asset_id']}\n"
+
+            result_text += f"\nAsset trovati: {len(assets)}"
+            if max_results and len(assets) >= max_results:
+                result_text += f" (limite {max_results} raggiunto)"
+            result_text += f"\nRicaricati da EDC: {result['refreshed']} (fonte: {result['source']})\n"
+            if not result["complete"]:
+                result_text += "Attenzione: risultato parziale, alcuni nodi non sono stati ricaricati da EDC\n"
+
+            print(f"[MCP] >> query_lineage_store completed: {len(assets)} assets", file=sys.stderr)
+            return [TextContent(type="text", text=result_text)]
+
+        except Exception as e:
+            error_msg = f"Errore query store lineage: {str(e)}"
+            print(f"[MCP] >> [ERROR] {error_msg}", file=sys.stderr)
+            import traceback
+
+            traceback.print_exc(file=sys.stderr)
+            return [TextContent(type="text", text=error_msg)]
+
     async def _handle_analyze_change_impact(
         self, asset_id: str, change_type: str, change_description: str, max_depth: int = 5
     ) -> List[TextContent]:
@@ -669,7 +893,9 @@ class EDCMCPServer:
         print(f"[MCP] >> Executing analyze_change_impact: {asset_id}, type={change_type}", file=sys.stderr)
 
         try:
-            affected_lineage = await self.lineage_builder.get_immediate_lineage(asset_id, "downstream")
+            affected_lineage, impact_graph = await self.lineage_builder.build_downstream_impact(
+                asset_id, max_depth, on_progress=self._create_progress_reporter("Impatto downstream")
+            )
 
             change_details = {"description": change_description, "type": change_type, "asset_id": asset_id}
 
@@ -684,7 +910,15 @@ class EDCMCPServer:
             result_text += f"Modifica: {change_type}\n"
             result_text += f"Descrizione: {change_description}\n\n"
             result_text += f"Livello Rischio: {impact_analysis.get('risk_level', 'UNKNOWN')}\n"
-            result_text += f"Asset Impattati: {len(affected_lineage)}\n\n"
+            result_text += f"Asset Impattati: {len(affected_lineage)}"
+            direct_count = sum(1 for asset in affected_lineage if asset["depth"] == 1)
+            result_text += f" ({direct_count} diretti, fino a {max_depth} livelli)\n"
+            if impact_graph.truncated:
+                result_text += (
+                    f"Attenzione: crawl downstream parziale ({impact_graph.truncated}), "
+                    f"{len(impact_graph.frontier)} asset non espansi\n"
+                )
+            result_text += "\n"
 
             if impact_analysis.get("business_impact"):
                 result_text += f"Impatto Business:\n{impact_analysis['business_impact']}\n\n"
@@ -714,7 +948,9 @@ class EDCMCPServer:
         print(f"[MCP] >> Executing generate_change_checklist: {asset_id}", file=sys.stderr)
 
         try:
-            affected_lineage = await self.lineage_builder.get_immediate_lineage(asset_id, "downstream")
+            affected_lineage = await self.lineage_builder.get_downstream_impact(
+                asset_id, on_progress=self._create_progress_reporter("Checklist modifica")
+            )
 
             change_details = {"description": change_description, "type": change_type, "asset_id": asset_id}
 
@@ -903,13 +1139,51 @@ class EDCMCPServer:
                 stats_text += "Statistiche EDC:\n"
                 stats_text += f"  - Total API calls: {edc_stats['total_requests']}\n"
                 stats_text += f"  - Cache hits: {edc_stats['cache_hits']}\n"
+                stats_text += f"  - Cache misses: {edc_stats['cache_misses']}\n"
+                stats_text += f"  - Cache entries: {edc_stats['cache_entries']}\n"
+                stats_text += f"  - Cache evictions: {edc_stats['cache_evictions']}\n"
+                stats_text += f"  - Cache expirations: {edc_stats['cache_expirations']}\n"
+                stats_text += f"  - Cache negativa (vuoti/404): {edc_stats['negative_cache_hits']} hit, {edc_stats['negative_cache_stores']} inseriti\n"
+                stats_text += f"  - Richieste accorpate (in-flight): {edc_stats['coalesced_requests']}\n"
+                stats_text += f"  - Fetch traversal (payload minimo): {edc_stats['traversal_fetches']}\n"
+                stats_text += f"  - Ricerche su snapshot: {edc_stats['snapshot_searches']} (refresh: {edc_stats['snapshot_refreshes']})\n"
+                stats_text += f"  - Ricerche federate: {edc_stats['federated_searches']} (risorse in errore: {edc_stats['federated_errors']})\n"
+                stats_text += f"  - Retry eseguiti: {edc_stats['retries']}\n"
+                stats_text += f"  - Retry budget esaurito: {edc_stats['retry_budget_exhausted']}\n"
+                stats_text += f"  - Circuit breaker: {edc_stats['circuit_state']} (aperto {edc_stats['circuit_opened']} volte)\n"
+                stats_text += f"  - Concorrenza EDC adattiva: {edc_stats['concurrency_limit']} (p95 {edc_stats['latency_p95_ms']}ms)\n"
                 stats_text += f"  - API errors: {edc_stats['api_errors']}\n"
                 stats_text += f"  - Nodi creati: {edc_stats['nodes_created']}\n"
                 stats_text += f"  - Cicli prevenuti: {edc_stats['cycles_prevented']}\n"
+                stats_text += f"  - Costruzioni interrotte (budget/deadline): {edc_stats['builds_truncated']}\n"
+                if "graph_store_nodes" in edc_stats:
+                    stats_text += (
+                        f"  - Store grafo: {edc_stats['graph_store_nodes']} nodi "
+                        f"({edc_stats['graph_store_fetched_nodes']} recuperati), {edc_stats['graph_store_edges']} archi, "
+                        f"{edc_stats['graph_store_queries']} query ({edc_stats['graph_store_refreshes']} nodi ricaricati)\n"
+                    )
+
+            latency_stats = metrics.get_statistics()
+            if latency_stats:
+                stats_text += "\nLatenze (p50/p95/p99):\n"
+                for metric_name, series in latency_stats.items():
+                    is_bytes = metric_name.endswith("_bytes")
+                    for entry in series:
+                        labels = ",".join(f"{k}={v}" for k, v in entry["labels"].items())
+                        values = "/".join(
+                            f"{entry[p]:.0f}" if is_bytes else f"{entry[p] * 1000:.1f}"
+                            for p in ("p50", "p95", "p99")
+                        )
+                        unit = "B" if is_bytes else "ms"
+                        stats_text += f"  - {metric_name}{{{labels}}}: {values} {unit} (n={entry['count']})\n"
 
             stats_text += "\nConfigurazione:\n"
             stats_text += f"  - Max tree depth: {settings.lineage_max_depth}\n"
+            stats_text += f"  - Budget nodi per costruzione: {settings.edc_max_total_nodes}\n"
+            stats_text += f"  - Deadline costruzione: {settings.edc_build_deadline_seconds}s\n"
             stats_text += f"  - Request timeout: {settings.request_timeout}s\n"
+            stats_text += f"  - Cache max entries: {settings.edc_cache_max_entries}\n"
+            stats_text += f"  - Cache TTL: {settings.edc_cache_ttl_seconds}s\n"
 
             print("[MCP] >> get_system_statistics completed", file=sys.stderr)
             return [TextContent(type="text", text=stats_text)]
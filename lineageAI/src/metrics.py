@@ -0,0 +1,201 @@
+"""
+Metriche di performance del sistema EDC-MCP-LLM.
+Istogrammi a bucket fissi (stile Prometheus) per latenza delle richieste EDC,
+byte delle risposte, tempi di parsing JSON/CSV e durata delle chiamate LLM per
+tool MCP. I percentili sono stimati per interpolazione lineare nei bucket,
+quindi la memoria resta costante qualunque sia il numero di osservazioni.
+"""
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Bucket in secondi (da 5ms a 2 minuti)
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0
+)
+
+# Bucket per il parsing (da 0.1ms)
+PARSE_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025) + LATENCY_BUCKETS
+
+# Bucket in byte (da 256B a 64MB, fattore 4)
+BYTES_BUCKETS = tuple(float(256 * 4 ** i) for i in range(10))
+
+DEFAULT_PERCENTILES = (50, 95, 99)
+
+# Nomi delle metriche
+EDC_REQUEST_SECONDS = 'edc_request_duration_seconds'
+EDC_RESPONSE_BYTES = 'edc_response_bytes'
+EDC_PARSE_SECONDS = 'edc_parse_duration_seconds'
+LLM_CALL_SECONDS = 'llm_call_duration_seconds'
+TOOL_CALL_SECONDS = 'tool_call_duration_seconds'
+
+# Tool MCP (o endpoint API) in esecuzione nel task corrente
+_current_tool: ContextVar[str] = ContextVar('metrics_current_tool', default='none')
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Istogramma cumulativo a bucket fissi con conteggio e somma."""
+
+    __slots__ = ('buckets', 'counts', 'count', 'sum', 'max')
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        # Ultimo contatore = bucket +Inf
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def percentile(self, percentile: float) -> Optional[float]:
+        """
+        Stima il percentile interpolando nel bucket che lo contiene,
+        senza superare il massimo osservato.
+        """
+        if not self.count:
+            return None
+
+        rank = percentile / 100 * self.count
+        cumulative = 0
+        for i, bucket_count in enumerate(self.counts):
+            if bucket_count and cumulative + bucket_count >= rank:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.max
+                estimate = lower + (upper - lower) * (rank - cumulative) / bucket_count
+                return min(estimate, self.max)
+            cumulative += bucket_count
+
+        return self.max
+
+
+class MetricsRegistry:
+    """
+    Registro degli istogrammi per nome e label.
+    Le metriche vanno registrate con register_histogram prima dell'uso.
+    """
+
+    def __init__(self):
+        self._histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+        self._buckets: Dict[str, Tuple[float, ...]] = {}
+        self._help: Dict[str, str] = {}
+
+    def register_histogram(
+        self,
+        name: str,
+        help_text: str,
+        buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> None:
+        self._histograms.setdefault(name, {})
+        self._buckets[name] = tuple(buckets)
+        self._help[name] = help_text
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        """Registra un'osservazione per la metrica e le label indicate."""
+        series = self._histograms[name]
+        key: LabelKey = tuple(sorted((k, str(v)) for k, v in labels.items()))
+        histogram = series.get(key)
+        if histogram is None:
+            histogram = series[key] = Histogram(self._buckets[name])
+        histogram.observe(value)
+
+    @contextmanager
+    def timer(self, name: str, **labels: str) -> Iterator[None]:
+        """Misura la durata del blocco (anche se solleva eccezioni)."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    @contextmanager
+    def tool_scope(self, tool: str) -> Iterator[None]:
+        """
+        Esegue il blocco come tool corrente: ne misura la durata e assegna
+        la label tool alle chiamate LLM fatte al suo interno.
+        """
+        token = _current_tool.set(tool)
+        try:
+            with self.timer(TOOL_CALL_SECONDS, tool=tool):
+                yield
+        finally:
+            _current_tool.reset(token)
+
+    @staticmethod
+    def current_tool() -> str:
+        return _current_tool.get()
+
+    def get_statistics(
+        self,
+        percentiles: Sequence[float] = DEFAULT_PERCENTILES
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Riepilogo per metrica: una voce per combinazione di label con
+        count, sum e percentili (es. p50, p95, p99).
+        """
+        summary: Dict[str, List[Dict[str, Any]]] = {}
+        for name, series in self._histograms.items():
+            entries = []
+            for key, histogram in sorted(series.items()):
+                entry: Dict[str, Any] = {
+                    'labels': dict(key),
+                    'count': histogram.count,
+                    'sum': histogram.sum,
+                    'max': histogram.max
+                }
+                for percentile in percentiles:
+                    entry[f'p{percentile:g}'] = histogram.percentile(percentile)
+                entries.append(entry)
+            if entries:
+                summary[name] = entries
+        return summary
+
+    def render_prometheus(self) -> str:
+        """Esporta gli istogrammi nel formato testuale Prometheus (0.0.4)."""
+        lines: List[str] = []
+        for name, series in self._histograms.items():
+            lines.append(f"# HELP {name} {self._help[name]}")
+            lines.append(f"# TYPE {name} histogram")
+            for key, histogram in sorted(series.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self._buckets[name], histogram.counts):
+                    cumulative += bucket_count
+                    lines.append(f"{name}_bucket{_format_labels(key, le=f'{bound:g}')} {cumulative}")
+                lines.append(f"{name}_bucket{_format_labels(key, le='+Inf')} {histogram.count}")
+                lines.append(f"{name}_sum{_format_labels(key)} {histogram.sum:g}")
+                lines.append(f"{name}_count{_format_labels(key)} {histogram.count}")
+        return '\n'.join(lines) + '\n'
+
+    def reset(self) -> None:
+        """Azzera tutte le osservazioni (le metriche restano registrate)."""
+        for series in self._histograms.values():
+            series.clear()
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(key: LabelKey, **extra: str) -> str:
+    pairs = list(key) + list(extra.items())
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape_label_value(v)}"' for k, v in pairs) + '}'
+
+
+# Registro condiviso del processo
+metrics = MetricsRegistry()
+metrics.register_histogram(EDC_REQUEST_SECONDS, "Latenza richieste EDC fino agli header (s)")
+metrics.register_histogram(EDC_RESPONSE_BYTES, "Dimensione risposte EDC (byte)", BYTES_BUCKETS)
+metrics.register_histogram(EDC_PARSE_SECONDS, "Tempo di parsing risposte EDC per formato (s)", PARSE_BUCKETS)
+metrics.register_histogram(LLM_CALL_SECONDS, "Durata chiamate LLM per provider e tool (s)")
+metrics.register_histogram(TOOL_CALL_SECONDS, "Durata esecuzione tool MCP / endpoint API (s)")
@@ -0,0 +1,69 @@
+"""
+Fixture comuni per i test offline (pytest), eseguibili senza un EDC reale:
+settings isolati dai file in .cache e server EDC finto di benchmarks/ su localhost.
+Gli altri script in test/ restano test manuali contro l'EDC configurato nel .env.
+"""
+import sys
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'benchmarks'))
+
+import pytest
+
+from src.config.settings import settings
+
+# Script manuali contro l'EDC reale (python test/<script>.py), esclusi da pytest
+collect_ignore = [
+    'test_api_raw_response.py',
+    'test_complete_integration.py',
+    'test_edc_llm_integration.py',
+    'test_exact_bulk.py',
+    'test_llm_simple.py',
+    'test_mcp_integration.py',
+    'test_mcp_stdio.py',
+    'test_search_flow.py',
+    'test_smart_bulk.py',
+    'test_smart_search.py',
+    'test_url_construction.py'
+]
+
+
+@pytest.fixture
+def offline_settings(monkeypatch, tmp_path):
+    """Cache in memoria, niente snapshot ne store del grafo; file SQLite solo in tmp_path."""
+    monkeypatch.setattr(settings, 'edc_cache_backend', 'memory')
+    monkeypatch.setattr(settings, 'edc_cache_path', str(tmp_path / 'edc_assets.sqlite'))
+    monkeypatch.setattr(settings, 'edc_snapshot_enabled', False)
+    monkeypatch.setattr(settings, 'edc_snapshot_path', str(tmp_path / 'edc_snapshots.sqlite'))
+    monkeypatch.setattr(settings, 'edc_graph_store_enabled', False)
+    monkeypatch.setattr(settings, 'edc_graph_store_path', str(tmp_path / 'edc_lineage_graph.sqlite'))
+    monkeypatch.setattr(settings, 'edc_http_mode', 'live')
+    return settings
+
+
+@pytest.fixture
+def fake_edc(offline_settings, monkeypatch):
+    """
+    Factory di server EDC finti: `async with fake_edc(catalog) as server:`
+    avvia il server su una porta libera e vi punta edc_base_url.
+    """
+    from fake_edc_server import FakeEDCServer
+    from synthetic_catalog import CatalogSpec, SyntheticCatalog
+
+    @asynccontextmanager
+    async def start(catalog=None, **server_kwargs):
+        server = FakeEDCServer(
+            catalog or SyntheticCatalog(CatalogSpec(assets=300, depth=4)),
+            **server_kwargs
+        )
+        base_url = await server.start('127.0.0.1', 0)
+        monkeypatch.setattr(settings, 'edc_base_url', base_url)
+        try:
+            yield server
+        finally:
+            await server.stop()
+
+    return start
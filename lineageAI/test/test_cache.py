@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Test offline dei backend di cache (src/edc/cache.py).
+Uso: python -m pytest -q test/test_cache.py
+"""
+import sqlite3
+import time
+
+import pytest
+
+from src.edc.cache import MemoryCache, SQLiteCache
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def cache(request, tmp_path):
+    if request.param == 'memory':
+        yield MemoryCache(ttl=3600)
+    else:
+        backend = SQLiteCache(str(tmp_path / 'cache.sqlite'), namespace='test', ttl=3600)
+        yield backend
+        backend.close()
+
+
+def test_uncounted_probes_and_single_lookup(cache):
+    cache.set('a', {'name': 'A'})
+
+    assert cache.get('b', count=False) is None
+    assert cache.get('a', count=False) == {'name': 'A'}
+    stats = cache.get_statistics()
+    assert stats['cache_hits'] == stats['cache_misses'] == 0
+
+    cache.record_lookup(True)
+    cache.get('b')
+    stats = cache.get_statistics()
+    assert (stats['cache_hits'], stats['cache_misses']) == (1, 1)
+
+
+def test_entry_ttl_expires_before_default_ttl(cache):
+    cache.set('missing:x', {'name': 'x'}, ttl=0.05)
+    cache.set('y', {'name': 'y'})
+
+    assert cache.get('missing:x') is not None
+    time.sleep(0.1)
+
+    assert cache.get('missing:x') is None
+    assert cache.get('y') == {'name': 'y'}
+    assert cache.get_statistics()['cache_expirations'] == 1
+
+
+def test_sqlite_entry_ttl_survives_reopen(tmp_path):
+    path = str(tmp_path / 'cache.sqlite')
+    cache = SQLiteCache(path, namespace='test', ttl=3600)
+    cache.set('missing:x', {'name': 'x'}, ttl=0.05)
+    cache.set('y', {'name': 'y'})
+    cache.close()
+
+    time.sleep(0.1)
+    reopened = SQLiteCache(path, namespace='test', ttl=3600)
+    try:
+        assert reopened.get('missing:x') is None
+        assert reopened.get('y') == {'name': 'y'}
+        assert not reopened.is_stale('y')
+    finally:
+        reopened.close()
+
+
+def test_sqlite_migrates_files_without_expiry(tmp_path):
+    path = str(tmp_path / 'old.sqlite')
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE asset_cache (asset_id TEXT NOT NULL, namespace TEXT NOT NULL, "
+        "fetched_at REAL NOT NULL, payload TEXT NOT NULL, PRIMARY KEY (asset_id, namespace))"
+    )
+    conn.execute(
+        "INSERT INTO asset_cache VALUES ('y', 'test', ?, '{\"name\": \"y\"}')", (time.time(),)
+    )
+    conn.commit()
+    conn.close()
+
+    cache = SQLiteCache(path, namespace='test', ttl=3600)
+    try:
+        assert cache.get('y') == {'name': 'y'}
+        cache.set('missing:x', {'name': 'x'}, ttl=60)
+        assert cache.get('missing:x') == {'name': 'x'}
+    finally:
+        cache.close()
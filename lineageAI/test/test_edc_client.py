@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Test offline di EDCClient contro il server EDC finto (benchmarks/fake_edc_server.py).
+Uso: python -m pytest -q test/test_edc_client.py
+"""
+import asyncio
+import json
+
+import pytest
+
+from src.config.settings import settings
+from src.edc.client import EDCClient, FETCH_PROFILE_TRAVERSAL
+from src.edc.models import AssetRecord
+from src.edc.name_index import NamePattern
+from synthetic_catalog import CatalogSpec, SyntheticCatalog
+
+
+CATALOG = SyntheticCatalog(CatalogSpec(assets=300, depth=4))
+
+
+def first_asset_with_links() -> str:
+    return next(
+        CATALOG.asset_id(i) for i in range(len(CATALOG))
+        if CATALOG.upstream(i) and CATALOG.downstream(i)
+    )
+
+
+@pytest.mark.parametrize('backend', ['memory', 'sqlite'])
+def test_asset_details_are_plain_dicts(fake_edc, monkeypatch, backend):
+    monkeypatch.setattr(settings, 'edc_cache_backend', backend)
+    asset_id = first_asset_with_links()
+
+    async def scenario():
+        async with fake_edc(CATALOG):
+            client = EDCClient()
+            try:
+                fetched = await client.get_asset_details(asset_id)
+                cached = await client.get_asset_details(asset_id)
+                batch = await client.get_assets_details_batch([asset_id])
+            finally:
+                await client.close()
+        return fetched, cached, batch[asset_id]
+
+    fetched, cached, batched = asyncio.run(scenario())
+
+    for details in (fetched, cached, batched):
+        assert type(details) is dict
+        assert all(type(link) is dict for link in details['src_links'] + details['dst_links'])
+        json.dumps(details)
+    assert fetched == cached == batched
+
+
+def test_asset_details_copies_do_not_touch_cache(fake_edc):
+    asset_id = first_asset_with_links()
+
+    async def scenario():
+        async with fake_edc(CATALOG):
+            client = EDCClient()
+            try:
+                details = await client.get_asset_details(asset_id)
+                links = len(details['dst_links'])
+                details['name'] = 'modificato'
+                details['dst_links'].clear()
+                again = await client.get_asset_details(asset_id)
+                record = await client.get_asset_record(asset_id, FETCH_PROFILE_TRAVERSAL)
+            finally:
+                await client.close()
+        return links, again, record
+
+    links, again, record = asyncio.run(scenario())
+
+    assert again['name'] != 'modificato'
+    assert len(again['dst_links']) == links
+    assert isinstance(record, AssetRecord)
+
+
+@pytest.mark.parametrize('backend', ['memory', 'sqlite'])
+@pytest.mark.parametrize('profile', ['full', FETCH_PROFILE_TRAVERSAL])
+def test_cache_counts_one_hit_or_miss_per_lookup(fake_edc, monkeypatch, backend, profile):
+    monkeypatch.setattr(settings, 'edc_cache_backend', backend)
+    asset_ids = [CATALOG.asset_id(i) for i in range(10)]
+
+    async def scenario():
+        async with fake_edc(CATALOG) as server:
+            client = EDCClient()
+            try:
+                for asset_id in asset_ids:
+                    await client.get_asset_record(asset_id, profile)
+                for asset_id in asset_ids:
+                    await client.get_asset_record(asset_id, profile)
+                await client.get_asset_records_batch(asset_ids, profile=profile)
+                stats = client.get_statistics()
+            finally:
+                await client.close()
+        return stats, server.stats['objects_requests']
+
+    stats, requests = asyncio.run(scenario())
+
+    assert requests == len(asset_ids)
+    assert stats['cache_misses'] == len(asset_ids)
+    assert stats['cache_hits'] == 2 * len(asset_ids)
+
+
+@pytest.mark.parametrize('backend', ['memory', 'sqlite'])
+def test_negative_cache_expires_after_its_ttl(fake_edc, monkeypatch, backend):
+    monkeypatch.setattr(settings, 'edc_cache_backend', backend)
+    monkeypatch.setattr(settings, 'edc_negative_cache_ttl_seconds', 1)
+    missing_id = 'DataPlatform://L00/cancellato_999999'
+
+    async def scenario():
+        async with fake_edc(CATALOG) as server:
+            client = EDCClient()
+            try:
+                await client.get_asset_details(missing_id)
+                await client.get_asset_details(missing_id)
+                cached_requests = server.stats['objects_requests']
+                await asyncio.sleep(1.1)
+                await client.get_asset_details(missing_id)
+                stats = client.get_statistics()
+            finally:
+                await client.close()
+        return cached_requests, server.stats['objects_requests'], stats
+
+    cached_requests, total_requests, stats = asyncio.run(scenario())
+
+    assert cached_requests == 1
+    assert total_requests == 2
+    assert stats['negative_cache_hits'] == 1
+
+
+@pytest.mark.parametrize('parallel_pages', [1, 4])
+def test_search_survives_server_page_size_cap(fake_edc, parallel_pages):
+    expected = [CATALOG.asset_id(i) for i in CATALOG.search(NamePattern('*GARANZIE*').matches)]
+
+    async def scenario():
+        # EDC restituisce al massimo 7 asset per pagina anche se ne chiediamo 20
+        async with fake_edc(CATALOG, max_page_size=7):
+            client = EDCClient()
+            try:
+                return [
+                    item['id'] async for item in client.iter_search_assets(
+                        '*GARANZIE*', page_size=20, parallel_pages=parallel_pages
+                    )
+                ]
+            finally:
+                await client.close()
+
+    assert len(expected) > 20
+    assert asyncio.run(scenario()) == expected
+
+
+def test_batch_fetch_survives_server_page_size_cap(fake_edc):
+    asset_ids = [CATALOG.asset_id(i) for i in range(0, 60, 3)]
+
+    async def scenario():
+        async with fake_edc(CATALOG, max_page_size=4):
+            client = EDCClient()
+            try:
+                records = await client.get_asset_records_batch(asset_ids, batch_size=10)
+                return records, client.get_statistics()['empty_responses']
+            finally:
+                await client.close()
+
+    records, empty_responses = asyncio.run(scenario())
+
+    assert list(records) == asset_ids
+    assert empty_responses == 0
+    assert all(record['name'] == CATALOG.name(CATALOG.index_of(asset_id)) for asset_id, record in records.items())
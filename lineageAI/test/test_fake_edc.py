@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Test offline del catalogo sintetico e del server EDC finto usati dai benchmark,
+verificati attraverso EDCClient.
+Uso: python -m pytest -q test/test_fake_edc.py
+"""
+import asyncio
+
+from src.edc.client import EDCClient
+from synthetic_catalog import CatalogSpec, SyntheticCatalog, TABLE_CLASS
+
+
+def test_catalog_is_deterministic_and_consistent():
+    spec = CatalogSpec(assets=500, depth=5, cycle_ratio=0.1)
+    catalog = SyntheticCatalog(spec)
+    again = SyntheticCatalog(spec)
+
+    for index in range(len(catalog)):
+        assert list(catalog.upstream(index)) == list(again.upstream(index))
+        assert catalog.index_of(catalog.asset_id(index)) == index
+        for upstream in catalog.upstream(index):
+            assert index in catalog.downstream(upstream)
+    assert catalog.index_of('DataPlatform://L00/sconosciuto') is None
+
+
+def test_batch_fetch_matches_catalog_links(fake_edc):
+    catalog = SyntheticCatalog(CatalogSpec(assets=300, depth=4))
+    indexes = list(range(0, 300, 7))
+
+    async def scenario():
+        async with fake_edc(catalog) as server:
+            client = EDCClient()
+            try:
+                details = await client.get_assets_details_batch(
+                    [catalog.asset_id(i) for i in indexes], batch_size=10
+                )
+            finally:
+                await client.close()
+        return details, server.stats['objects_requests']
+
+    details, requests = asyncio.run(scenario())
+
+    assert requests == -(-len(indexes) // 10)
+    for index in indexes:
+        asset = details[catalog.asset_id(index)]
+        assert asset['name'] == catalog.name(index)
+        assert [link['id'] for link in asset['src_links']] == [catalog.asset_id(i) for i in catalog.upstream(index)]
+        assert [link['id'] for link in asset['dst_links']] == [catalog.asset_id(i) for i in catalog.downstream(index)]
+
+
+def test_bulk_search_streams_matching_rows(fake_edc):
+    catalog = SyntheticCatalog(CatalogSpec(assets=3000, depth=4))
+    expected = {
+        catalog.asset_id(i) for i in catalog.search(lambda name: 'CLIENTI' in name)
+        if catalog.class_type(i) == TABLE_CLASS
+    }
+
+    async def scenario():
+        async with fake_edc(catalog):
+            client = EDCClient()
+            try:
+                return await client.bulk_search_assets('DataPlatform', name_filter='CLIENTI')
+            finally:
+                await client.close()
+
+    results = asyncio.run(scenario())
+
+    assert {asset['id'] for asset in results} == expected
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Test offline dello store persistente del grafo (walk, filtro classType,
+nodi da ricaricare) e di query_lineage_store contro il server EDC finto.
+Uso: python -m pytest -q test/test_graph_store.py
+"""
+import asyncio
+import sqlite3
+import time
+
+import pytest
+
+from src.config.settings import settings
+from src.edc.graph_store import LineageGraphStore
+from src.edc.lineage import LineageBuilder
+from synthetic_catalog import CatalogSpec, SyntheticCatalog
+
+CLASS_TYPES = {
+    'A': 'com.infa.Table',
+    'B': 'com.infa.View',
+    'C': 'Power_BI Report',
+    'D': 'com.infa.Report',
+    'E': 'com.infa.Column'
+}
+
+
+def link(asset_id):
+    return {'id': asset_id, 'name': asset_id, 'classType': CLASS_TYPES[asset_id]}
+
+
+def details(asset_id, src=(), dst=()):
+    return {
+        'name': asset_id,
+        'classType': CLASS_TYPES[asset_id],
+        'src_links': [link(i) for i in src],
+        'dst_links': [link(i) for i in dst]
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    """A -> B -> C, A -> D, D -> E (E noto solo come estremo di un link)."""
+    store = LineageGraphStore(str(tmp_path / 'graph.sqlite'))
+    store.record_assets([
+        ('A', details('A', dst=('B', 'D'))),
+        ('B', details('B', src=('A',), dst=('C',))),
+        ('C', details('C', src=('B',))),
+        ('D', details('D', src=('A',), dst=('E',)))
+    ])
+    yield store
+    store.close()
+
+
+def walked(store, *args, **kwargs):
+    return [(asset['asset_id'], asset['hops']) for asset in store.walk(*args, **kwargs)]
+
+
+def test_walk_follows_direction_and_hops(store):
+    assert walked(store, 'A') == [('B', 1), ('D', 1), ('C', 2), ('E', 2)]
+    assert walked(store, 'A', max_hops=1) == [('B', 1), ('D', 1)]
+    assert walked(store, 'A', max_results=3) == [('B', 1), ('D', 1), ('C', 2)]
+    assert walked(store, 'C', downstream=False) == [('B', 1), ('A', 2)]
+
+
+def test_walk_class_filter_is_a_literal_substring(store):
+    assert walked(store, 'A', class_filter='report') == [('D', 1), ('C', 2)]
+    assert walked(store, 'A', class_filter='_') == [('C', 2)]
+    assert walked(store, 'A', class_filter='Power_BI') == [('C', 2)]
+    assert walked(store, 'A', class_filter='%') == []
+    assert walked(store, 'A', class_filter='com.infa.%') == []
+
+
+def test_records_keep_their_fetch_time(store):
+    old = time.time() - 2 * 86400
+    store.record_assets([('E', details('E', src=('D',)))], fetched_at={'E': old})
+    assert store.find_expandable('A', max_hops=3) == ['E']
+
+    # Un record piu vecchio non sostituisce quello gia salvato
+    store.record_assets([('B', details('B', src=('A',)))], fetched_at={'B': old})
+    assert walked(store, 'A') == [('B', 1), ('D', 1), ('C', 2), ('E', 2)]
+    assert store.find_expandable('A', max_hops=2) == []
+
+
+def test_find_expandable_reports_unfetched_and_partial_nodes(store):
+    assert store.find_expandable('A', max_hops=3) == ['E']
+    assert store.find_expandable('A', max_hops=2) == []
+
+    store.record_assets([('E', details('E', src=('D',)))], has_dst_links=False)
+    assert store.find_expandable('A', max_hops=3) == ['E']
+    assert store.find_expandable('E', downstream=False, max_hops=3) == []
+
+
+def query_store(fake_edc, **query_kwargs):
+    catalog = SyntheticCatalog(CatalogSpec(assets=300, depth=4))
+
+    async def scenario():
+        async with fake_edc(catalog):
+            builder = LineageBuilder()
+            try:
+                return await builder.query_lineage_store(catalog.asset_id(0), **query_kwargs)
+            finally:
+                await builder.close()
+
+    return asyncio.run(scenario())
+
+
+@pytest.fixture
+def store_settings(offline_settings, monkeypatch):
+    monkeypatch.setattr(settings, 'edc_graph_store_enabled', True)
+    monkeypatch.setattr(settings, 'edc_max_total_nodes', 0)
+    return settings
+
+
+@pytest.mark.parametrize('max_depth', [0, 1, 3])
+def test_fully_refreshed_query_is_complete(fake_edc, store_settings, max_depth):
+    result = query_store(fake_edc, max_depth=max_depth)
+
+    assert result['source'] == 'graph_store'
+    assert result['refreshed'] >= 1
+    assert result['complete'] is True
+
+
+def test_query_over_budget_is_partial(fake_edc, store_settings, monkeypatch):
+    monkeypatch.setattr(settings, 'edc_max_total_nodes', 2)
+
+    result = query_store(fake_edc, max_depth=3)
+
+    assert result['refreshed'] == 2
+    assert result['complete'] is False
+
+
+def test_store_refresh_bypasses_stale_cache(fake_edc, store_settings, monkeypatch):
+    catalog = SyntheticCatalog(CatalogSpec(assets=300, depth=4))
+    root = catalog.asset_id(0)
+    monkeypatch.setattr(settings, 'edc_cache_backend', 'sqlite')
+    monkeypatch.setattr(settings, 'edc_graph_store_enabled', False)
+
+    def age_cache():
+        # Cache di due giorni fa: ancora servita (stale) ma non affidabile per lo store
+        with sqlite3.connect(settings.edc_cache_path) as conn:
+            conn.execute("UPDATE asset_cache SET fetched_at = fetched_at - ?", (2 * 86400,))
+
+    async def scenario():
+        async with fake_edc(catalog):
+            builder = LineageBuilder()
+            try:
+                await builder.build_graph(root, 3, 'downstream')
+            finally:
+                await builder.close()
+            age_cache()
+
+            # Crawl servito dalla cache stale: lo store riceve la data del fetch originale
+            monkeypatch.setattr(settings, 'edc_graph_store_enabled', True)
+            builder = LineageBuilder()
+            try:
+                await builder.build_graph(root, 3, 'downstream')
+                stale = builder.graph_store.find_expandable(root, True, 3)
+                await asyncio.gather(*builder.edc_client._revalidation_tasks)
+            finally:
+                await builder.close()
+            age_cache()
+
+            builder = LineageBuilder()
+            try:
+                result = await builder.query_lineage_store(root, max_depth=3)
+                client_stats = builder.edc_client.get_statistics()
+                left = builder.graph_store.find_expandable(root, True, 3)
+            finally:
+                await builder.close()
+        return stale, result, client_stats, left
+
+    stale, result, client_stats, left = asyncio.run(scenario())
+
+    assert stale
+    assert client_stats['batch_requests'] >= 1
+    assert result['refreshed'] == len(stale)
+    assert result['complete'] is True
+    assert left == []
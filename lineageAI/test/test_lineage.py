@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Test offline di LineageBuilder contro il server EDC finto.
+Uso: python -m pytest -q test/test_lineage.py
+"""
+import asyncio
+
+import pytest
+
+from src.config.settings import settings
+from src.edc.lineage import LineageBuilder
+from src.edc.models import LineageDirection, TRUNCATED_MAX_NODES
+from synthetic_catalog import CatalogSpec, SyntheticCatalog
+
+CATALOG = SyntheticCatalog(CatalogSpec(assets=2000, depth=6))
+
+
+def upstream_count(index: int, depth: int) -> int:
+    """Asset upstream entro depth livelli (radice inclusa), calcolati sul catalogo."""
+    seen = {index}
+    frontier = [index]
+    for _ in range(depth - 1):
+        frontier = [i for current in frontier for i in CATALOG.upstream(current) if i not in seen and not seen.add(i)]
+    return len(seen)
+
+
+def leaf_indexes(count: int):
+    return [CATALOG.index_of(asset_id) for asset_id in CATALOG.leaf_ids(count)]
+
+
+def test_resume_is_keyed_by_root_and_direction(fake_edc, monkeypatch):
+    monkeypatch.setattr(settings, 'edc_max_total_nodes', 5)
+    first, second = leaf_indexes(2)
+
+    async def scenario():
+        async with fake_edc(CATALOG):
+            builder = LineageBuilder()
+            try:
+                partial = await builder.build_tree(CATALOG.asset_id(first), '001', max_depth=6)
+                # Costruzione interrotta di un'altra radice nel frattempo
+                other = await builder.build_tree(CATALOG.asset_id(second), '001', max_depth=6)
+                # Stessa radice ma direzione diversa: non riprende la costruzione upstream
+                downstream = await builder.build_tree(
+                    CATALOG.asset_id(first), '001', max_depth=6,
+                    direction=LineageDirection.DOWNSTREAM, resume=True
+                )
+                # La frontiera c'e solo se il grafo e interrotto (la vista puo troncarsi da sola)
+                root = partial
+                resumes = 0
+                while 'frontier' in root.metadata:
+                    root = await builder.build_tree(CATALOG.asset_id(first), '001', max_depth=6, resume=True)
+                    assert root.metadata['resumed']
+                    resumes += 1
+                stats = builder.get_statistics()
+            finally:
+                await builder.close()
+        return partial, other, downstream, root, resumes, stats
+
+    partial, other, downstream, root, resumes, stats = asyncio.run(scenario())
+
+    assert partial.metadata['truncated'] == TRUNCATED_MAX_NODES
+    assert other.metadata['truncated'] == TRUNCATED_MAX_NODES
+    assert 'resumed' not in downstream.metadata
+    assert resumes >= 2
+    assert root.id == CATALOG.asset_id(first)
+    assert stats['graph_nodes'] == upstream_count(first, 6)
+    assert stats['graph_frontier'] == 0
+    assert stats['resumable_builds'] == 1
+
+
+def fake_details(links):
+    """get_asset_record finto: asset_id -> ID dei src_links (in ordine, duplicati inclusi)."""
+    async def get_asset_record(asset_id, profile=None):
+        return {
+            'id': asset_id,
+            'name': asset_id,
+            'classType': 'com.infa.Table',
+            'src_links': [{'id': link_id, 'name': link_id} for link_id in links.get(asset_id, [])],
+            'dst_links': []
+        }
+    return get_asset_record
+
+
+def test_tree_codes_follow_raw_link_positions(offline_settings):
+    # EDC restituisce due volte lo stesso link se richiesti entrambi i tipi di associazione
+    links = {'R': ['A', 'A', 'B', 'X'], 'B': ['C', 'C', 'D']}
+
+    async def scenario():
+        builder = LineageBuilder()
+        builder.edc_client.get_asset_record = fake_details(links)
+        try:
+            return await builder.build_tree('R', '001', max_depth=5)
+        finally:
+            await builder.close()
+
+    root = asyncio.run(scenario())
+
+    codes = {node.id: node.code for node in iter_tree(root)}
+    assert codes == {
+        'R': '001', 'A': '001001', 'B': '001003', 'X': '001004',
+        'C': '001003001', 'D': '001003003'
+    }
+
+
+def iter_tree(node):
+    yield node
+    for child in node.children:
+        yield from iter_tree(child)
+
+
+def test_resume_rejects_other_root_or_direction(fake_edc, monkeypatch):
+    monkeypatch.setattr(settings, 'edc_max_total_nodes', 3)
+    first, second = leaf_indexes(2)
+
+    async def scenario():
+        async with fake_edc(CATALOG):
+            builder = LineageBuilder()
+            try:
+                graph = await builder.build_graph(CATALOG.asset_id(first), 6)
+                assert graph.truncated
+                with pytest.raises(ValueError):
+                    await builder.build_graph(CATALOG.asset_id(second), 6, resume=graph)
+                with pytest.raises(ValueError):
+                    await builder.build_graph(
+                        CATALOG.asset_id(first), 6, LineageDirection.DOWNSTREAM, resume=graph
+                    )
+            finally:
+                await builder.close()
+
+    asyncio.run(scenario())
+
+
+def test_concurrent_impact_builds_report_their_own_graph(fake_edc, monkeypatch):
+    monkeypatch.setattr(settings, 'edc_max_total_nodes', 20)
+    sources = [CATALOG.asset_id(0), CATALOG.asset_id(1)]
+
+    async def scenario():
+        async with fake_edc(CATALOG, latency_ms=2):
+            builder = LineageBuilder()
+            try:
+                return await asyncio.gather(
+                    builder.build_downstream_impact(sources[0], max_depth=5),
+                    builder.build_downstream_impact(sources[1], max_depth=1)
+                )
+            finally:
+                await builder.close()
+
+    (deep_assets, deep_graph), (direct_assets, direct_graph) = asyncio.run(scenario())
+
+    assert deep_graph.root_id == sources[0] and deep_graph.truncated == TRUNCATED_MAX_NODES
+    assert direct_graph.root_id == sources[1] and not direct_graph.truncated
+    assert {asset['asset_id'] for asset in direct_assets} == {
+        CATALOG.asset_id(i) for i in CATALOG.downstream(1)
+    }
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Test offline di record/replay delle risposte HTTP (src/edc/recording.py).
+Uso: python -m pytest -q test/test_recording.py
+"""
+import asyncio
+import json
+
+import aiohttp
+from aiohttp import web
+
+from src.edc.recording import Cassette, RecordingSession, ReplaySession
+
+PAYLOAD = {'items': [{'id': 'DataPlatform://L00/T00_CLIENTI_0'}] * 50}
+
+
+async def compressed_objects(request: web.Request) -> web.Response:
+    response = web.json_response(PAYLOAD)
+    response.enable_compression()
+    return response
+
+
+def test_replay_does_not_claim_compressed_body(tmp_path):
+    cassette = Cassette(str(tmp_path / 'cassette.jsonl'))
+
+    async def scenario():
+        app = web.Application()
+        app.router.add_get('/access/2/catalog/data/objects', compressed_objects)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        url = f"http://127.0.0.1:{runner.addresses[0][1]}/access/2/catalog/data/objects"
+        try:
+            recorder = RecordingSession(
+                aiohttp.ClientSession(headers={'Accept-Encoding': 'gzip'}), cassette
+            )
+            recorded = await recorder.get(url, params={'q': 'id:x'})
+            await recorder.close()
+        finally:
+            await runner.cleanup()
+
+        replayed = await ReplaySession(cassette).get(url, params={'q': 'id:x'})
+        return recorded, replayed, await replayed.json()
+
+    recorded, replayed, body = asyncio.run(scenario())
+
+    assert 'Content-Encoding' not in recorded.headers
+    assert 'Content-Encoding' not in replayed.headers
+    assert 'Content-Length' not in replayed.headers
+    assert replayed.headers['Content-Type'].startswith('application/json')
+    assert body == PAYLOAD
+
+
+def test_replay_drops_encoding_from_old_cassettes(tmp_path):
+    cassette = Cassette(str(tmp_path / 'old.jsonl'))
+    cassette.append({
+        'method': 'GET',
+        'path': '/access/2/catalog/data/objects',
+        'params': [],
+        'status': 200,
+        'reason': 'OK',
+        'headers': {'Content-Type': 'application/json', 'Content-Encoding': 'gzip'},
+        'body': 'e30=',
+        'elapsed': 0.0,
+        'body_elapsed': 0.0
+    })
+
+    async def scenario():
+        response = await ReplaySession(cassette).get('http://edc/access/2/catalog/data/objects')
+        return response, await response.json()
+
+    response, body = asyncio.run(scenario())
+
+    assert 'Content-Encoding' not in response.headers
+    assert body == {}
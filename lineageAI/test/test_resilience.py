@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Test offline del circuit breaker (nessuna chiamata a EDC).
+Uso: python -m pytest -q test/test_resilience.py
+"""
+import asyncio
+
+import pytest
+
+from src.edc.client import EDCClient
+from src.edc.resilience import CircuitBreaker, CircuitOpenError
+
+
+def open_breaker(breaker: CircuitBreaker) -> None:
+    """Porta il circuito in open con reset immediato (la chiamata successiva e la prova)."""
+    breaker.reset_timeout = 0
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+class HangingSession:
+    """Sessione la cui GET non risponde mai (la prova resta in volo fino all'annullamento)."""
+
+    closed = False
+
+    def __init__(self):
+        self.started = asyncio.Event()
+
+    async def get(self, url, params=None, headers=None, **kwargs):
+        self.started.set()
+        await asyncio.sleep(3600)
+
+    async def close(self):
+        self.closed = True
+
+
+def test_half_open_admits_single_trial():
+    breaker = CircuitBreaker(failure_threshold=2)
+    open_breaker(breaker)
+
+    assert breaker.before_request() is not None
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.before_request() is None
+
+
+def test_released_trial_lets_next_call_probe():
+    breaker = CircuitBreaker(failure_threshold=2)
+    open_breaker(breaker)
+
+    trial_id = breaker.before_request()
+    breaker.release_trial(trial_id)
+
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.before_request() is not None
+
+
+def test_stale_trial_release_is_ignored():
+    breaker = CircuitBreaker(failure_threshold=2)
+    open_breaker(breaker)
+
+    old_trial = breaker.before_request()
+    breaker.record_failure()
+    new_trial = breaker.before_request()
+    breaker.release_trial(old_trial)
+
+    assert new_trial != old_trial
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+
+def test_cancelled_probe_does_not_wedge_breaker(offline_settings):
+    async def scenario():
+        client = EDCClient()
+        session = HangingSession()
+        client.session = session
+        breaker = client._circuit_breaker
+        open_breaker(breaker)
+
+        probe = asyncio.create_task(client._get_with_retry(client.base_url, {}))
+        await session.started.wait()
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert breaker.before_request() is not None
+
+    asyncio.run(scenario())
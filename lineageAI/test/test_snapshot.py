@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Test offline degli snapshot di risorsa contro il server EDC finto.
+Uso: python -m pytest -q test/test_snapshot.py
+"""
+import asyncio
+
+import pytest
+
+from src.config.settings import settings
+from src.edc.client import EDCClient, resolve_bulk_class_type
+from synthetic_catalog import CatalogSpec, SyntheticCatalog
+
+CATALOG = SyntheticCatalog(CatalogSpec(assets=3000, depth=4))
+
+
+@pytest.fixture
+def snapshot_settings(offline_settings, monkeypatch):
+    monkeypatch.setattr(settings, 'edc_snapshot_enabled', True)
+    return settings
+
+
+def test_first_search_streams_while_snapshot_loads(fake_edc, snapshot_settings):
+    search = dict(resource_name='DataPlatform', name_filter='garanzie', asset_type_filter='Table', max_results=5)
+
+    async def scenario():
+        async with fake_edc(CATALOG):
+            client = EDCClient()
+            try:
+                streamed = await client.search_resource_assets(**search)
+                streamed_stats = client.get_statistics()
+                await asyncio.gather(*client._revalidation_tasks)
+
+                info = client._snapshots.get_snapshot_info('DataPlatform', resolve_bulk_class_type('Table'))
+                indexed = client._snapshots.has_name_index(info['snapshot_id'])
+                local = await client.search_resource_assets(**search)
+                local_stats = client.get_statistics()
+            finally:
+                await client.close()
+        return streamed, streamed_stats, info, indexed, local, local_stats
+
+    streamed, streamed_stats, info, indexed, local, local_stats = asyncio.run(scenario())
+
+    assert len(streamed) == 5
+    assert streamed_stats['snapshot_searches'] == 0
+    assert info['row_count'] > 0
+    assert indexed
+    assert local_stats['snapshot_searches'] == 1
+    assert [item['id'] for item in local] == [item['id'] for item in streamed]
+
+
+def test_name_filter_suggestion_uses_asset_like_words(fake_edc, snapshot_settings):
+    messages = [
+        'cerca le TABELLE GARANZIE in DataPlatform',
+        'cerca garanzie e clienti in DataPlatform',
+        'mostra TABELLE e VISTE di DataPlatform',
+        'dipendenze di T01_TASSI nella risorsa DataPlatform'
+    ]
+
+    async def scenario():
+        async with fake_edc(CATALOG):
+            client = EDCClient()
+            try:
+                await client.refresh_snapshot('DataPlatform')
+                return [client.suggest_name_filter(message, 'DataPlatform') for message in messages]
+            finally:
+                await client.close()
+
+    suggestions = asyncio.run(scenario())
+
+    assert suggestions == ['GARANZIE', None, None, 'T01_TASSI']